@@ -0,0 +1,96 @@
+"""
+Run EXPLAIN on the SQL statements issued by the buying_addon endpoints and
+report the ones that scan a whole table (or a whole index).
+
+The statements are captured while every benchmarked endpoint runs once on a
+synthetic procurement graph, so dynamically built queries are covered too.
+
+    bench --site test_site buying-addon-explain --size 1000
+"""
+
+import re
+
+import frappe
+
+from buying_addon.benchmarks.fixtures import get_or_make_procurement_graph
+from buying_addon.benchmarks.run import SKIPPED_ENDPOINTS, get_arguments, get_endpoints, restore_conf
+from buying_addon.utils.query_counter import count_queries
+
+DEFAULT_SIZE = 1000
+
+# Scans estimated below this many rows are not reported (small setup tables)
+DEFAULT_MIN_ROWS = 100
+
+# EXPLAIN access types that read every row of the table or index
+FULL_SCAN_TYPES = ("ALL", "index")
+
+
+def explain(size=DEFAULT_SIZE, min_rows=DEFAULT_MIN_ROWS, endpoints=None):
+    """
+    Capture the statements of the endpoints (all of them, or those whose name contains one of
+    `endpoints`) on a graph of `size` lines and EXPLAIN every distinct SELECT.
+    Returns (full scans, errors): each full scan has its endpoint, query, table, type, key and
+    estimated rows; each error the endpoint and the exception it raised, since its statements
+    were captured only up to the failure.
+    """
+    graph = get_or_make_procurement_graph(size)
+    # Every captured call is rolled back; keep the graph for the next calls and runs
+    frappe.db.commit()
+    statements = {}
+    errors = []
+
+    # Capture what the endpoints actually run, not the cache or instrumentation queries
+    cache_ttl = frappe.local.conf.get("buying_addon_dashboard_cache_ttl")
+    instrumentation = frappe.local.conf.get("buying_addon_disable_instrumentation")
+    frappe.local.conf["buying_addon_dashboard_cache_ttl"] = 0
+    frappe.local.conf["buying_addon_disable_instrumentation"] = 1
+
+    try:
+        for name, fn in get_endpoints():
+            if endpoints and not any(pattern in name for pattern in endpoints):
+                continue
+            if name.rsplit(".", 1)[-1] in SKIPPED_ENDPOINTS:
+                continue
+
+            kwargs = get_arguments(fn, graph)
+            if kwargs is None:
+                continue
+
+            try:
+                with count_queries(capture=True) as stats:
+                    fn(**kwargs)
+            except Exception as e:
+                errors.append({"endpoint": name, "error": repr(e)})
+            finally:
+                frappe.db.rollback()
+
+            for query, values in stats.statements:
+                if is_select(query):
+                    statements.setdefault(normalize(query), (name, query, values))
+    finally:
+        restore_conf("buying_addon_dashboard_cache_ttl", cache_ttl)
+        restore_conf("buying_addon_disable_instrumentation", instrumentation)
+
+    full_scans = []
+    for endpoint, query, values in statements.values():
+        for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True):
+            if row.type in FULL_SCAN_TYPES and (row.rows or 0) >= min_rows:
+                full_scans.append({
+                    "endpoint": endpoint,
+                    "query": normalize(query),
+                    "table": row.table,
+                    "type": row.type,
+                    "key": row.key,
+                    "possible_keys": row.possible_keys,
+                    "rows": row.rows,
+                })
+
+    return full_scans, errors
+
+
+def is_select(query):
+    return query.lstrip().lstrip("(").lower().startswith(("select", "with"))
+
+
+def normalize(query):
+    return re.sub(r"\s+", " ", query).strip()
@@ -0,0 +1,207 @@
+"""
+Synthetic procurement graphs for the benchmarks.
+
+A graph is one submitted Sales Order with `lines` items and the documents that
+hang off it: Material Request -> Purchase Order -> Purchase Receipt / Purchase Invoice,
+plus a Production Plan pulling the Sales Order.
+
+Graphs are tagged with the Sales Order's `po_no` so they are built once per site and reused.
+"""
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, nowdate
+
+BENCHMARK_PREFIX = "BA-BENCH"
+ITEM_GROUP = "Buying Addon Benchmark"
+CUSTOMER = "Buying Addon Benchmark Customer"
+SUPPLIER = "Buying Addon Benchmark Supplier"
+
+# Lines cycle through a fixed pool of items so large orders repeat item codes,
+# like real orders do (and like the consolidation code expects)
+ITEM_POOL_SIZE = 500
+
+
+def get_graph_tag(lines):
+    return f"{BENCHMARK_PREFIX}-{lines}"
+
+
+def get_or_make_procurement_graph(lines):
+    """
+    Get the names of the documents of the graph with `lines` Sales Order lines, building it if needed.
+    Returns a frappe._dict with sales_order, material_request, purchase_order,
+    purchase_receipt, purchase_invoice, production_plan and item_codes.
+    Nothing is committed here, so tests roll the graph back; the benchmark commands commit it.
+    """
+    sales_order = frappe.db.get_value(
+        "Sales Order", {"po_no": get_graph_tag(lines), "docstatus": 1}, "name"
+    )
+    if sales_order:
+        return get_graph(sales_order)
+
+    return make_procurement_graph(lines)
+
+
+def get_graph(sales_order):
+    def linked(child_doctype, link_fieldname, link_value):
+        return frappe.db.get_value(child_doctype, {link_fieldname: link_value, "docstatus": 1}, "parent")
+
+    material_request = linked("Material Request Item", "sales_order", sales_order)
+    purchase_order = linked("Purchase Order Item", "material_request", material_request)
+
+    return frappe._dict(
+        sales_order=sales_order,
+        material_request=material_request,
+        purchase_order=purchase_order,
+        purchase_receipt=linked("Purchase Receipt Item", "purchase_order", purchase_order),
+        purchase_invoice=linked("Purchase Invoice Item", "purchase_order", purchase_order),
+        production_plan=frappe.db.get_value(
+            "Production Plan Sales Order", {"sales_order": sales_order, "parenttype": "Production Plan"}, "parent"
+        ),
+        item_codes=frappe.get_all(
+            "Sales Order Item", filters={"parent": sales_order}, pluck="item_code", distinct=True
+        ),
+    )
+
+
+def make_procurement_graph(lines):
+    company = get_company()
+    warehouse = frappe.db.get_value("Warehouse", {"company": company, "is_group": 0}, "name")
+    if not warehouse:
+        frappe.throw(_("Company {0} has no warehouse to run the benchmarks against").format(company))
+
+    item_codes = make_items(min(lines, ITEM_POOL_SIZE))
+    make_parties()
+
+    from erpnext.buying.doctype.purchase_order.purchase_order import make_purchase_invoice, make_purchase_receipt
+    from erpnext.selling.doctype.sales_order.sales_order import make_material_request
+    from erpnext.stock.doctype.material_request.material_request import make_purchase_order
+
+    delivery_date = add_days(nowdate(), 30)
+
+    sales_order = frappe.new_doc("Sales Order")
+    sales_order.update({
+        "customer": CUSTOMER,
+        "company": company,
+        "po_no": get_graph_tag(lines),
+        "transaction_date": nowdate(),
+        "delivery_date": delivery_date,
+    })
+    for idx in range(lines):
+        sales_order.append("items", {
+            "item_code": item_codes[idx % len(item_codes)],
+            "qty": 10,
+            "rate": 100,
+            "warehouse": warehouse,
+            "delivery_date": delivery_date,
+        })
+    sales_order.insert()
+    sales_order.submit()
+
+    material_request = make_material_request(sales_order.name)
+    material_request.material_request_type = "Purchase"
+    material_request.schedule_date = delivery_date
+    for item in material_request.items:
+        item.schedule_date = delivery_date
+        item.warehouse = item.warehouse or warehouse
+    material_request.insert()
+    material_request.submit()
+
+    purchase_order = make_purchase_order(material_request.name)
+    purchase_order.supplier = SUPPLIER
+    purchase_order.schedule_date = delivery_date
+    for item in purchase_order.items:
+        item.rate = 80
+    purchase_order.insert()
+    purchase_order.submit()
+
+    # Receive and bill part of the order so the dashboards have partial progress to report
+    purchase_receipt = make_purchase_receipt(purchase_order.name)
+    for item in purchase_receipt.items:
+        item.qty = item.received_qty = item.qty / 2
+    purchase_receipt.insert()
+    purchase_receipt.submit()
+
+    purchase_invoice = make_purchase_invoice(purchase_order.name)
+    for item in purchase_invoice.items:
+        item.qty = item.qty / 4
+    purchase_invoice.insert()
+    purchase_invoice.submit()
+
+    production_plan = frappe.new_doc("Production Plan")
+    production_plan.update({
+        "company": company,
+        "get_items_from": "Sales Order",
+        "posting_date": nowdate(),
+    })
+    production_plan.append("sales_orders", {
+        "sales_order": sales_order.name,
+        "customer": CUSTOMER,
+        "sales_order_date": sales_order.transaction_date,
+        "grand_total": sales_order.grand_total,
+    })
+    # The synthetic items have no BOMs, so the plan only carries the Sales Order link
+    production_plan.flags.ignore_mandatory = True
+    production_plan.insert()
+
+    return frappe._dict(
+        sales_order=sales_order.name,
+        material_request=material_request.name,
+        purchase_order=purchase_order.name,
+        purchase_receipt=purchase_receipt.name,
+        purchase_invoice=purchase_invoice.name,
+        production_plan=production_plan.name,
+        item_codes=list(dict.fromkeys(item_codes[idx % len(item_codes)] for idx in range(lines))),
+    )
+
+
+def get_company():
+    company = frappe.defaults.get_global_default("company") or frappe.db.get_value("Company", {}, "name")
+    if not company:
+        frappe.throw(_("Create a Company before running the benchmarks"))
+    return company
+
+
+def make_items(count):
+    if not frappe.db.exists("Item Group", ITEM_GROUP):
+        frappe.get_doc({
+            "doctype": "Item Group",
+            "item_group_name": ITEM_GROUP,
+            "parent_item_group": "All Item Groups",
+        }).insert()
+
+    item_codes = [f"{BENCHMARK_PREFIX}-ITEM-{idx:05d}" for idx in range(count)]
+    existing = set(frappe.get_all("Item", filters={"name": ["in", item_codes]}, pluck="name"))
+
+    for item_code in item_codes:
+        if item_code in existing:
+            continue
+        frappe.get_doc({
+            "doctype": "Item",
+            "item_code": item_code,
+            "item_name": item_code,
+            "item_group": ITEM_GROUP,
+            "stock_uom": "Nos",
+            "is_stock_item": 1,
+            "is_purchase_item": 1,
+            "is_sales_item": 1,
+        }).insert()
+
+    return item_codes
+
+
+def make_parties():
+    if not frappe.db.exists("Customer", CUSTOMER):
+        frappe.get_doc({
+            "doctype": "Customer",
+            "customer_name": CUSTOMER,
+            "customer_group": frappe.db.get_value("Customer Group", {"is_group": 0}, "name"),
+            "territory": frappe.db.get_value("Territory", {"is_group": 0}, "name"),
+        }).insert()
+
+    if not frappe.db.exists("Supplier", SUPPLIER):
+        frappe.get_doc({
+            "doctype": "Supplier",
+            "supplier_name": SUPPLIER,
+            "supplier_group": frappe.db.get_value("Supplier Group", {"is_group": 0}, "name"),
+        }).insert()
@@ -0,0 +1,253 @@
+"""
+Benchmark every whitelisted function of the Sales Order, Purchase Order and
+Material Request controllers against synthetic procurement graphs.
+
+Each endpoint is called `repeat` times per graph size with the dashboard cache
+disabled; wall time (median), SQL query count, rows read and peak Python memory
+are recorded. Results are written as JSON and compared against a baseline.
+
+    bench --site test_site buying-addon-benchmark --sizes 10,1000,10000
+"""
+
+import importlib
+import inspect
+import json
+import statistics
+import time
+import tracemalloc
+
+import frappe
+from frappe.utils import now
+
+from buying_addon.benchmarks.fixtures import get_or_make_procurement_graph
+from buying_addon.utils.query_counter import count_queries
+
+DEFAULT_SIZES = (10, 1000, 10000)
+DEFAULT_REPEAT = 3
+
+# Relative wall time increase over the baseline reported as a regression
+DEFAULT_TOLERANCE = 0.2
+
+# Differences below this (ms) are noise, whatever the ratio
+WALL_TIME_NOISE_FLOOR_MS = 5
+
+BASELINE_PATH = ("benchmarks", "baseline.json")
+
+ENDPOINT_MODULES = (
+    "buying_addon.buying_addon.doctype.sales_order.sales_order",
+    "buying_addon.buying_addon.doctype.purchase_order.purchase_order",
+    "buying_addon.buying_addon.doctype.material_request.material_request",
+)
+
+# Endpoints that change data are not benchmarked
+SKIPPED_ENDPOINTS = {
+    "update_supplier_directly": "writes to the Purchase Order",
+    "reassign_supplier": "writes to the Purchase Orders",
+}
+
+# The number of queries of these endpoints must not grow with the number of lines
+CONSTANT_QUERY_ENDPOINTS = (
+    "get_sales_order_dashboard_data",
+    "get_sales_order_status_dashboard",
+    "get_purchase_order_dashboard_data",
+    "get_purchase_order_status_dashboard",
+    "get_material_request_status_dashboard",
+    "get_material_request_summary",
+)
+
+# How each endpoint argument is filled from a graph
+ARGUMENT_RESOLVERS = {
+    "sales_order_name": lambda graph: graph.sales_order,
+    "purchase_order_name": lambda graph: graph.purchase_order,
+    "material_request_name": lambda graph: graph.material_request,
+    "sales_order_names": lambda graph: json.dumps([graph.sales_order]),
+    "purchase_order_names": lambda graph: json.dumps([graph.purchase_order]),
+    "material_request_names": lambda graph: json.dumps([graph.material_request]),
+    "item_code": lambda graph: graph.item_codes[0],
+    "item_codes": lambda graph: json.dumps(graph.item_codes),
+}
+
+
+def get_endpoints():
+    """
+    Get the whitelisted functions defined in the endpoint modules as (qualified name, function)
+    """
+    endpoints = []
+    for module_name in ENDPOINT_MODULES:
+        module = importlib.import_module(module_name)
+        for name, fn in vars(module).items():
+            if callable(fn) and fn in frappe.whitelisted and getattr(fn, "__module__", None) == module_name:
+                endpoints.append((f"{module_name}.{name}", fn))
+    return endpoints
+
+
+def get_arguments(fn, graph):
+    """
+    Build the keyword arguments of an endpoint.
+    Returns None when a required argument cannot be filled from the graph.
+    """
+    kwargs = {}
+    for param in inspect.signature(fn).parameters.values():
+        resolver = ARGUMENT_RESOLVERS.get(param.name)
+        if resolver:
+            kwargs[param.name] = resolver(graph)
+        elif param.default is inspect.Parameter.empty:
+            return None
+    return kwargs
+
+
+def measure(fn, kwargs, repeat=DEFAULT_REPEAT):
+    """
+    Call `fn` `repeat` times and return its timings, query count and peak memory.
+    Work done by the endpoint is rolled back after each call.
+    """
+    wall_times = []
+    queries = rows = peak_memory = 0
+
+    for attempt in range(repeat):
+        tracemalloc.start()
+        try:
+            with count_queries() as stats:
+                start = time.perf_counter()
+                fn(**kwargs)
+                wall_times.append((time.perf_counter() - start) * 1000)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            frappe.db.rollback()
+
+        if attempt == 0:
+            queries, rows = stats.queries, stats.rows
+        peak_memory = max(peak_memory, peak)
+
+    return {
+        "wall_time_ms": round(statistics.median(wall_times), 2),
+        "min_wall_time_ms": round(min(wall_times), 2),
+        "queries": queries,
+        "rows": rows,
+        "peak_memory_kb": round(peak_memory / 1024, 1),
+    }
+
+
+def run(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, endpoints=None):
+    """
+    Benchmark the endpoints (all of them, or those whose name contains one of `endpoints`)
+    on a graph of every size. Returns the JSON-serializable results.
+    """
+    selected = [
+        (name, fn) for name, fn in get_endpoints()
+        if not endpoints or any(pattern in name for pattern in endpoints)
+    ]
+
+    results = {
+        "site": frappe.local.site,
+        "timestamp": now(),
+        "repeat": repeat,
+        "sizes": {},
+    }
+
+    # Measure the work itself, not the dashboard cache or the endpoint instrumentation
+    cache_ttl = frappe.local.conf.get("buying_addon_dashboard_cache_ttl")
+    instrumentation = frappe.local.conf.get("buying_addon_disable_instrumentation")
+    frappe.local.conf["buying_addon_dashboard_cache_ttl"] = 0
+    frappe.local.conf["buying_addon_disable_instrumentation"] = 1
+
+    try:
+        for size in sizes:
+            graph = get_or_make_procurement_graph(size)
+            # Every measured call is rolled back; keep the graph for the next calls and runs
+            frappe.db.commit()
+            size_results = results["sizes"][str(size)] = {}
+
+            for name, fn in selected:
+                short_name = name.rsplit(".", 1)[-1]
+                if short_name in SKIPPED_ENDPOINTS:
+                    size_results[name] = {"skipped": SKIPPED_ENDPOINTS[short_name]}
+                    continue
+
+                kwargs = get_arguments(fn, graph)
+                if kwargs is None:
+                    size_results[name] = {"skipped": "arguments cannot be built from the graph"}
+                    continue
+
+                try:
+                    size_results[name] = measure(fn, kwargs, repeat)
+                except Exception as e:
+                    size_results[name] = {"error": repr(e)}
+    finally:
+        restore_conf("buying_addon_dashboard_cache_ttl", cache_ttl)
+        restore_conf("buying_addon_disable_instrumentation", instrumentation)
+
+    return results
+
+
+def restore_conf(key, value):
+    if value is None:
+        frappe.local.conf.pop(key, None)
+    else:
+        frappe.local.conf[key] = value
+
+
+def check_query_scaling(results):
+    """
+    Report endpoints in CONSTANT_QUERY_ENDPOINTS whose query count changes with the graph size
+    """
+    violations = []
+    counts = {}
+    for size, size_results in results["sizes"].items():
+        for name, result in size_results.items():
+            if name.rsplit(".", 1)[-1] in CONSTANT_QUERY_ENDPOINTS and "queries" in result:
+                counts.setdefault(name, {})[size] = result["queries"]
+
+    for name, by_size in counts.items():
+        if len(set(by_size.values())) > 1:
+            violations.append({"endpoint": name, "queries": by_size})
+
+    return violations
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline.
+    Returns a list of regressions: more queries, or slower beyond `tolerance`.
+    """
+    regressions = []
+    for size, size_results in results["sizes"].items():
+        baseline_results = baseline.get("sizes", {}).get(size, {})
+        for name, result in size_results.items():
+            previous = baseline_results.get(name)
+            if not previous or "queries" not in result or "queries" not in previous:
+                continue
+
+            if result["queries"] > previous["queries"]:
+                regressions.append({
+                    "size": size, "endpoint": name, "metric": "queries",
+                    "baseline": previous["queries"], "current": result["queries"],
+                })
+
+            slower_by = result["wall_time_ms"] - previous["wall_time_ms"]
+            if slower_by > WALL_TIME_NOISE_FLOOR_MS and slower_by > previous["wall_time_ms"] * tolerance:
+                regressions.append({
+                    "size": size, "endpoint": name, "metric": "wall_time_ms",
+                    "baseline": previous["wall_time_ms"], "current": result["wall_time_ms"],
+                })
+
+    return regressions
+
+
+def get_baseline_path():
+    return frappe.get_app_path("buying_addon", *BASELINE_PATH)
+
+
+def load_baseline(path=None):
+    try:
+        with open(path or get_baseline_path()) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+        f.write("\n")
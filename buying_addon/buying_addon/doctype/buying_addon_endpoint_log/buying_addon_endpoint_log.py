@@ -0,0 +1,10 @@
+import frappe
+from frappe.model.document import Document
+
+
+class BuyingAddonEndpointLog(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Buying Addon Endpoint Log", ["sampled_at", "endpoint"])
@@ -0,0 +1,64 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now
+
+
+class DashboardSnapshot(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Dashboard Snapshot",
+		["reference_doctype", "reference_name", "endpoint"],
+		constraint_name="unique_reference_endpoint"
+	)
+
+
+def get_snapshot(reference_doctype, reference_name, endpoint, version):
+	"""
+	Get the stored response of a dashboard endpoint if it was computed for `version`, else None
+	"""
+	data = frappe.db.get_value(
+		"Dashboard Snapshot",
+		{
+			"reference_doctype": reference_doctype,
+			"reference_name": reference_name,
+			"endpoint": endpoint,
+			"version": version,
+		},
+		"data"
+	)
+	return frappe.parse_json(data) if data else None
+
+
+def save_snapshot(reference_doctype, reference_name, endpoint, version, data):
+	"""
+	Store (or replace) the response of a dashboard endpoint for a document
+	"""
+	timestamp = now()
+	user = frappe.session.user
+
+	frappe.db.sql("""
+		INSERT INTO `tabDashboard Snapshot`
+			(name, reference_doctype, reference_name, endpoint, version, data, computed_at,
+			creation, modified, owner, modified_by)
+		VALUES
+			(%(name)s, %(reference_doctype)s, %(reference_name)s, %(endpoint)s, %(version)s, %(data)s, %(timestamp)s,
+			%(timestamp)s, %(timestamp)s, %(user)s, %(user)s)
+		ON DUPLICATE KEY UPDATE
+			version = VALUES(version),
+			data = VALUES(data),
+			computed_at = VALUES(computed_at),
+			modified = VALUES(modified),
+			modified_by = VALUES(modified_by)
+	""", {
+		"name": frappe.generate_hash(length=10),
+		"reference_doctype": reference_doctype,
+		"reference_name": reference_name,
+		"endpoint": endpoint,
+		"version": version,
+		"data": frappe.as_json(data, indent=None),
+		"timestamp": timestamp,
+		"user": user,
+	})
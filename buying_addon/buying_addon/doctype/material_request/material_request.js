@@ -17,12 +17,15 @@ frappe.ui.form.on('Material Request', {
 	},
 	
 	onload(frm) {
-		// Load dashboard data when form loads, but only for saved documents
-		if (frm.doc.name && !frm.doc.__islocal) {
-			// Add a small delay to ensure form is fully loaded
-			setTimeout(() => {
-				frm.trigger("load_mr_status_dashboard");
-			}, 100);
+		// Reload the dashboard when the server reports that a linked document changed it;
+		// the first load happens in refresh, which always follows onload
+		if (!frm.mr_dashboard_listener) {
+			frm.mr_dashboard_listener = true;
+			frappe.realtime.on('buying_addon_dashboard_invalidated', (data) => {
+				if (cur_frm === frm && data.doctype === frm.doctype && data.name === frm.doc.name && !frm.is_dirty()) {
+					frm.trigger('load_mr_status_dashboard');
+				}
+			});
 		}
 	},
 	
@@ -90,7 +93,13 @@ frappe.ui.form.on('Material Request', {
 
 		frappe.call({
 			method: 'buying_addon.buying_addon.doctype.material_request.material_request.get_material_request_status_dashboard',
-			args: { material_request_name: frm.doc.name, page: frm.mr_dashboard_page, page_size: frm.mr_dashboard_page_size },
+			args: {
+				material_request_name: frm.doc.name,
+				page: frm.mr_dashboard_page,
+				page_size: frm.mr_dashboard_page_size,
+				// Lets the server answer "unchanged" instead of recomputing the dashboard
+				dashboard_version: frm.mr_dashboard_data && frm.mr_dashboard_data.version
+			},
 			callback: function(r) {
 				frm.dashboard_loading = false;
 				
@@ -105,7 +114,11 @@ frappe.ui.form.on('Material Request', {
 					}
 				}
 				
-				if (r.message) {
+				if (r.message && r.message.unchanged) {
+					// Redraw the data we already have in case the field was re-rendered
+					frm.events.render_mr_status_dashboard(frm, frm.mr_dashboard_data);
+				} else if (r.message) {
+					frm.mr_dashboard_data = r.message;
 					frm.events.render_mr_status_dashboard(frm, r.message);
 				} else {
 					// Show error message if no data
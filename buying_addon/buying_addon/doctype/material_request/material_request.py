@@ -1,9 +1,20 @@
+import hashlib
+
 import frappe
+from frappe import _
 from frappe.model.document import Document
-from frappe.utils import get_url, flt
+from frappe.utils import get_url, flt, cint
+
+from buying_addon.utils.bulk import chunked, get_permitted_names, get_permitted_names_query, parse_names, percentage
+from buying_addon.utils.dashboard_cache import cached_dashboard, get_cache_ttl
+from buying_addon.utils.instrumentation import instrumented
+from buying_addon.utils.pagination import get_pagination
+from buying_addon.utils.projection import get_header
 
 
 @frappe.whitelist()
+@instrumented
+@cached_dashboard("Material Request", "material_request_name", snapshot=True)
 def get_material_request_status_dashboard(material_request_name, page: int = 1, page_size: int = 100, include_items: int = 1):
     """
     Get comprehensive dashboard data for Material Request including:
@@ -12,88 +23,49 @@ def get_material_request_status_dashboard(material_request_name, page: int = 1,
     - Pending, received, and billed quantities
     - Items breakdown with detailed progress
     """
-    try:
-        mr = frappe.get_doc("Material Request", material_request_name)
-    except frappe.DoesNotExistError:
-        return None
-    except Exception as e:
-        frappe.log_error(f"Error getting Material Request {material_request_name}: {str(e)}")
+    mr = get_material_request_header(material_request_name)
+    if not mr:
         return None
     
     try:
-        # Calculate KPIs
-        total_requested = 0
-        total_ordered = 0
-        total_received = 0
-        total_billed = 0
-        total_pending = 0
-        
-        # Pre-compute billed quantities per item via a single aggregated query
-        billed_qty_by_item_code = get_billed_quantity_map(material_request_name)
-        
-        # Compute totals across all items
-        for item in mr.items:
+        # Totals come from SQL aggregates; only the requested page of rows is read.
+        # Ordered, received and billed follow the item-level links, so multi-MR POs count too.
+        totals = get_material_request_item_totals(mr.name)
+        total_requested = flt(totals.total_requested)
+        total_ordered = flt(totals.total_ordered)
+        total_received = flt(totals.total_received)
+        total_billed = flt(totals.total_billed)
+        total_pending = flt(totals.total_pending)
+        pagination = get_pagination(cint(totals.total_items), page, page_size)
+
+        items_data = []
+        for item in get_material_request_items_page(mr.name, pagination) if cint(include_items) else []:
             try:
                 requested_qty = item.qty or 0
-                ordered_qty = item.ordered_qty or 0
-                received_qty = item.received_qty or 0
-                billed_qty = billed_qty_by_item_code.get(item.item_code, 0) or 0
+                ordered_qty = flt(item.ordered_qty)
+                received_qty = flt(item.received_qty)
+                billed_qty = flt(item.billed_qty)
                 pending_qty = max(0, requested_qty - ordered_qty)
-                total_requested += requested_qty
-                total_ordered += ordered_qty
-                total_received += received_qty
-                total_billed += billed_qty
-                total_pending += pending_qty
+                ordered_percentage = (ordered_qty / requested_qty * 100) if requested_qty > 0 else 0
+                received_percentage = (received_qty / requested_qty * 100) if requested_qty > 0 else 0
+                billed_percentage = (billed_qty / requested_qty * 100) if requested_qty > 0 else 0
+                items_data.append({
+                    "item_code": item.item_code,
+                    "item_name": item.item_name,
+                    "requested_qty": requested_qty,
+                    "ordered_qty": ordered_qty,
+                    "received_qty": received_qty,
+                    "billed_qty": round(billed_qty, 2),
+                    "pending_qty": pending_qty,
+                    "ordered_percentage": round(ordered_percentage, 1),
+                    "received_percentage": round(received_percentage, 1),
+                    "billed_percentage": round(billed_percentage, 1),
+                    "rate": item.rate,
+                    "amount": item.amount
+                })
             except Exception as e:
-                frappe.log_error(f"Error aggregating item {getattr(item, 'item_code', None)} in MR {material_request_name}: {str(e)}")
+                frappe.log_error(f"Error processing item {item.item_code} in MR {material_request_name}: {str(e)}")
                 continue
-
-        # Build paginated items if requested
-        items_data = []
-        total_items = len(mr.items)
-        try:
-            page = int(page) if page else 1
-            page_size = int(page_size) if page_size else 100
-        except Exception:
-            page, page_size = 1, 100
-        if page < 1:
-            page = 1
-        if page_size < 1:
-            page_size = 50
-        total_pages = (total_items + page_size - 1) // page_size if page_size else 1
-        if total_pages < 1:
-            total_pages = 1
-        start_index = (page - 1) * page_size
-        end_index = min(start_index + page_size, total_items)
-
-        if int(include_items or 1):
-            for item in mr.items[start_index:end_index]:
-                try:
-                    requested_qty = item.qty or 0
-                    ordered_qty = item.ordered_qty or 0
-                    received_qty = item.received_qty or 0
-                    billed_qty = billed_qty_by_item_code.get(item.item_code, 0) or 0
-                    pending_qty = max(0, requested_qty - ordered_qty)
-                    ordered_percentage = (ordered_qty / requested_qty * 100) if requested_qty > 0 else 0
-                    received_percentage = (received_qty / requested_qty * 100) if requested_qty > 0 else 0
-                    billed_percentage = (billed_qty / requested_qty * 100) if requested_qty > 0 else 0
-                    items_data.append({
-                        "item_code": item.item_code,
-                        "item_name": item.item_name,
-                        "requested_qty": requested_qty,
-                        "ordered_qty": ordered_qty,
-                        "received_qty": received_qty,
-                        "billed_qty": round(billed_qty, 2),
-                        "pending_qty": pending_qty,
-                        "ordered_percentage": round(ordered_percentage, 1),
-                        "received_percentage": round(received_percentage, 1),
-                        "billed_percentage": round(billed_percentage, 1),
-                        "rate": item.rate,
-                        "amount": item.amount
-                    })
-                except Exception as e:
-                    frappe.log_error(f"Error processing item {item.item_code} in MR {material_request_name}: {str(e)}")
-                    continue
         
         # Overall percentages
         overall_ordered_percentage = (total_ordered / total_requested * 100) if total_requested > 0 else 0
@@ -116,7 +88,7 @@ def get_material_request_status_dashboard(material_request_name, page: int = 1,
             "title": mr.title,
             "material_request_type": mr.material_request_type,
             "customer": mr.customer,
-            "customer_name": getattr(mr, "customer_name", None),
+            "customer_name": mr.customer_name,
             "transaction_date": mr.transaction_date,
             "schedule_date": mr.schedule_date,
             "status": mr.status,
@@ -133,14 +105,7 @@ def get_material_request_status_dashboard(material_request_name, page: int = 1,
             "overall_received_percentage": round(overall_received_percentage, 1),
             "overall_billed_percentage": round(overall_billed_percentage, 1),
             "items_data": items_data,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_items,
-                "total_pages": total_pages,
-                "start_index": start_index,
-                "end_index": end_index,
-            },
+            "pagination": pagination,
             "po_status": po_status,
             "status_info": status_info
         }
@@ -149,71 +114,159 @@ def get_material_request_status_dashboard(material_request_name, page: int = 1,
         return None
 
 
-def get_billed_quantity_for_item(material_request_name, item_code):
+def get_material_request_header(material_request_name):
     """
-    Calculate billed quantity for a specific item from linked Purchase Orders
+    Get the header fields the dashboards need, without loading the item table
     """
-    try:
-        billed_qty = 0
-        
-        # Get Purchase Orders linked to this Material Request
-        po_list = frappe.get_all(
-            "Purchase Order",
-            filters={
-                "docstatus": 1,
-                "material_request": material_request_name
-            },
-            fields=["name"]
-        )
-        
-        for po in po_list:
-            try:
-                po_doc = frappe.get_doc("Purchase Order", po.name)
-                for po_item in po_doc.items:
-                    if po_item.item_code == item_code:
-                        # Calculate billed quantity from billed amount and rate
-                        billed_amt = po_item.billed_amt or 0
-                        rate = po_item.rate or 0
-                        if rate and rate > 0:
-                            billed_qty += billed_amt / rate
-            except Exception as e:
-                frappe.log_error(f"Error processing PO {po.name} for item {item_code}: {str(e)}")
-                continue
-        
-        return billed_qty
-    except Exception as e:
-        frappe.log_error(f"Error in get_billed_quantity_for_item for MR {material_request_name}, item {item_code}: {str(e)}")
-        return 0
+    return get_header(
+        "Material Request",
+        material_request_name,
+        ["name", "title", "material_request_type", "customer", "customer_name", "transaction_date", "schedule_date",
+         "status", "docstatus", "transfer_status", "per_ordered", "per_received"]
+    )
+
+
+# Ordered, received and billed quantity of every line of a Material Request (`%(mr)s`),
+# in the line's UOM. Each purchasing table is grouped by its item-level `material_request_item`
+# link (indexed with `material_request`), so lines ordered through POs built from several
+# MRs are counted, which the header-level `Purchase Order.material_request` misses.
+LINE_PROGRESS_QUERY = """
+        SELECT
+            mri.name, mri.item_code, mri.item_name, mri.qty, mri.rate, mri.amount,
+            IFNULL(ordered.stock_qty, 0) / IFNULL(NULLIF(mri.conversion_factor, 0), 1) AS ordered_qty,
+            IFNULL(received.stock_qty, 0) / IFNULL(NULLIF(mri.conversion_factor, 0), 1) AS received_qty,
+            IFNULL(billed.stock_qty, 0) / IFNULL(NULLIF(mri.conversion_factor, 0), 1) AS billed_qty
+        FROM `tabMaterial Request Item` mri
+        LEFT JOIN (
+            SELECT material_request_item, SUM(stock_qty) AS stock_qty
+            FROM `tabPurchase Order Item`
+            WHERE material_request = %(mr)s AND docstatus = 1
+            GROUP BY material_request_item
+        ) ordered ON ordered.material_request_item = mri.name
+        LEFT JOIN (
+            SELECT material_request_item, SUM(stock_qty) AS stock_qty
+            FROM `tabPurchase Receipt Item`
+            WHERE material_request = %(mr)s AND docstatus = 1
+            GROUP BY material_request_item
+        ) received ON received.material_request_item = mri.name
+        LEFT JOIN (
+            SELECT material_request_item, SUM(stock_qty) AS stock_qty
+            FROM `tabPurchase Invoice Item`
+            WHERE material_request = %(mr)s AND docstatus = 1
+            GROUP BY material_request_item
+        ) billed ON billed.material_request_item = mri.name
+        WHERE mri.parent = %(mr)s AND mri.parenttype = 'Material Request'
+"""
+
+
+# Stock UOM quantities are divided by this to compare them with `mri.qty`, like LINE_PROGRESS_QUERY does
+LINE_CONVERSION_FACTOR = "IFNULL(NULLIF(mri.conversion_factor, 0), 1)"
 
+# ERPNext's ordered / received counters on Material Request Item `mri` (stock UOM), in the line's UOM
+ORDERED_LINE_QTY = f"IFNULL(mri.ordered_qty, 0) / {LINE_CONVERSION_FACTOR}"
+RECEIVED_LINE_QTY = f"IFNULL(mri.received_qty, 0) / {LINE_CONVERSION_FACTOR}"
 
-def get_billed_quantity_map(material_request_name):
+# Quantity of a Purchase Invoice Item `pii` billed on Material Request Item `mri`, in the line's UOM
+BILLED_LINE_QTY = f"pii.stock_qty / {LINE_CONVERSION_FACTOR}"
+
+
+def get_material_request_item_totals(material_request_name):
     """
-    Calculate billed quantities for all items of an MR in a single query.
-    Returns a dict: { item_code: billed_qty }
+    Get line count and requested/ordered/received/billed/pending quantity totals of a Material Request in one query
     """
-    try:
-        # Aggregate billed quantity per item_code from submitted POs linked to this MR
-        results = frappe.db.sql(
-            """
+    return frappe.db.sql(f"""
+        SELECT
+            COUNT(*) AS total_items,
+            SUM(qty) AS total_requested,
+            SUM(ordered_qty) AS total_ordered,
+            SUM(received_qty) AS total_received,
+            SUM(billed_qty) AS total_billed,
+            SUM(GREATEST(IFNULL(qty, 0) - ordered_qty, 0)) AS total_pending,
+            SUM(CASE WHEN ordered_qty > 0 THEN 1 ELSE 0 END) AS ordered_items,
+            SUM(CASE WHEN received_qty > 0 THEN 1 ELSE 0 END) AS received_items
+        FROM ({LINE_PROGRESS_QUERY}) AS line_progress
+    """, {"mr": material_request_name}, as_dict=True)[0]
+
+
+def get_material_request_items_page(material_request_name, pagination):
+    """
+    Get the item rows of one dashboard page with their ordered/received/billed quantities, in form order
+    """
+    return frappe.db.sql(f"""
+        {LINE_PROGRESS_QUERY}
+        ORDER BY mri.idx
+        LIMIT %(limit)s OFFSET %(offset)s
+    """, {
+        "mr": material_request_name,
+        "limit": pagination.page_size,
+        "offset": pagination.start_index,
+    }, as_dict=True)
+
+
+@frappe.whitelist()
+@instrumented
+def get_material_request_dashboard_kpis_bulk(material_request_names):
+    """
+    Get ordered/received/billed KPIs for many Material Requests at once (list views, worklists).
+    Aggregates the item tables with grouped SQL instead of loading each document.
+    Documents the user cannot read are left out.
+    Returns a dict: { material_request_name: kpis }
+    """
+    frappe.has_permission("Material Request", "read", throw=True)
+    return get_material_request_kpis(get_permitted_names("Material Request", parse_names(material_request_names)))
+
+
+def get_material_request_kpis(names):
+    """
+    Aggregate ordered/received/billed KPIs of the given Material Requests, two queries per chunk of names.
+    Returns a dict: { material_request_name: kpis }
+    """
+    kpis_by_name = {}
+    for chunk in chunked(names):
+        rows = frappe.db.sql(f"""
             SELECT
-                poi.item_code,
-                SUM(CASE WHEN IFNULL(poi.rate, 0) > 0 THEN IFNULL(poi.billed_amt, 0) / poi.rate ELSE 0 END) AS billed_qty
-            FROM `tabPurchase Order Item` AS poi
-            INNER JOIN `tabPurchase Order` AS po ON po.name = poi.parent
-            WHERE po.docstatus = 1
-              AND po.material_request = %(mr)s
-            GROUP BY poi.item_code
-            """,
-            {"mr": material_request_name},
-            as_dict=True,
-        )
-        billed_map = {}
-        for row in results:
-            billed_map[row.get("item_code")] = float(row.get("billed_qty") or 0)
-        return billed_map
-    except Exception as e:
-        frappe.log_error(f"Error in get_billed_quantity_map for MR {material_request_name}: {str(e)}")
-        return {}
+                mr.name,
+                mr.status,
+                mr.docstatus,
+                SUM(mri.qty) AS total_requested,
+                SUM({ORDERED_LINE_QTY}) AS total_ordered,
+                SUM({RECEIVED_LINE_QTY}) AS total_received
+            FROM `tabMaterial Request` mr
+            JOIN `tabMaterial Request Item` mri ON mri.parent = mr.name AND mri.parenttype = 'Material Request'
+            WHERE mr.name IN %(names)s
+            GROUP BY mr.name, mr.status, mr.docstatus
+        """, {"names": tuple(chunk)}, as_dict=True)
+        
+        # Ordered, received and billed are stock UOM quantities converted back to the line UOM
+        # like LINE_PROGRESS_QUERY; billed comes from submitted Purchase Invoice Items raised against the lines
+        billed_rows = frappe.db.sql(f"""
+            SELECT mri.parent, SUM({BILLED_LINE_QTY}) AS total_billed
+            FROM `tabMaterial Request Item` mri
+            JOIN `tabPurchase Invoice Item` pii
+                ON pii.material_request = mri.parent AND pii.material_request_item = mri.name AND pii.docstatus = 1
+            WHERE mri.parent IN %(names)s AND mri.parenttype = 'Material Request'
+            GROUP BY mri.parent
+        """, {"names": tuple(chunk)})
+        billed_by_name = {name: flt(total_billed) for name, total_billed in billed_rows}
+        
+        for row in rows:
+            total_requested = flt(row.total_requested)
+            total_ordered = flt(row.total_ordered)
+            total_received = flt(row.total_received)
+            total_billed = billed_by_name.get(row.name, 0)
+            kpis_by_name[row.name] = {
+                "status": row.status,
+                "docstatus": row.docstatus,
+                "total_requested": total_requested,
+                "total_ordered": total_ordered,
+                "total_received": total_received,
+                "total_billed": round(total_billed, 2),
+                "ordered_percentage": percentage(total_ordered, total_requested),
+                "received_percentage": percentage(total_received, total_requested),
+                "billed_percentage": percentage(total_billed, total_requested)
+            }
+    
+    return kpis_by_name
 
 
 def get_po_creation_status(material_request_name):
@@ -222,53 +275,21 @@ def get_po_creation_status(material_request_name):
     """
     try:
         # Check if any Purchase Orders are created from this MR
-        po_list = frappe.get_all(
-            "Purchase Order",
-            filters={
-                "docstatus": ["in", [0, 1]],
-                "material_request": material_request_name
-            },
-            fields=["name", "status", "docstatus", "total"]
-        )
-        
-        if not po_list:
-            return {
-                "status": "No PO Created",
-                "status_color": "red",
-                "message": "No Purchase Orders created from this Material Request",
-                "po_count": 0,
-                "total_amount": 0
-            }
-        
-        # Calculate total PO amount
-        total_amount = sum(po.total or 0 for po in po_list)
+        po_list = frappe.db.sql("""
+            SELECT po.name, po.status, po.docstatus, po.total
+            FROM `tabPurchase Order` po
+            WHERE po.docstatus IN (0, 1)
+              AND po.name IN (
+                SELECT parent FROM `tabPurchase Order Item`
+                WHERE material_request = %s AND parenttype = 'Purchase Order'
+              )
+        """, (material_request_name,), as_dict=True)
         
-        # Determine overall PO status
-        draft_pos = [po for po in po_list if po.docstatus == 0]
-        submitted_pos = [po for po in po_list if po.docstatus == 1]
-        
-        if draft_pos and not submitted_pos:
-            status = "Draft POs Only"
-            status_color = "orange"
-            message = f"{len(draft_pos)} draft Purchase Order(s) created"
-        elif submitted_pos:
-            status = "POs Created"
-            status_color = "green"
-            message = f"{len(submitted_pos)} submitted Purchase Order(s) created"
-        else:
-            status = "Mixed Status"
-            status_color = "blue"
-            message = f"{len(draft_pos)} draft and {len(submitted_pos)} submitted Purchase Order(s)"
-        
-        return {
-            "status": status,
-            "status_color": status_color,
-            "message": message,
-            "po_count": len(po_list),
-            "total_amount": total_amount,
-            "draft_count": len(draft_pos),
-            "submitted_count": len(submitted_pos)
-        }
+        return get_po_creation_status_info(
+            draft_count=sum(1 for po in po_list if po.docstatus == 0),
+            submitted_count=sum(1 for po in po_list if po.docstatus == 1),
+            total_amount=sum(po.total or 0 for po in po_list)
+        )
     except Exception as e:
         frappe.log_error(f"Error in get_po_creation_status for MR {material_request_name}: {str(e)}")
         return {
@@ -280,6 +301,44 @@ def get_po_creation_status(material_request_name):
         }
 
 
+def get_po_creation_status_info(draft_count, submitted_count, total_amount):
+    """
+    Describe the PO creation status of a Material Request from its draft and submitted PO counts
+    """
+    if not draft_count and not submitted_count:
+        return {
+            "status": "No PO Created",
+            "status_color": "red",
+            "message": "No Purchase Orders created from this Material Request",
+            "po_count": 0,
+            "total_amount": 0
+        }
+    
+    # Determine overall PO status
+    if draft_count and not submitted_count:
+        status = "Draft POs Only"
+        status_color = "orange"
+        message = f"{draft_count} draft Purchase Order(s) created"
+    elif submitted_count:
+        status = "POs Created"
+        status_color = "green"
+        message = f"{submitted_count} submitted Purchase Order(s) created"
+    else:
+        status = "Mixed Status"
+        status_color = "blue"
+        message = f"{draft_count} draft and {submitted_count} submitted Purchase Order(s)"
+    
+    return {
+        "status": status,
+        "status_color": status_color,
+        "message": message,
+        "po_count": draft_count + submitted_count,
+        "total_amount": total_amount,
+        "draft_count": draft_count,
+        "submitted_count": submitted_count
+    }
+
+
 def get_mr_detailed_status_info(mr, ordered_percentage, received_percentage, billed_percentage):
     """
     Get detailed status information for the Material Request dashboard
@@ -357,25 +416,28 @@ def get_mr_detailed_status_info(mr, ordered_percentage, received_percentage, bil
 
 
 @frappe.whitelist()
+@instrumented
+@cached_dashboard("Material Request", "material_request_name")
 def get_material_request_summary(material_request_name):
     """
     Get a quick summary of Material Request status
     """
-    try:
-        mr = frappe.get_doc("Material Request", material_request_name)
-    except frappe.DoesNotExistError:
+    mr = get_material_request_header(material_request_name)
+    if not mr:
         return None
     
     # Get basic counts
-    total_items = len(mr.items)
-    ordered_items = sum(1 for item in mr.items if item.ordered_qty and item.ordered_qty > 0)
-    received_items = sum(1 for item in mr.items if item.received_qty and item.received_qty > 0)
+    totals = get_material_request_item_totals(mr.name)
+    total_items = cint(totals.total_items)
+    ordered_items = cint(totals.ordered_items)
+    received_items = cint(totals.received_items)
     
     # Get PO count
-    po_count = frappe.db.count("Purchase Order", {
-        "material_request": material_request_name,
-        "docstatus": ["in", [0, 1]]
-    })
+    po_count = frappe.db.sql("""
+        SELECT COUNT(DISTINCT parent)
+        FROM `tabPurchase Order Item`
+        WHERE material_request = %s AND parenttype = 'Purchase Order' AND docstatus IN (0, 1)
+    """, (material_request_name,))[0][0]
     
     return {
         "total_items": total_items,
@@ -385,4 +447,254 @@ def get_material_request_summary(material_request_name):
         "status": mr.status,
         "per_ordered": mr.per_ordered,
         "per_received": mr.per_received
-    } 
\ No newline at end of file
+    } 
+
+
+# Statuses of submitted Material Requests that are no longer open for purchasing
+CLOSED_MATERIAL_REQUEST_STATUSES = ("Stopped", "Cancelled", "Received", "Issued", "Transferred", "Manufactured")
+
+# Columns the portfolio can be sorted by, and the SQL expression each sorts on
+PORTFOLIO_SORT_EXPRESSIONS = {
+    "transaction_date": "mr.transaction_date",
+    "schedule_date": "IFNULL(mr.schedule_date, '9999-12-31')",
+    "name": "mr.name",
+    "per_ordered": "IFNULL(mr.per_ordered, 0)",
+    "per_received": "IFNULL(mr.per_received, 0)",
+}
+
+PORTFOLIO_PAGE_SIZE = 50
+PORTFOLIO_MAX_PAGE_SIZE = 500
+
+# Seconds a portfolio page is cached (capped by buying_addon_dashboard_cache_ttl; 0 disables)
+PORTFOLIO_CACHE_TTL = 60
+PORTFOLIO_CACHE_PREFIX = "buying_addon:material_request_portfolio:"
+
+# Age buckets (days since transaction_date) of the portfolio summary
+PORTFOLIO_AGING_BUCKETS = (("0-30", 0, 30), ("31-60", 31, 60), ("61-90", 61, 90), ("90+", 91, None))
+
+
+@frappe.whitelist()
+@instrumented
+def get_material_request_portfolio(company=None, warehouse=None, material_request_type=None, status=None,
+                                   sort_by="transaction_date", sort_order="asc", cursor=None,
+                                   page_size=PORTFOLIO_PAGE_SIZE):
+    """
+    Get ordered/received/billed KPIs, PO creation status and age of all open Material Requests.
+
+    Rows are sorted on the server and paged with a keyset `cursor` (the `next_cursor` of the
+    previous page). The first page (no cursor) also carries a summary of the whole portfolio:
+    counts, aging buckets and quantity totals. Only Material Requests the user can read are
+    included, and results are cached briefly per user and set of arguments.
+    """
+    frappe.has_permission("Material Request", "read", throw=True)
+
+    if sort_by not in PORTFOLIO_SORT_EXPRESSIONS:
+        frappe.throw(_("Cannot sort the portfolio by {0}").format(sort_by))
+
+    args = {
+        "company": company,
+        "warehouse": warehouse,
+        "material_request_type": material_request_type,
+        "status": status,
+        "sort_by": sort_by,
+        "sort_order": "desc" if str(sort_order).lower() == "desc" else "asc",
+        "cursor": frappe.parse_json(cursor) if cursor else None,
+        "page_size": min(max(cint(page_size), 1), PORTFOLIO_MAX_PAGE_SIZE),
+    }
+
+    ttl = min(get_cache_ttl(), PORTFOLIO_CACHE_TTL)
+    if ttl <= 0:
+        return get_portfolio_page(**args)
+
+    signature = frappe.as_json(dict(args, user=frappe.session.user), indent=None)
+    key = PORTFOLIO_CACHE_PREFIX + hashlib.md5(signature.encode()).hexdigest()
+    result = frappe.cache().get_value(key)
+    if result is None:
+        result = get_portfolio_page(**args)
+        frappe.cache().set_value(key, result, expires_in_sec=ttl)
+    return result
+
+
+def get_portfolio_page(company, warehouse, material_request_type, status, sort_by, sort_order, cursor, page_size):
+    """
+    Compute one portfolio page: the page of Material Requests, their KPIs (get_material_request_kpis),
+    their PO creation status, and on the first page the portfolio summary
+    """
+    conditions, values = get_portfolio_conditions(company, warehouse, material_request_type, status)
+    sort_expression = PORTFOLIO_SORT_EXPRESSIONS[sort_by]
+    comparison = "<" if sort_order == "desc" else ">"
+
+    keyset = ""
+    if cursor:
+        keyset = f"""AND ({sort_expression} {comparison} %(cursor_value)s
+            OR ({sort_expression} = %(cursor_value)s AND mr.name {comparison} %(cursor_name)s))"""
+        values.update(cursor_value=cursor[0], cursor_name=cursor[1])
+
+    rows = frappe.db.sql(f"""
+        SELECT
+            mr.name, mr.title, mr.company, mr.material_request_type, mr.status, mr.docstatus,
+            mr.transaction_date, mr.schedule_date, mr.per_ordered, mr.per_received,
+            DATEDIFF(CURDATE(), mr.transaction_date) AS age_days,
+            {sort_expression} AS sort_value
+        FROM `tabMaterial Request` mr
+        WHERE {conditions}
+        {keyset}
+        ORDER BY sort_value {sort_order}, mr.name {sort_order}
+        LIMIT %(limit)s
+    """, dict(values, limit=page_size + 1), as_dict=True)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = frappe.as_json([rows[-1].sort_value, rows[-1].name], indent=None)
+
+    names = [row.name for row in rows]
+    kpis_by_name = get_material_request_kpis(names)
+    po_status_by_name = get_portfolio_po_status_map(names)
+
+    material_requests = []
+    for row in rows:
+        kpis = kpis_by_name.get(row.name) or {}
+        material_requests.append({
+            "name": row.name,
+            "title": row.title,
+            "company": row.company,
+            "material_request_type": row.material_request_type,
+            "status": row.status,
+            "transaction_date": row.transaction_date,
+            "schedule_date": row.schedule_date,
+            "age_days": cint(row.age_days),
+            "kpis": kpis,
+            "po_status": po_status_by_name.get(row.name) or get_po_creation_status_info(0, 0, 0),
+            "status_info": get_mr_detailed_status_info(
+                row,
+                kpis.get("ordered_percentage", 0),
+                kpis.get("received_percentage", 0),
+                kpis.get("billed_percentage", 0)
+            ),
+        })
+
+    return {
+        "material_requests": material_requests,
+        "next_cursor": next_cursor,
+        "summary": None if cursor else get_portfolio_summary(conditions, values),
+    }
+
+
+def get_portfolio_conditions(company=None, warehouse=None, material_request_type=None, status=None):
+    """
+    Build the WHERE clause (on `tabMaterial Request` mr) selecting the open Material Requests
+    the user can read that match the filters
+    """
+    conditions = [
+        "mr.docstatus = 1",
+        "mr.status NOT IN %(closed_statuses)s",
+        f"mr.name IN ({get_permitted_names_query('Material Request')})",
+    ]
+    values = {"closed_statuses": CLOSED_MATERIAL_REQUEST_STATUSES}
+
+    if company:
+        conditions.append("mr.company = %(company)s")
+        values["company"] = company
+    if material_request_type:
+        conditions.append("mr.material_request_type = %(material_request_type)s")
+        values["material_request_type"] = material_request_type
+    if status:
+        conditions.append("mr.status = %(status)s")
+        values["status"] = status
+    if warehouse:
+        conditions.append("""EXISTS (
+            SELECT 1 FROM `tabMaterial Request Item` wh
+            WHERE wh.parent = mr.name AND wh.parenttype = 'Material Request' AND wh.warehouse = %(warehouse)s
+        )""")
+        values["warehouse"] = warehouse
+
+    return " AND ".join(conditions), values
+
+
+def get_portfolio_po_status_map(names):
+    """
+    Get the PO creation status of each Material Request from one grouped query over the item-level links.
+    Returns a dict: { material_request_name: po_status }
+    """
+    if not names:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT
+            links.material_request,
+            SUM(CASE WHEN po.docstatus = 0 THEN 1 ELSE 0 END) AS draft_count,
+            SUM(CASE WHEN po.docstatus = 1 THEN 1 ELSE 0 END) AS submitted_count,
+            SUM(po.total) AS total_amount
+        FROM (
+            SELECT DISTINCT material_request, parent
+            FROM `tabPurchase Order Item`
+            WHERE material_request IN %(names)s AND parenttype = 'Purchase Order' AND docstatus < 2
+        ) links
+        JOIN `tabPurchase Order` po ON po.name = links.parent
+        GROUP BY links.material_request
+    """, {"names": tuple(names)}, as_dict=True)
+
+    return {
+        row.material_request: get_po_creation_status_info(
+            cint(row.draft_count), cint(row.submitted_count), flt(row.total_amount)
+        )
+        for row in rows
+    }
+
+
+def get_portfolio_summary(conditions, values):
+    """
+    Count, age and quantity totals of every Material Request matching the portfolio filters
+    """
+    aging = ", ".join(
+        f"SUM(CASE WHEN DATEDIFF(CURDATE(), mr.transaction_date) >= {low}"
+        + (f" AND DATEDIFF(CURDATE(), mr.transaction_date) <= {high}" if high is not None else "")
+        + f" THEN 1 ELSE 0 END) AS `{label}`"
+        for label, low, high in PORTFOLIO_AGING_BUCKETS
+    )
+    summary = frappe.db.sql(f"""
+        SELECT
+            COUNT(*) AS total_material_requests,
+            SUM(CASE WHEN mr.schedule_date < CURDATE() THEN 1 ELSE 0 END) AS overdue,
+            {aging}
+        FROM `tabMaterial Request` mr
+        WHERE {conditions}
+    """, values, as_dict=True)[0]
+
+    totals = frappe.db.sql(f"""
+        SELECT
+            SUM(mri.qty) AS total_requested,
+            SUM({ORDERED_LINE_QTY}) AS total_ordered,
+            SUM({RECEIVED_LINE_QTY}) AS total_received
+        FROM `tabMaterial Request` mr
+        JOIN `tabMaterial Request Item` mri ON mri.parent = mr.name AND mri.parenttype = 'Material Request'
+        WHERE {conditions}
+    """, values, as_dict=True)[0]
+
+    total_billed = frappe.db.sql(f"""
+        SELECT SUM({BILLED_LINE_QTY})
+        FROM `tabMaterial Request` mr
+        JOIN `tabMaterial Request Item` mri ON mri.parent = mr.name AND mri.parenttype = 'Material Request'
+        JOIN `tabPurchase Invoice Item` pii
+            ON pii.material_request = mri.parent AND pii.material_request_item = mri.name AND pii.docstatus = 1
+        WHERE {conditions}
+    """, values)[0][0]
+
+    total_requested = flt(totals.total_requested)
+    total_ordered = flt(totals.total_ordered)
+    total_received = flt(totals.total_received)
+    total_billed = flt(total_billed)
+
+    return {
+        "total_material_requests": cint(summary.total_material_requests),
+        "overdue": cint(summary.overdue),
+        "aging": {label: cint(summary[label]) for label, low, high in PORTFOLIO_AGING_BUCKETS},
+        "total_requested": total_requested,
+        "total_ordered": total_ordered,
+        "total_received": total_received,
+        "total_billed": round(total_billed, 2),
+        "ordered_percentage": percentage(total_ordered, total_requested),
+        "received_percentage": percentage(total_received, total_requested),
+        "billed_percentage": percentage(total_billed, total_requested),
+    }
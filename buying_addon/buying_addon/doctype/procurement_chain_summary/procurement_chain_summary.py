@@ -0,0 +1,133 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, now
+
+# Quantity column maintained for each source document type and its item table
+SUMMARY_SOURCES = {
+	"Material Request": ("Material Request Item", "requested_qty"),
+	"Purchase Order": ("Purchase Order Item", "ordered_qty"),
+	"Purchase Receipt": ("Purchase Receipt Item", "received_qty"),
+	"Purchase Invoice": ("Purchase Invoice Item", "billed_qty"),
+}
+
+
+class ProcurementChainSummary(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_unique(
+		"Procurement Chain Summary",
+		["sales_order", "item_code"],
+		constraint_name="unique_sales_order_item_code"
+	)
+
+
+def update_procurement_chain_summary(doc, method):
+	"""
+	doc_events handler for MR / PO / PR / PI on_submit and on_cancel.
+	Adds (on submit) or subtracts (on cancel) the document's item quantities
+	from the summary rows of the linked Sales Orders.
+	"""
+	if doc.doctype not in SUMMARY_SOURCES:
+		return
+
+	sign = -1 if method == "on_cancel" else 1
+	fieldname = SUMMARY_SOURCES[doc.doctype][1]
+
+	deltas = {}
+	for item in doc.get("items") or []:
+		# Item level link first, header level link for documents raised against a single Sales Order
+		sales_order = item.get("sales_order") or doc.get("sales_order")
+		if not sales_order or not item.item_code:
+			continue
+
+		key = (sales_order, item.item_code)
+		deltas[key] = deltas.get(key, 0) + sign * flt(item.qty)
+
+	apply_quantity_deltas(fieldname, deltas)
+
+
+def apply_quantity_deltas(fieldname, deltas):
+	"""
+	Upsert summary rows, adding each delta to `fieldname`.
+	deltas: { (sales_order, item_code): qty }
+	"""
+	if not deltas:
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+	values = []
+	for (sales_order, item_code), qty in deltas.items():
+		if not qty:
+			continue
+		values.append((frappe.generate_hash(length=10), sales_order, item_code, qty, timestamp, timestamp, user, user))
+
+	if not values:
+		return
+
+	placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(values))
+	frappe.db.sql(f"""
+		INSERT INTO `tabProcurement Chain Summary`
+			(name, sales_order, item_code, `{fieldname}`, creation, modified, owner, modified_by)
+		VALUES {placeholders}
+		ON DUPLICATE KEY UPDATE
+			`{fieldname}` = `{fieldname}` + VALUES(`{fieldname}`),
+			modified = VALUES(modified),
+			modified_by = VALUES(modified_by)
+	""", tuple(value for row in values for value in row))
+
+
+def rebuild_procurement_chain_summary(sales_order=None):
+	"""
+	Recompute summary rows from submitted transactions.
+	Used to backfill the table and to repair it; pass `sales_order` to limit the rebuild.
+	"""
+	if sales_order:
+		frappe.db.delete("Procurement Chain Summary", {"sales_order": sales_order})
+	else:
+		frappe.db.delete("Procurement Chain Summary")
+
+	for parent_doctype, (child_doctype, fieldname) in SUMMARY_SOURCES.items():
+		link_columns = []
+		if frappe.db.has_column(child_doctype, "sales_order"):
+			link_columns.append("NULLIF(child.sales_order, '')")
+		if frappe.db.has_column(parent_doctype, "sales_order"):
+			link_columns.append("NULLIF(parent.sales_order, '')")
+		if not link_columns:
+			continue
+
+		sales_order_expr = f"COALESCE({', '.join(link_columns)})" if len(link_columns) > 1 else link_columns[0]
+		condition = f"AND {sales_order_expr} = %(sales_order)s" if sales_order else ""
+
+		rows = frappe.db.sql(f"""
+			SELECT
+				{sales_order_expr} AS sales_order,
+				child.item_code,
+				SUM(child.qty) AS qty
+			FROM `tab{child_doctype}` child
+			JOIN `tab{parent_doctype}` parent ON child.parent = parent.name
+			WHERE parent.docstatus = 1
+				AND {sales_order_expr} IS NOT NULL
+				{condition}
+			GROUP BY {sales_order_expr}, child.item_code
+		""", {"sales_order": sales_order}, as_dict=True)
+
+		apply_quantity_deltas(fieldname, {
+			(row.sales_order, row.item_code): flt(row.qty) for row in rows if row.item_code
+		})
+
+
+def get_summary_map(sales_order_name):
+	"""
+	Get summary rows of a Sales Order.
+	Returns a dict: { item_code: row }
+	"""
+	rows = frappe.db.sql("""
+		SELECT item_code, requested_qty, ordered_qty, received_qty, billed_qty
+		FROM `tabProcurement Chain Summary`
+		WHERE sales_order = %s
+	""", (sales_order_name,), as_dict=True)
+
+	return {row.item_code: row for row in rows}
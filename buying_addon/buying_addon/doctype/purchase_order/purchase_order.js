@@ -63,6 +63,13 @@ frappe.ui.form.on('Purchase Order', {
 			}, __('Actions'));
 		}
 		
+		// Add batch last purchase rates button
+		if (frm.doc.items && frm.doc.items.length > 0) {
+			frm.add_custom_button(__('Last Purchase Rates (All Items)'), function() {
+				load_all_last_purchase_rates(frm, true);
+			}, __('View'));
+		}
+		
 		// Add Change Supplier button (only for draft documents)
 		if (frm.doc.docstatus === 0) {
 			frm.add_custom_button(__('Change Supplier'), function() {
@@ -217,9 +224,15 @@ frappe.ui.form.on('Purchase Order', {
 			}
 		}
 		
-		// Load dashboard data when form loads
-		if (frm.doc.name && !frm.doc.__islocal) {
-			frm.trigger("load_order_status_dashboard");
+		// Reload the dashboard when the server reports that a linked document changed it;
+		// the first load happens in refresh, which always follows onload
+		if (!frm.po_dashboard_listener) {
+			frm.po_dashboard_listener = true;
+			frappe.realtime.on('buying_addon_dashboard_invalidated', (data) => {
+				if (cur_frm === frm && data.doctype === frm.doctype && data.name === frm.doc.name && !frm.is_dirty()) {
+					frm.trigger('load_order_status_dashboard');
+				}
+			});
 		}
 	},
 	
@@ -256,11 +269,29 @@ frappe.ui.form.on('Purchase Order', {
 	},
 	
 	load_order_status_dashboard: function(frm) {
+		// Initialize pagination state
+		if (!frm.po_dashboard_page_size) {
+			frm.po_dashboard_page_size = 50;
+		}
+		if (!frm.po_dashboard_page) {
+			frm.po_dashboard_page = 1;
+		}
+
 		frm.call({
 			method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_purchase_order_status_dashboard',
-			args: { purchase_order_name: frm.doc.name },
+			args: {
+				purchase_order_name: frm.doc.name,
+				page: frm.po_dashboard_page,
+				page_size: frm.po_dashboard_page_size,
+				// Lets the server answer "unchanged" instead of recomputing the dashboard
+				dashboard_version: frm.po_dashboard_data && frm.po_dashboard_data.version
+			},
 			callback: function(r) {
-				if (r.message) {
+				if (r.message && r.message.unchanged) {
+					// Redraw the data we already have in case the field was re-rendered
+					frm.events.render_order_status_dashboard(frm, frm.po_dashboard_data);
+				} else if (r.message) {
+					frm.po_dashboard_data = r.message;
 					frm.events.render_order_status_dashboard(frm, r.message);
 				} else {
 					// Show error message if no data
@@ -285,6 +316,19 @@ frappe.ui.form.on('Purchase Order', {
 			$(dashboard_html).appendTo(wrapper);
 		}
 	},
+
+	change_po_dashboard_page: function(frm, new_page) {
+		if (!new_page || new_page < 1) return;
+		frm.po_dashboard_page = new_page;
+		frm.trigger('load_order_status_dashboard');
+	},
+
+	change_po_dashboard_page_size: function(frm, new_size) {
+		const size = parseInt(new_size, 10) || 50;
+		frm.po_dashboard_page_size = size;
+		frm.po_dashboard_page = 1;
+		frm.trigger('load_order_status_dashboard');
+	},
 	
 	// Reload dashboard when items are updated
 	items: function(frm) {
@@ -343,10 +387,10 @@ frappe.ui.form.on('Purchase Order', {
 	}
 })
 
-function show_purchase_order_dashboard(frm) {
+function show_purchase_order_dashboard(frm, page) {
 	frm.call({
 		method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_purchase_order_dashboard_data',
-		args: { purchase_order_name: frm.doc.name },
+		args: { purchase_order_name: frm.doc.name, page: page || 1, page_size: 50 },
 		callback: function(r) {
 			if (r.message) {
 				show_dashboard_dialog(r.message, frm);
@@ -356,7 +400,13 @@ function show_purchase_order_dashboard(frm) {
 }
 
 function show_dashboard_dialog(data, frm) {
-	let dialog = new frappe.ui.Dialog({
+	// Paging re-renders the open dialog instead of stacking a new one
+	if (frm.po_dashboard_dialog && frm.po_dashboard_dialog.display) {
+		frm.po_dashboard_dialog.fields_dict.dashboard_content.$wrapper.html(create_dashboard_html(data));
+		return;
+	}
+
+	let dialog = frm.po_dashboard_dialog = new frappe.ui.Dialog({
 		title: __('Purchase Order Dashboard'),
 		size: 'large',
 		fields: [
@@ -428,6 +478,7 @@ function create_dashboard_html(data) {
 			<!-- Items Table -->
 			<div style="background: white; border: 1px solid #e0e0e0; border-radius: 8px; overflow: hidden;">
 				<h4 style="margin: 0; padding: 15px; background: #f8f9fa; border-bottom: 1px solid #e0e0e0;">Items Breakdown</h4>
+				${po_dashboard_pagination_html(data.pagination, page => `show_purchase_order_dashboard(cur_frm, ${page})`)}
 				<div style="overflow-x: auto;">
 					<table style="width: 100%; border-collapse: collapse;">
 						<thead>
@@ -558,6 +609,11 @@ function create_order_status_dashboard_html(data) {
 			<!-- Items Table -->
 			<div style="background: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
 				<h4 style="margin: 0; padding: 15px; background: #f8f9fa; border-bottom: 1px solid #e0e0e0; font-size: 16px;">Items Breakdown</h4>
+				${po_dashboard_pagination_html(
+					data.pagination,
+					page => `cur_frm.events.change_po_dashboard_page(cur_frm, ${page})`,
+					'cur_frm.events.change_po_dashboard_page_size(cur_frm, this.value)'
+				)}
 				<div style="overflow-x: auto;">
 					<table style="width: 100%; border-collapse: collapse; font-size: 12px;">
 						<thead>
@@ -621,6 +677,115 @@ function create_order_status_dashboard_html(data) {
 	return html;
 }
 
+// Pager shown above the items tables; `go_to_page` builds the onclick handler for a page number
+function po_dashboard_pagination_html(pagination, go_to_page, change_page_size) {
+	if (!pagination || pagination.total_pages <= 1 && !change_page_size) {
+		return '';
+	}
+
+	const page = pagination.page;
+	const last_page = pagination.total_pages;
+	return `
+		<div style="display:flex; justify-content: space-between; align-items:center; padding: 10px 15px;">
+			<div style="font-size:12px; color:#666;">${(pagination.total_items || 0) > 0 ? `Showing <b>${pagination.start_index + 1}</b> - <b>${pagination.end_index}</b> of <b>${pagination.total_items}</b>` : 'No items'}</div>
+			<div style="display:flex; gap:6px; align-items:center;">
+				<button onclick="${go_to_page(1)}" style="padding:4px 8px;">⏮</button>
+				<button onclick="${go_to_page(Math.max(1, page - 1))}" style="padding:4px 8px;">◀</button>
+				<span style="font-size:12px;">Page <b>${page}</b> / ${last_page}</span>
+				<button onclick="${go_to_page(Math.min(last_page, page + 1))}" style="padding:4px 8px;">▶</button>
+				<button onclick="${go_to_page(last_page)}" style="padding:4px 8px;">⏭</button>
+				${change_page_size ? `
+					<select onchange="${change_page_size}" style="margin-left:8px;">
+						<option value="25" ${pagination.page_size == 25 ? 'selected' : ''}>25</option>
+						<option value="50" ${pagination.page_size == 50 ? 'selected' : ''}>50</option>
+						<option value="100" ${pagination.page_size == 100 ? 'selected' : ''}>100</option>
+					</select>
+				` : ''}
+			</div>
+		</div>
+	`;
+}
+
+// Fetch the rate history of every item on the PO in one request and show it inline in the grid
+function load_all_last_purchase_rates(frm, show_dialog) {
+	const item_codes = [...new Set((frm.doc.items || []).map(d => d.item_code).filter(Boolean))];
+	if (!item_codes.length) {
+		return;
+	}
+	
+	frm.call({
+		method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_last_purchase_details_bulk',
+		freeze: true,
+		freeze_message: __('Getting Data'),
+		args: { item_codes: item_codes },
+		callback: function(r) {
+			frm._last_purchase_rates = r.message || {};
+			render_last_purchase_rates_inline(frm);
+			if (show_dialog) {
+				show_last_purchase_rates_dialog(frm._last_purchase_rates);
+			}
+		}
+	});
+}
+
+function render_last_purchase_rates_inline(frm) {
+	const rates = frm._last_purchase_rates || {};
+	(frm.fields_dict.items.grid.grid_rows || []).forEach(grid_row => {
+		const history = rates[grid_row.doc.item_code] || [];
+		const $column = grid_row.columns && grid_row.columns.rate;
+		if (!$column) {
+			return;
+		}
+		$column.find('.buying-addon-last-rate').remove();
+		if (history.length) {
+			const last = history[0];
+			const esc = value => frappe.utils.escape_html(value == null ? '' : String(value));
+			$column.append(`<div class="buying-addon-last-rate text-muted small" title="${esc(last.supplier)} (${esc(last.date)})">${__('Last')}: ${esc(last.rate)} ${esc(last.currency)}</div>`);
+		}
+	});
+}
+
+function show_last_purchase_rates_dialog(rates) {
+	rates = rates || {};
+	const esc = value => frappe.utils.escape_html(value == null ? '' : String(value));
+	let html = `<table class="table table-bordered">
+		<thead>
+			<tr>
+				<th>${__('Item')}</th>
+				<th>${__('Date')}</th>
+				<th>${__('Invoice No')}</th>
+				<th>${__('Supplier')}</th>
+				<th>${__('Currency')}</th>
+				<th>${__('Rate')}</th>
+				<th>${__('Qty')}</th>
+			</tr>
+		</thead>
+		<tbody>`;
+	Object.keys(rates).forEach(item_code => {
+		rates[item_code].forEach(item => {
+			html += `
+			<tr>
+				<td>${esc(item_code)}</td>
+				<td>${esc(item.date)}</td>
+				<td><a href="/app/purchase-order/${encodeURIComponent(item.invoice_no)}">${esc(item.invoice_no)}</a></td>
+				<td>${esc(item.supplier)}</td>
+				<td>${esc(item.currency)}</td>
+				<td>${esc(item.rate)}</td>
+				<td>${esc(item.qty)}</td>
+			</tr>`;
+		});
+	});
+	html += `</tbody></table>`;
+	
+	const d = new frappe.ui.Dialog({
+		title: __('Last Purchase Rates'),
+		size: 'large',
+		fields: [{ fieldname: 'lp_rates', fieldtype: 'HTML' }]
+	});
+	d.fields_dict.lp_rates.$wrapper.html(html);
+	d.show();
+}
+
 // run through client script 
 frappe.ui.form.on("Purchase Order Item", {
 	custom_last_purchase_rates:function(frm,cdt,cdn){
@@ -629,22 +794,12 @@ frappe.ui.form.on("Purchase Order Item", {
             method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_last_purchase_details_custom',
 			freeze: true,
 			freeze_message: __('Getting Data'),
-			args: { item_code: row.item_code },
+			args: { item_code: row.item_code, as_json: 1 },
 			callback: function(r) {
-				if (r && r.message) {
-					var d = new frappe.ui.Dialog({
-						title: __('Last Purchase Rates'),
-						fields: [
-							{
-								"fieldname": "lp_rates",
-								"fieldtype": "HTML",
-							}
-						],
-					})
-					d.fields_dict.lp_rates.$wrapper.html(r.message)
-					d.show()
+				if (r && r.message && r.message.length) {
+					show_last_purchase_rates_dialog({ [row.item_code]: r.message });
 				}
-				else{
+				else {
 					frappe.msgprint("No data found.")
 				}
 			}
@@ -787,10 +942,30 @@ function consolidate_items(frm) {
 		return;
 	}
 	
+	// Send only the rows changed since the last save; saved rows are grouped on the server
+	const tracking = get_consolidation_tracking(frm);
+	const changed_rows = frm.doc.items
+		.filter(row => frm.doc.__islocal || row.__islocal || row.__unsaved || tracking.changed_rows.has(row.name))
+		.map(row => ({
+			name: row.__islocal ? null : row.name,
+			idx: row.idx,
+			item_code: row.item_code,
+			item_name: row.item_name,
+			item_group: row.item_group,
+			qty: row.qty,
+			uom: row.uom,
+			rate: row.rate,
+			amount: row.amount
+		}));
+
 	// Call the server-side consolidation function
 	frm.call({
 		method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_consolidated_items',
-		args: { doc: frm.doc },
+		args: {
+			purchase_order_name: frm.doc.__islocal ? null : frm.doc.name,
+			changed_rows: changed_rows,
+			removed_rows: Array.from(tracking.removed_rows)
+		},
 		callback: function(r) {
 			if (r.message) {
 				// Update the custom table with consolidated data
@@ -808,6 +983,36 @@ function consolidate_items(frm) {
 	});
 }
 
+// Track the item rows changed or removed since the last save, for consolidate_items
+frappe.ui.form.on('Purchase Order Item', {
+	item_code: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	qty: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	uom: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	rate: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	amount: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	custom_qty_: (frm, cdt, cdn) => track_consolidation_change(frm, cdn),
+	// `<table>_remove` is triggered on the child doctype
+	items_remove(frm, cdt, cdn) {
+		if (!cdn.startsWith('new-')) {
+			get_consolidation_tracking(frm).removed_rows.add(cdn);
+		}
+	}
+});
+
+function track_consolidation_change(frm, cdn) {
+	get_consolidation_tracking(frm).changed_rows.add(cdn);
+}
+
+// The tracked rows belong to one saved version of one document: opening another
+// Purchase Order, saving or reloading changes the key and starts a new tracking
+function get_consolidation_tracking(frm) {
+	const key = `${frm.doc.name}|${frm.doc.modified || ''}`;
+	if (!frm._consolidation_tracking || frm._consolidation_tracking.key !== key) {
+		frm._consolidation_tracking = { key: key, changed_rows: new Set(), removed_rows: new Set() };
+	}
+	return frm._consolidation_tracking;
+}
+
 // Function to change supplier
 function change_supplier(frm) {
 	// Only allow changing supplier for draft documents
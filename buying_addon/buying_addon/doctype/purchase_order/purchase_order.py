@@ -1,6 +1,21 @@
+import hashlib
+
 import frappe
+from frappe import _
+from frappe.model import table_fields
 from frappe.model.document import Document
-from frappe.utils import get_url
+from frappe.utils import flt, cint, getdate
+
+from buying_addon.buying_addon.doctype.purchase_rate_history.purchase_rate_history import (
+	get_purchase_rate_history,
+	get_purchase_rate_history_version,
+)
+from buying_addon.utils.bulk import chunked, get_permitted_names, parse_names, percentage
+from buying_addon.utils.dashboard_cache import cached_dashboard
+from buying_addon.utils.instrumentation import instrumented
+from buying_addon.utils.pagination import DEFAULT_PAGE_SIZE, get_pagination
+from buying_addon.utils.projection import get_child_rows, get_header
+from buying_addon.utils.rate_history import PURCHASE_RATE_COLUMNS, get_rate_history_html
 
 # class PurchaseOrder(Document):
 #     def before_save(self):
@@ -8,27 +23,30 @@ from frappe.utils import get_url
 
 
 @frappe.whitelist()
-def get_purchase_order_dashboard_data(purchase_order_name):
+@instrumented
+@cached_dashboard("Purchase Order", "purchase_order_name")
+def get_purchase_order_dashboard_data(purchase_order_name, page=1, page_size=DEFAULT_PAGE_SIZE, include_items=1):
     """
     Get dashboard data for Purchase Order including:
     - Order Status
     - Received Percentage
-    - Items breakdown
+    - Items breakdown (one page of it, or none with include_items=0)
     """
-    po = frappe.get_doc("Purchase Order", purchase_order_name)
+    po = get_purchase_order_header(purchase_order_name)
+    if not po:
+        frappe.throw(_("Purchase Order {0} not found").format(purchase_order_name), frappe.DoesNotExistError)
     
-    # Calculate received percentage
-    total_ordered = 0
-    total_received = 0
-    items_data = []
+    # Totals come from SQL aggregates, so they cost the same for 10 or 10,000 lines
+    totals = get_purchase_order_item_totals(po.name)
+    total_ordered = flt(totals.total_ordered)
+    total_received = flt(totals.total_received)
+    pagination = get_pagination(cint(totals.total_items), page, page_size)
     
-    for item in po.items:
+    items_data = []
+    for item in get_purchase_order_items_page(po.name, pagination) if cint(include_items) else []:
         ordered_qty = item.qty or 0
         received_qty = item.received_qty or 0
         
-        total_ordered += ordered_qty
-        total_received += received_qty
-        
         # Calculate percentage for this item
         item_percentage = (received_qty / ordered_qty * 100) if ordered_qty > 0 else 0
         
@@ -56,6 +74,7 @@ def get_purchase_order_dashboard_data(purchase_order_name):
         "total_received": total_received,
         "total_pending": total_ordered - total_received,
         "items_data": items_data,
+        "pagination": pagination,
         "supplier": po.supplier,
         "transaction_date": po.transaction_date,
         "schedule_date": po.schedule_date,
@@ -64,36 +83,37 @@ def get_purchase_order_dashboard_data(purchase_order_name):
 
 
 @frappe.whitelist()
-def get_purchase_order_status_dashboard(purchase_order_name):
+@instrumented
+@cached_dashboard("Purchase Order", "purchase_order_name", snapshot=True)
+def get_purchase_order_status_dashboard(purchase_order_name, page=1, page_size=DEFAULT_PAGE_SIZE, include_items=1):
     """
     Get dashboard data for Purchase Order Status Dashboard
     Similar to interview feedback dashboard
+    Pass include_items=0 for the KPI cards only; otherwise one page of items_data is returned.
     """
-    try:
-        po = frappe.get_doc("Purchase Order", purchase_order_name)
-    except frappe.DoesNotExistError:
+    po = get_purchase_order_header(purchase_order_name)
+    if not po:
         return None
     
-    # Calculate KPIs
-    total_ordered = 0
-    total_received = 0
-    total_billed = 0
+    # Calculate KPIs with SQL aggregates instead of walking every row
+    totals = get_purchase_order_item_totals(po.name)
+    total_ordered = flt(totals.total_ordered)
+    total_received = flt(totals.total_received)
     total_amount = po.total or 0
+    pagination = get_pagination(cint(totals.total_items), page, page_size)
+    
+    # Billed quantity from submitted Purchase Invoice Items, aggregated in SQL
+    total_billed = get_purchase_order_billed_total(po.name)
+    
+    # Get items data; billed quantities are looked up for the lines of the page only
+    items = get_purchase_order_items_page(po.name, pagination) if cint(include_items) else []
+    billed_qty_by_po_detail = get_purchase_order_billed_qty_map(po.name, [item.name for item in items])
     
-    # Get items data
     items_data = []
-    for item in po.items:
+    for item in items:
         ordered_qty = item.qty or 0
         received_qty = item.received_qty or 0
-        billed_amt = item.billed_amt or 0
-        rate = item.rate or 0
-        
-        # Calculate billed quantity from billed amount and rate
-        billed_qty = (billed_amt / rate) if rate and rate > 0 else 0
-        
-        total_ordered += ordered_qty
-        total_received += received_qty
-        total_billed += billed_qty
+        billed_qty = billed_qty_by_po_detail.get(item.name, 0)
         
         # Calculate percentages
         received_percentage = (received_qty / ordered_qty * 100) if ordered_qty > 0 else 0
@@ -141,10 +161,135 @@ def get_purchase_order_status_dashboard(purchase_order_name):
         "overall_billed_percentage": round(overall_billed_percentage, 1),
         "total_amount": total_amount,
         "items_data": items_data,
+        "pagination": pagination,
         "status_info": status_info
     }
 
 
+def get_purchase_order_header(purchase_order_name):
+    """
+    Get the header fields the dashboards need, without loading the item table
+    """
+    return get_header(
+        "Purchase Order",
+        purchase_order_name,
+        ["name", "supplier", "supplier_name", "transaction_date", "schedule_date", "status", "docstatus", "total"],
+    )
+
+
+def get_purchase_order_item_totals(purchase_order_name):
+    """
+    Get line count and ordered/received quantity totals of a Purchase Order in one query
+    """
+    return frappe.db.sql("""
+        SELECT
+            COUNT(*) AS total_items,
+            SUM(qty) AS total_ordered,
+            SUM(received_qty) AS total_received
+        FROM `tabPurchase Order Item`
+        WHERE parent = %s AND parenttype = 'Purchase Order'
+    """, (purchase_order_name,), as_dict=True)[0]
+
+
+def get_purchase_order_items_page(purchase_order_name, pagination):
+    """
+    Get the item rows of one dashboard page, in form order
+    """
+    return get_child_rows(
+        "Purchase Order Item", purchase_order_name, "Purchase Order",
+        ["name", "item_code", "item_name", "qty", "received_qty", "rate", "amount"],
+        pagination
+    )
+
+
+def get_purchase_order_billed_total(purchase_order_name):
+    """
+    Get the quantity billed on the lines of a Purchase Order, from submitted Purchase Invoice Items
+    """
+    return flt(frappe.db.sql("""
+        SELECT SUM(qty)
+        FROM `tabPurchase Invoice Item`
+        WHERE purchase_order = %s
+          AND docstatus = 1
+          AND IFNULL(po_detail, '') != ''
+    """, (purchase_order_name,))[0][0])
+
+
+def get_purchase_order_billed_qty_map(purchase_order_name, po_details):
+    """
+    Get the quantity billed on the given lines of a Purchase Order, from submitted Purchase Invoice Items.
+    Returns a dict: { po_detail: billed_qty }
+    """
+    if not po_details:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT po_detail, SUM(qty) AS billed_qty
+        FROM `tabPurchase Invoice Item`
+        WHERE purchase_order = %(po)s
+          AND docstatus = 1
+          AND po_detail IN %(po_details)s
+        GROUP BY po_detail
+    """, {"po": purchase_order_name, "po_details": tuple(po_details)})
+    return {po_detail: flt(billed_qty) for po_detail, billed_qty in rows}
+
+
+@frappe.whitelist()
+@instrumented
+def get_purchase_order_dashboard_kpis_bulk(purchase_order_names):
+	"""
+	Get received/billed KPIs for many Purchase Orders at once (list views, worklists).
+	Aggregates the item table with grouped SQL instead of loading each document.
+	Documents the user cannot read are left out.
+	Returns a dict: { purchase_order_name: kpis }
+	"""
+	frappe.has_permission("Purchase Order", "read", throw=True)
+	names = get_permitted_names("Purchase Order", parse_names(purchase_order_names))
+
+	kpis_by_name = {}
+	for chunk in chunked(names):
+		rows = frappe.db.sql("""
+			SELECT
+				po.name,
+				po.status,
+				po.docstatus,
+				SUM(poi.qty) AS total_ordered,
+				SUM(poi.received_qty) AS total_received
+			FROM `tabPurchase Order` po
+			JOIN `tabPurchase Order Item` poi ON poi.parent = po.name AND poi.parenttype = 'Purchase Order'
+			WHERE po.name IN %(names)s
+			GROUP BY po.name, po.status, po.docstatus
+		""", {"names": tuple(chunk)}, as_dict=True)
+
+		# Billed quantity per PO from submitted Purchase Invoice Items raised against its lines,
+		# counted like get_purchase_order_billed_total
+		billed_rows = frappe.db.sql("""
+			SELECT purchase_order, SUM(qty) AS total_billed
+			FROM `tabPurchase Invoice Item`
+			WHERE purchase_order IN %(names)s
+			  AND docstatus = 1
+			  AND IFNULL(po_detail, '') != ''
+			GROUP BY purchase_order
+		""", {"names": tuple(chunk)})
+		billed_by_name = {name: flt(total_billed) for name, total_billed in billed_rows}
+
+		for row in rows:
+			total_ordered = flt(row.total_ordered)
+			total_received = flt(row.total_received)
+			total_billed = billed_by_name.get(row.name, 0)
+			kpis_by_name[row.name] = {
+				"status": row.status,
+				"docstatus": row.docstatus,
+				"total_ordered": total_ordered,
+				"total_received": total_received,
+				"total_billed": round(total_billed, 2),
+				"received_percentage": percentage(total_received, total_ordered),
+				"billed_percentage": percentage(total_billed, total_ordered)
+			}
+
+	return kpis_by_name
+
+
 def get_detailed_status_info(po, received_percentage, billed_percentage):
     """
     Get detailed status information for the dashboard
@@ -222,45 +367,73 @@ def get_order_status(po, percentage):
 
 
 @frappe.whitelist()
-def get_last_purchase_details_custom(item_code=None):
-	if item_code:
-		result = frappe.db.sql("""
-			SELECT p.supplier AS supplier, p.name AS invoice_no, p.currency AS currency,
-			       p.transaction_date AS date, pc.qty AS qty, pc.rate
-			FROM `tabPurchase Order` p
-			LEFT JOIN `tabPurchase Order Item` pc ON pc.parent = p.name
-			WHERE p.docstatus = 1 AND pc.item_code = %s
-		""", (item_code,), as_dict=1)
-
-		if result:
-			base_url = get_url()  
-			table = """<table style="border: 1px solid black; border-collapse: collapse; width: 100%;">
-				<tr>
-					<th style="border: 1px solid black;">Date</th>
-					<th style="border: 1px solid black;">Invoice No</th>
-					<th style="border: 1px solid black;">Supplier</th>
-					<th style="border: 1px solid black;">Currency</th>
-					<th style="border: 1px solid black;">Rate</th>
-					<th style="border: 1px solid black;">Qty</th>
-				</tr>"""
-			for item in result:
-				table += f"""
-				<tr>
-					<td style="border: 1px solid black;">{item.date}</td>
-					<td style="border: 1px solid black;">
-						<a href="{base_url}/app/purchase-order/{item.invoice_no}">{item.invoice_no}</a>
-					</td>
-					<td style="border: 1px solid black;">{item.supplier}</td>
-					<td style="border: 1px solid black;">{item.currency}</td>
-					<td style="border: 1px solid black;">{item.rate}</td>
-					<td style="border: 1px solid black;">{item.qty}</td>
-				</tr>"""
-			table += "</table>"
-			return table
-		else:
-			return False
-	else:
-		return False
+@instrumented
+def get_last_purchase_details_custom(item_code=None, page=1, page_size=None, as_json=0):
+	"""
+	Get the last purchase rates of an item from the compact per-item history.
+	Returns an HTML table, or the raw rows when `as_json` is set.
+	"""
+	if not item_code:
+		return [] if cint(as_json) else False
+
+	if cint(as_json):
+		return get_purchase_rate_history(item_code, page=page, page_size=page_size)
+
+	html = get_rate_history_html(
+		"purchase",
+		item_code,
+		get_purchase_rate_history_version(item_code),
+		PURCHASE_RATE_COLUMNS,
+		lambda: get_purchase_rate_history(item_code, page=page, page_size=page_size),
+		page=page,
+		page_size=page_size
+	)
+	return html or False
+
+
+@frappe.whitelist()
+@instrumented
+def get_last_purchase_details_bulk(item_codes, limit=5):
+	"""
+	Get the last purchase rates of every item on a document in one call.
+	Returns a dict: { item_code: [rows, newest first] }
+	"""
+	item_codes = parse_names(item_codes)
+	if not item_codes:
+		return {}
+
+	rates_by_item_code = {item_code: [] for item_code in item_codes}
+	for chunk in chunked(item_codes):
+		rows = frappe.db.sql("""
+			SELECT item_code, invoice_no, date, supplier, currency, rate, qty
+			FROM (
+				SELECT
+					item_code,
+					purchase_order AS invoice_no,
+					transaction_date AS date,
+					supplier,
+					currency,
+					rate,
+					qty,
+					ROW_NUMBER() OVER (
+						PARTITION BY item_code
+						ORDER BY transaction_date DESC, purchase_order DESC
+					) AS row_num
+				FROM `tabPurchase Rate History`
+				WHERE item_code IN %(item_codes)s
+			) ranked
+			WHERE ranked.row_num <= %(limit)s
+			ORDER BY item_code, row_num
+		""", {"item_codes": tuple(chunk), "limit": cint(limit) or 5}, as_dict=1)
+
+		for row in rows:
+			rates_by_item_code[row.pop("item_code")].append(row)
+
+	return rates_by_item_code
+
+
+# Source fields of doc.items that feed custom_purchase_order_item_ct
+CONSOLIDATION_SOURCE_FIELDS = ("item_code", "item_name", "item_group", "qty", "uom", "rate", "amount")
 
 
 def consolidate_purchase_order_items(doc, method):
@@ -270,16 +443,41 @@ def consolidate_purchase_order_items(doc, method):
 	- Sum of quantities
 	- Average rate (weighted by quantity)
 	- Total amount
+
+	Runs on both before_save and on_update, so the source rows are fingerprinted
+	and the work is skipped when they have not changed since the last run.
+	When they have, only the affected consolidated rows are updated, inserted or removed.
 	"""
-	if not doc.items:
-		doc.custom_purchase_order_item_ct = []
+	fingerprint = get_items_fingerprint(doc.items)
+	if doc.flags.consolidated_items_fingerprint == fingerprint:
 		return
-	
+
+	consolidated_items = get_consolidated_item_map(doc.items)
+	sync_consolidated_rows(doc, consolidated_items)
+	doc.flags.consolidated_items_fingerprint = fingerprint
+
+
+def get_items_fingerprint(items):
+	"""
+	Hash of the consolidation source fields of all rows, in order
+	"""
+	source = [
+		tuple(item.get(fieldname) for fieldname in CONSOLIDATION_SOURCE_FIELDS)
+		for item in items or []
+	]
+	return hashlib.sha1(frappe.as_json(source).encode()).hexdigest()
+
+
+def get_consolidated_item_map(items):
+	"""
+	Group rows by item_code.
+	Returns a dict, in order of first appearance: { item_code: consolidated_row }
+	"""
 	# Dictionary to store consolidated items
 	consolidated_items = {}
 	
 	# Process each item in doc.items
-	for item in doc.items:
+	for item in items or []:
 		item_code = item.item_code
 		
 		if item_code in consolidated_items:
@@ -312,110 +510,98 @@ def consolidate_purchase_order_items(doc, method):
 				'amount': item.amount or 0
 			}
 	
-	# Clear existing custom table
-	doc.custom_purchase_order_item_ct = []
-	
-	# Add consolidated items to custom table
-	for idx, (item_code, item_data) in enumerate(consolidated_items.items(), 1):
-		doc.append('custom_purchase_order_item_ct', {
-			'item': item_data['item'],
-			'item_name': item_data['item_name'],
-			'item_group': item_data['item_group'],
-			'qty': item_data['qty'],
-			'uom': item_data['uom'],
-			'rate': item_data['rate'],
-			'amount': item_data['amount']
-		})
+	return consolidated_items
+
+
+def sync_consolidated_rows(doc, consolidated_items):
+	"""
+	Bring custom_purchase_order_item_ct in line with `consolidated_items`,
+	keeping existing rows (and their names) for items that are still present
+	"""
+	existing_rows = {}
+	for row in doc.get('custom_purchase_order_item_ct') or []:
+		existing_rows.setdefault(row.item, row)
+
+	rows = []
+	for item_code, item_data in consolidated_items.items():
+		row = existing_rows.get(item_code)
+		if row:
+			for fieldname, value in item_data.items():
+				if not consolidated_value_matches(row.get(fieldname), value):
+					row.set(fieldname, value)
+		else:
+			row = doc.append('custom_purchase_order_item_ct', item_data)
+		rows.append(row)
+
+	# Drop rows of items no longer on the PO (and duplicates), keep first-appearance order
+	doc.custom_purchase_order_item_ct = rows
+	for idx, row in enumerate(rows, 1):
+		row.idx = idx
+
+
+def consolidated_value_matches(current, new):
+	if isinstance(new, (int, float)):
+		return flt(current) == flt(new)
+	return current == new
 
 
 @frappe.whitelist()
-def get_consolidated_items(doc):
+@instrumented
+def get_consolidated_items(purchase_order_name=None, changed_rows=None, removed_rows=None):
 	"""
 	Get consolidated items for Purchase Order
 	Returns consolidated items data for JavaScript consumption
+
+	Saved rows are grouped by item_code in the database; only the rows changed or added
+	in the form (`changed_rows`, with their `name` and `idx`) and the names of removed rows
+	(`removed_rows`) are sent. For an unsaved Purchase Order, all rows are `changed_rows`.
 	"""
-	if not doc:
-		return []
-	
-	# Handle both dict and Document object
-	if isinstance(doc, dict):
-		items = doc.get('items', [])
-	else:
-		items = doc.items if hasattr(doc, 'items') else []
-	
-	if not items:
-		return []
-	
-	# Dictionary to store consolidated items
-	consolidated_items = {}
-	
-	# Process each item in doc.items
-	for item in items:
-		# Handle both dict and object
-		if isinstance(item, dict):
-			item_code = item.get('item_code')
-			item_name = item.get('item_name')
-			item_group = item.get('item_group')
-			qty = item.get('qty', 0)
-			uom = item.get('uom')
-			rate = item.get('rate', 0)
-			amount = item.get('amount', 0)
-		else:
-			item_code = item.item_code
-			item_name = item.item_name
-			item_group = item.item_group
-			qty = item.qty or 0
-			uom = item.uom
-			rate = item.rate or 0
-			amount = item.amount or 0
-		
-		if item_code in consolidated_items:
-			# Item already exists, consolidate
-			existing = consolidated_items[item_code]
-			
-			# Sum quantities
-			existing['qty'] += qty
-			
-			# Calculate weighted average rate
-			existing_qty = existing['qty'] - qty  # Previous quantity
-			current_qty = qty
-			current_rate = rate
-			
-			if existing_qty + current_qty > 0:
-				existing['rate'] = ((existing['rate'] * existing_qty) + (current_rate * current_qty)) / (existing_qty + current_qty)
-			
-			# Sum amounts
-			existing['amount'] += amount
-			
-		else:
-			# New item, add to consolidated items
-			consolidated_items[item_code] = {
-				'item': item_code,
-				'item_name': item_name,
-				'item_group': item_group,
-				'qty': qty,
-				'uom': uom,
-				'rate': rate,
-				'amount': amount
-			}
-	
-	# Convert to list format for return
-	consolidated_list = []
-	for idx, (item_code, item_data) in enumerate(consolidated_items.items(), 1):
-		consolidated_list.append({
-			'item': item_data['item'],
-			'item_name': item_data['item_name'],
-			'item_group': item_data['item_group'],
-			'qty': item_data['qty'],
-			'uom': item_data['uom'],
-			'rate': item_data['rate'],
-			'amount': item_data['amount']
-		})
-	
-	return consolidated_list
+	changed_rows = [frappe._dict(row) for row in frappe.parse_json(changed_rows) or []]
+	removed_rows = frappe.parse_json(removed_rows) or []
+
+	saved_rows = []
+	if purchase_order_name and frappe.db.exists("Purchase Order", purchase_order_name):
+		frappe.has_permission("Purchase Order", "read", purchase_order_name, throw=True)
+		excluded_rows = [row.name for row in changed_rows if row.name] + list(removed_rows)
+		saved_rows = get_saved_consolidated_rows(purchase_order_name, excluded_rows)
+
+	# Aggregated saved rows merge with the changed rows like single rows do,
+	# in order of first appearance
+	rows = sorted(saved_rows + changed_rows, key=lambda row: cint(row.idx))
+	return list(get_consolidated_item_map(rows).values())
+
+
+def get_saved_consolidated_rows(purchase_order_name, excluded_rows=None):
+	"""
+	Group the saved item rows of a Purchase Order by item_code, leaving out `excluded_rows`.
+	Each group comes back shaped like an item row: summed qty and amount, qty weighted rate,
+	and the idx of its first row.
+	"""
+	exclusion = "AND name NOT IN %(excluded_rows)s" if excluded_rows else ""
+	rows = frappe.db.sql(f"""
+		SELECT
+			item_code,
+			MIN(idx) AS idx,
+			MIN(item_name) AS item_name,
+			MIN(item_group) AS item_group,
+			MIN(uom) AS uom,
+			SUM(qty) AS qty,
+			IFNULL(SUM(qty * rate) / NULLIF(SUM(qty), 0), MIN(rate)) AS rate,
+			SUM(amount) AS amount
+		FROM `tabPurchase Order Item`
+		WHERE parent = %(parent)s AND parenttype = 'Purchase Order'
+		{exclusion}
+		GROUP BY item_code
+	""", {"parent": purchase_order_name, "excluded_rows": tuple(excluded_rows or ())}, as_dict=True)
+
+	for row in rows:
+		for fieldname in ("qty", "rate", "amount"):
+			row[fieldname] = flt(row[fieldname])
+	return rows
 
 
 @frappe.whitelist()
+@instrumented
 def update_supplier_directly(purchase_order_name, new_supplier):
 	"""
 	Update supplier directly in the database for a Purchase Order.
@@ -458,3 +644,170 @@ def update_supplier_directly(purchase_order_name, new_supplier):
 		frappe.throw(f"Failed to update supplier: {str(e)}")
 
 
+# Purchase Orders saved per transaction in the background job
+SUPPLIER_REASSIGNMENT_CHUNK_SIZE = 50
+
+# Batches larger than this run as a background job
+SUPPLIER_REASSIGNMENT_JOB_THRESHOLD = 20
+
+SUPPLIER_REASSIGNMENT_PROGRESS_EVENT = "buying_addon_supplier_reassignment_progress"
+
+
+@frappe.whitelist()
+@instrumented
+def reassign_supplier(purchase_order_names, new_supplier):
+	"""
+	Change the supplier of many draft Purchase Orders at once.
+	Returns the per-PO report, or {"queued": 1} when the batch is large enough to run
+	as a background job; the job then publishes progress and the report over realtime.
+	"""
+	frappe.has_permission("Purchase Order", "write", throw=True)
+	names = parse_names(purchase_order_names)
+	validate_reassignment_supplier(new_supplier)
+
+	if len(names) <= SUPPLIER_REASSIGNMENT_JOB_THRESHOLD:
+		return reassign_supplier_in_chunks(names, new_supplier)
+
+	frappe.enqueue(
+		reassign_supplier_in_chunks,
+		queue="long",
+		names=names,
+		new_supplier=new_supplier,
+		background=True,
+		enqueue_after_commit=True,
+	)
+	return {"queued": 1, "total": len(names)}
+
+
+def validate_reassignment_supplier(supplier):
+	"""
+	Refuse a supplier that does not exist, is disabled or is on hold for all transactions
+	"""
+	supplier_details = frappe.db.get_value(
+		"Supplier", supplier, ["disabled", "on_hold", "hold_type", "release_date"], as_dict=True
+	)
+	if not supplier_details:
+		frappe.throw(_("Supplier {0} does not exist").format(supplier))
+	if supplier_details.disabled:
+		frappe.throw(_("Supplier {0} is disabled").format(supplier))
+	if (
+		supplier_details.on_hold
+		and supplier_details.hold_type == "All"
+		and (not supplier_details.release_date or getdate(supplier_details.release_date) > getdate())
+	):
+		frappe.throw(_("Supplier {0} is on hold").format(supplier))
+
+
+def reassign_supplier_in_chunks(names, new_supplier, background=False):
+	"""
+	Set `new_supplier` on the draft Purchase Orders among `names` the user can write,
+	saving each one so validations, the version log and the supplier defaults apply.
+	A Purchase Order that fails to save is rolled back alone and reported as skipped.
+	In the background job every chunk is committed on its own and followed by a progress event.
+	"""
+	report = []
+	for chunk_index, chunk in enumerate(chunked(names, SUPPLIER_REASSIGNMENT_CHUNK_SIZE)):
+		purchase_orders = {
+			po.name: po for po in frappe.get_all(
+				"Purchase Order",
+				filters={"name": ["in", chunk]},
+				fields=["name", "supplier", "docstatus"],
+			)
+		}
+
+		for name in chunk:
+			po = purchase_orders.get(name)
+			if not po:
+				message = _("Not found")
+			elif po.docstatus != 0:
+				message = _("Not a draft")
+			elif po.supplier == new_supplier:
+				message = _("Already on this supplier")
+			else:
+				message = None
+
+			if message:
+				report.append({"purchase_order": name, "status": "Skipped", "message": message})
+			else:
+				report.append(reassign_purchase_order_supplier(name, new_supplier))
+
+		if background:
+			frappe.db.commit()
+			frappe.publish_realtime(
+				SUPPLIER_REASSIGNMENT_PROGRESS_EVENT,
+				{"done": min((chunk_index + 1) * SUPPLIER_REASSIGNMENT_CHUNK_SIZE, len(names)), "total": len(names)},
+				user=frappe.session.user,
+			)
+
+	if background:
+		frappe.publish_realtime(
+			SUPPLIER_REASSIGNMENT_PROGRESS_EVENT,
+			{"done": len(names), "total": len(names), "report": report},
+			user=frappe.session.user,
+		)
+
+	return report
+
+
+def reassign_purchase_order_supplier(name, new_supplier):
+	"""
+	Change the supplier of one draft Purchase Order and save it.
+	Returns its report row.
+	"""
+	doc = frappe.get_doc("Purchase Order", name)
+	if not frappe.has_permission("Purchase Order", "write", doc):
+		return {"purchase_order": name, "status": "Skipped", "message": _("Not permitted")}
+
+	old_supplier = doc.supplier
+	frappe.db.savepoint("reassign_supplier")
+	try:
+		set_purchase_order_supplier(doc, new_supplier)
+		doc.save()
+	except Exception as e:
+		frappe.db.rollback(save_point="reassign_supplier")
+		frappe.clear_messages()
+		return {"purchase_order": name, "status": "Skipped", "message": str(e)}
+
+	return {
+		"purchase_order": name,
+		"status": "Updated",
+		"message": _("Supplier changed from {0} to {1}").format(old_supplier, new_supplier),
+	}
+
+
+def set_purchase_order_supplier(doc, supplier):
+	"""
+	Set the supplier and the fields that depend on it (name, currency, price list, address,
+	contact, payment terms, tax template), as changing the supplier in the form does.
+	Item rates are kept; taxes and the payment schedule are rebuilt when their template changes.
+	"""
+	from erpnext.accounts.party import get_party_details
+
+	party_details = get_party_details(
+		party=supplier,
+		party_type="Supplier",
+		company=doc.company,
+		posting_date=doc.transaction_date,
+		doctype=doc.doctype,
+	)
+
+	old_values = frappe._dict(
+		currency=doc.currency,
+		payment_terms_template=doc.payment_terms_template,
+		taxes_and_charges=doc.taxes_and_charges,
+	)
+
+	doc.supplier = supplier
+	doc.update({
+		fieldname: value for fieldname, value in party_details.items()
+		if doc.meta.has_field(fieldname) and doc.meta.get_field(fieldname).fieldtype not in table_fields
+	})
+
+	if doc.currency != old_values.currency:
+		# set_missing_values fetches the rate for the new currency
+		doc.conversion_rate = None
+	if doc.payment_terms_template != old_values.payment_terms_template:
+		doc.set("payment_schedule", [])
+	if doc.taxes_and_charges != old_values.taxes_and_charges:
+		doc.set("taxes", [])
+		doc.append_taxes_from_master()
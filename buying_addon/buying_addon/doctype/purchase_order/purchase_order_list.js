@@ -0,0 +1,138 @@
+// Adds received/billed KPIs to the Purchase Order list view.
+// Uses the bulk dashboard API so a whole page of rows costs one request.
+// Also adds a "Change Supplier" action for the selected draft Purchase Orders.
+(function() {
+	const settings = frappe.listview_settings['Purchase Order'] = frappe.listview_settings['Purchase Order'] || {};
+	const original_refresh = settings.refresh;
+	const original_onload = settings.onload;
+
+	settings.onload = function(listview) {
+		if (original_onload) {
+			original_onload(listview);
+		}
+		if (frappe.model.can_write('Purchase Order')) {
+			listview.page.add_actions_menu_item(__('Change Supplier'), () => reassign_purchase_order_supplier(listview), false);
+		}
+	};
+
+	settings.refresh = function(listview) {
+		if (original_refresh) {
+			original_refresh(listview);
+		}
+		load_purchase_order_list_kpis(listview);
+	};
+})();
+
+function load_purchase_order_list_kpis(listview) {
+	const names = (listview.data || []).map(d => d.name);
+	if (!names.length) {
+		return;
+	}
+
+	frappe.call({
+		method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_purchase_order_dashboard_kpis_bulk',
+		args: { purchase_order_names: names },
+		callback: function(r) {
+			if (!r.message) {
+				return;
+			}
+			listview.$result.find('.buying-addon-list-kpis').remove();
+			Object.keys(r.message).forEach(name => {
+				const kpis = r.message[name];
+				const $row = listview.$result.find(`.list-row-checkbox[data-name="${CSS.escape(name)}"]`).closest('.list-row');
+				$row.find('.list-subject').append(`
+					<span class="buying-addon-list-kpis" style="margin-left: 8px; font-size: 11px; color: #666;">
+						<span title="Received" style="color: #2e7d32;">R ${kpis.received_percentage}%</span>
+						<span title="Billed" style="color: #f57c00;">B ${kpis.billed_percentage}%</span>
+					</span>
+				`);
+			});
+		}
+	});
+}
+
+function reassign_purchase_order_supplier(listview) {
+	const names = listview.get_checked_items(true);
+	if (!names.length) {
+		frappe.msgprint(__('Select the Purchase Orders to change'));
+		return;
+	}
+
+	const dialog = new frappe.ui.Dialog({
+		title: __('Change Supplier of {0} Purchase Orders', [names.length]),
+		fields: [
+			{
+				fieldname: 'new_supplier',
+				fieldtype: 'Link',
+				options: 'Supplier',
+				label: __('New Supplier'),
+				reqd: 1,
+				get_query: () => ({ filters: { disabled: 0 } })
+			},
+			{
+				fieldname: 'note',
+				fieldtype: 'HTML',
+				options: `<p class="text-muted small">${__('Only draft Purchase Orders are changed')}</p>`
+			}
+		],
+		primary_action_label: __('Change Supplier'),
+		primary_action(values) {
+			dialog.hide();
+			frappe.call({
+				method: 'buying_addon.buying_addon.doctype.purchase_order.purchase_order.reassign_supplier',
+				args: { purchase_order_names: names, new_supplier: values.new_supplier },
+				freeze: true,
+				freeze_message: __('Updating supplier...'),
+				callback: function(r) {
+					if (!r.message) {
+						return;
+					}
+					if (r.message.queued) {
+						track_supplier_reassignment(listview, r.message.total);
+					} else {
+						show_supplier_reassignment_report(listview, r.message);
+					}
+				}
+			});
+		}
+	});
+	dialog.show();
+}
+
+function track_supplier_reassignment(listview, total) {
+	const event = 'buying_addon_supplier_reassignment_progress';
+	frappe.show_progress(__('Changing Supplier'), 0, total);
+
+	const handler = function(data) {
+		frappe.show_progress(__('Changing Supplier'), data.done, data.total);
+		if (data.report) {
+			frappe.realtime.off(event, handler);
+			frappe.hide_progress();
+			show_supplier_reassignment_report(listview, data.report);
+		}
+	};
+	frappe.realtime.on(event, handler);
+}
+
+function show_supplier_reassignment_report(listview, report) {
+	listview.clear_checked_items();
+	listview.refresh();
+
+	const updated = report.filter(d => d.status === 'Updated').length;
+	const skipped = report.filter(d => d.status !== 'Updated');
+	const rows = skipped.map(d => `
+		<tr>
+			<td>${frappe.utils.escape_html(d.purchase_order)}</td>
+			<td>${frappe.utils.escape_html(d.message)}</td>
+		</tr>
+	`).join('');
+
+	frappe.msgprint({
+		title: __('Supplier Changed'),
+		indicator: skipped.length ? 'orange' : 'green',
+		message: `
+			<p>${__('{0} Purchase Orders updated, {1} skipped', [updated, skipped.length])}</p>
+			${skipped.length ? `<table class="table table-bordered"><tbody>${rows}</tbody></table>` : ''}
+		`
+	});
+}
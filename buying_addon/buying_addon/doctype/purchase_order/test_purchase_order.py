@@ -0,0 +1,54 @@
+from erpnext.buying.doctype.purchase_order.test_purchase_order import create_purchase_order
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from buying_addon.buying_addon.doctype.purchase_order.purchase_order import get_consolidated_items
+
+
+class TestPurchaseOrderConsolidation(FrappeTestCase):
+	def make_purchase_order(self):
+		purchase_order = create_purchase_order(item_code="_Test Item", qty=2, rate=100, do_not_save=True)
+		for item_code, qty in (("_Test Item", 3), ("_Test Item 2", 1)):
+			purchase_order.append("items", {
+				"item_code": item_code,
+				"qty": qty,
+				"rate": 100,
+				"schedule_date": purchase_order.schedule_date,
+				"warehouse": purchase_order.items[0].warehouse,
+			})
+		return purchase_order.insert()
+
+	def get_consolidated_qty(self, purchase_order, changed_rows=None, removed_rows=None):
+		items = get_consolidated_items(
+			purchase_order.name,
+			changed_rows=frappe.as_json(changed_rows or []),
+			removed_rows=frappe.as_json(removed_rows or []),
+		)
+		return {item["item_code"]: item["qty"] for item in items}
+
+	def test_saved_rows_are_consolidated(self):
+		purchase_order = self.make_purchase_order()
+		self.assertEqual(self.get_consolidated_qty(purchase_order), {"_Test Item": 5, "_Test Item 2": 1})
+
+	def test_removed_saved_row_is_dropped(self):
+		purchase_order = self.make_purchase_order()
+
+		removed_rows = [purchase_order.items[1].name]
+		self.assertEqual(
+			self.get_consolidated_qty(purchase_order, removed_rows=removed_rows),
+			{"_Test Item": 2, "_Test Item 2": 1},
+		)
+
+		# Removing the only row of an item drops the item
+		removed_rows = [purchase_order.items[2].name]
+		self.assertEqual(self.get_consolidated_qty(purchase_order, removed_rows=removed_rows), {"_Test Item": 5})
+
+	def test_changed_row_replaces_saved_row(self):
+		purchase_order = self.make_purchase_order()
+
+		changed_row = purchase_order.items[1].as_dict()
+		changed_row.qty = 10
+		self.assertEqual(
+			self.get_consolidated_qty(purchase_order, changed_rows=[changed_row]),
+			{"_Test Item": 12, "_Test Item 2": 1},
+		)
@@ -0,0 +1,157 @@
+import frappe
+from frappe.model.document import Document
+from frappe.utils import cint, now
+
+# Number of Purchase Order lines kept per item.
+# Can be overridden per site with `buying_addon_rate_history_size` in site_config.json.
+DEFAULT_HISTORY_SIZE = 20
+
+HISTORY_FIELDS = ("item_code", "transaction_date", "purchase_order", "po_detail", "supplier", "currency", "rate", "qty")
+
+
+class PurchaseRateHistory(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Purchase Rate History", ["item_code", "transaction_date"])
+	frappe.db.add_index("Purchase Rate History", ["purchase_order"])
+
+
+def get_history_size():
+	return cint(frappe.conf.get("buying_addon_rate_history_size")) or DEFAULT_HISTORY_SIZE
+
+
+def update_purchase_rate_history(doc, method):
+	"""
+	doc_events handler for Purchase Order on_submit and on_cancel
+	"""
+	item_codes = list({item.item_code for item in doc.get("items") or [] if item.item_code})
+	if not item_codes:
+		return
+
+	if method == "on_cancel":
+		# The cancelled lines may have pushed older lines out of the window, so refill those items
+		rebuild_purchase_rate_history(item_codes)
+		return
+
+	insert_history_rows([
+		(
+			item.item_code, doc.transaction_date, doc.name, item.name,
+			doc.supplier, doc.currency, item.rate, item.qty
+		)
+		for item in doc.items if item.item_code
+	])
+	trim_purchase_rate_history(item_codes)
+
+
+def insert_history_rows(rows):
+	if not rows:
+		return
+
+	timestamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Purchase Rate History",
+		fields=["name", *HISTORY_FIELDS, "creation", "modified", "owner", "modified_by"],
+		values=[
+			(frappe.generate_hash(length=10), *row, timestamp, timestamp, user, user)
+			for row in rows
+		]
+	)
+
+
+def trim_purchase_rate_history(item_codes):
+	"""
+	Keep only the newest N lines of each item
+	"""
+	frappe.db.sql("""
+		DELETE FROM `tabPurchase Rate History`
+		WHERE name IN (
+			SELECT name FROM (
+				SELECT
+					name,
+					ROW_NUMBER() OVER (
+						PARTITION BY item_code
+						ORDER BY transaction_date DESC, purchase_order DESC
+					) AS row_num
+				FROM `tabPurchase Rate History`
+				WHERE item_code IN %(item_codes)s
+			) ranked
+			WHERE ranked.row_num > %(size)s
+		)
+	""", {"item_codes": tuple(item_codes), "size": get_history_size()})
+
+
+def rebuild_purchase_rate_history(item_codes=None):
+	"""
+	Refill the history from submitted Purchase Orders with a single windowed query.
+	Used on cancel and to backfill the table; pass `item_codes` to limit the rebuild.
+	"""
+	condition = "AND poi.item_code IN %(item_codes)s" if item_codes else ""
+	params = {"item_codes": tuple(item_codes or ()), "size": get_history_size()}
+
+	if item_codes:
+		frappe.db.delete("Purchase Rate History", {"item_code": ["in", item_codes]})
+	else:
+		frappe.db.delete("Purchase Rate History")
+
+	rows = frappe.db.sql(f"""
+		SELECT item_code, transaction_date, purchase_order, po_detail, supplier, currency, rate, qty
+		FROM (
+			SELECT
+				poi.item_code,
+				po.transaction_date,
+				po.name AS purchase_order,
+				poi.name AS po_detail,
+				po.supplier,
+				po.currency,
+				poi.rate,
+				poi.qty,
+				ROW_NUMBER() OVER (
+					PARTITION BY poi.item_code
+					ORDER BY po.transaction_date DESC, po.name DESC
+				) AS row_num
+			FROM `tabPurchase Order Item` poi
+			JOIN `tabPurchase Order` po ON po.name = poi.parent
+			WHERE po.docstatus = 1
+				{condition}
+		) ranked
+		WHERE ranked.row_num <= %(size)s
+	""", params)
+
+	insert_history_rows(rows)
+
+
+def get_purchase_rate_history(item_code, page=1, page_size=None):
+	"""
+	Get one page of the stored rate history of an item, newest first
+	"""
+	page = max(cint(page), 1)
+	page_size = cint(page_size) or get_history_size()
+
+	return frappe.db.sql("""
+		SELECT
+			purchase_order AS invoice_no,
+			transaction_date AS date,
+			supplier,
+			currency,
+			rate,
+			qty
+		FROM `tabPurchase Rate History`
+		WHERE item_code = %(item_code)s
+		ORDER BY transaction_date DESC, purchase_order DESC
+		LIMIT %(limit)s OFFSET %(offset)s
+	""", {"item_code": item_code, "limit": page_size, "offset": (page - 1) * page_size}, as_dict=1)
+
+
+def get_purchase_rate_history_version(item_code):
+	"""
+	Get the `modified` stamp of the newest history row of an item.
+	Submit inserts new rows and cancel rewrites the item's rows, so this changes whenever the history does.
+	"""
+	return frappe.db.sql("""
+		SELECT MAX(modified)
+		FROM `tabPurchase Rate History`
+		WHERE item_code = %s
+	""", (item_code,))[0][0]
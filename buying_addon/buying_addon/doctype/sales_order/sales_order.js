@@ -13,6 +13,20 @@ frappe.ui.form.on('Sales Order', {
 			}, __('View'));
 		}
 		
+		// Linked purchasing documents, loaded level by level
+		if (frm.doc.docstatus === 1) {
+			frm.add_custom_button(__('Procurement Tree'), function() {
+				show_procurement_tree(frm);
+			}, __('View'));
+		}
+		
+		// Add batch last sales rates button
+		if (frm.doc.items && frm.doc.items.length > 0) {
+			frm.add_custom_button(__('Last Sales Rates (All Items)'), function() {
+				load_all_last_sales_rates(frm, true);
+			}, __('View'));
+		}
+		
 		// Load dashboard data for custom_order_status field
 		if (frm.doc.name && !frm.doc.__islocal) {
 			console.log('🔍 DEBUG: Triggering load_order_status_dashboard');
@@ -27,12 +41,15 @@ frappe.ui.form.on('Sales Order', {
 		console.log('🔍 DEBUG: frm.doc.name =', frm.doc.name);
 		console.log('🔍 DEBUG: frm.doc.__islocal =', frm.doc.__islocal);
 		
-		// Load dashboard data when form loads
-		if (frm.doc.name && !frm.doc.__islocal) {
-			console.log('🔍 DEBUG: Triggering load_order_status_dashboard from onload');
-			frm.trigger("load_order_status_dashboard");
-		} else {
-			console.log('🔍 DEBUG: Skipping dashboard load from onload - conditions not met');
+		// Reload the dashboard when the server reports that a linked document changed it;
+		// the first load happens in refresh, which always follows onload
+		if (!frm.so_dashboard_listener) {
+			frm.so_dashboard_listener = true;
+			frappe.realtime.on('buying_addon_dashboard_invalidated', (data) => {
+				if (cur_frm === frm && data.doctype === frm.doctype && data.name === frm.doc.name && !frm.is_dirty()) {
+					frm.trigger('load_order_status_dashboard');
+				}
+			});
 		}
 	},
 	
@@ -47,14 +64,32 @@ frappe.ui.form.on('Sales Order', {
 			return;
 		}
 		
+		// Initialize pagination state
+		if (!frm.so_dashboard_page_size) {
+			frm.so_dashboard_page_size = 50;
+		}
+		if (!frm.so_dashboard_page) {
+			frm.so_dashboard_page = 1;
+		}
+		
 		console.log('🔍 DEBUG: Making API call to get dashboard data...');
 		frm.call({
 			method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_sales_order_status_dashboard',
-			args: { sales_order_name: frm.doc.name },
+			args: {
+				sales_order_name: frm.doc.name,
+				page: frm.so_dashboard_page,
+				page_size: frm.so_dashboard_page_size,
+				// Lets the server answer "unchanged" instead of recomputing the dashboard
+				dashboard_version: frm.so_dashboard_data && frm.so_dashboard_data.version
+			},
 			callback: function(r) {
 				console.log('🔍 DEBUG: API response received:', r);
-				if (r.message) {
+				if (r.message && r.message.unchanged) {
+					// Redraw the data we already have in case the field was re-rendered
+					frm.events.render_order_status_dashboard(frm, frm.so_dashboard_data);
+				} else if (r.message) {
 					console.log('🔍 DEBUG: Rendering dashboard with data:', r.message);
+					frm.so_dashboard_data = r.message;
 					frm.events.render_order_status_dashboard(frm, r.message);
 				} else {
 					console.warn('⚠️ WARNING: No dashboard data received');
@@ -97,6 +132,19 @@ frappe.ui.form.on('Sales Order', {
 		}
 	},
 	
+	change_so_dashboard_page: function(frm, new_page) {
+		if (!new_page || new_page < 1) return;
+		frm.so_dashboard_page = new_page;
+		frm.trigger('load_order_status_dashboard');
+	},
+
+	change_so_dashboard_page_size: function(frm, new_size) {
+		const size = parseInt(new_size, 10) || 50;
+		frm.so_dashboard_page_size = size;
+		frm.so_dashboard_page = 1;
+		frm.trigger('load_order_status_dashboard');
+	},
+	
 	// Reload dashboard when items are updated
 	items: function(frm) {
 		if (frm.doc.name && !frm.doc.__islocal) {
@@ -107,10 +155,10 @@ frappe.ui.form.on('Sales Order', {
 	}
 })
 
-function show_sales_order_dashboard(frm) {
+function show_sales_order_dashboard(frm, page) {
 	frm.call({
 		method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_sales_order_dashboard_data',
-		args: { sales_order_name: frm.doc.name },
+		args: { sales_order_name: frm.doc.name, page: page || 1, page_size: 50 },
 		callback: function(r) {
 			if (r.message) {
 				show_dashboard_dialog(r.message, frm);
@@ -120,7 +168,13 @@ function show_sales_order_dashboard(frm) {
 }
 
 function show_dashboard_dialog(data, frm) {
-	let dialog = new frappe.ui.Dialog({
+	// Paging re-renders the open dialog instead of stacking a new one
+	if (frm.so_dashboard_dialog && frm.so_dashboard_dialog.display) {
+		frm.so_dashboard_dialog.fields_dict.dashboard_content.$wrapper.html(create_dashboard_html(data));
+		return;
+	}
+
+	let dialog = frm.so_dashboard_dialog = new frappe.ui.Dialog({
 		title: __('Sales Order Dashboard'),
 		size: 'large',
 		fields: [
@@ -192,6 +246,7 @@ function create_dashboard_html(data) {
 			<!-- Items Table -->
 			<div style="background: white; border: 1px solid #e0e0e0; border-radius: 8px; overflow: hidden;">
 				<h4 style="margin: 0; padding: 15px; background: #f8f9fa; border-bottom: 1px solid #e0e0e0;">Items Breakdown</h4>
+				${so_dashboard_pagination_html(data.pagination, page => `show_sales_order_dashboard(cur_frm, ${page})`)}
 				<div style="overflow-x: auto;">
 					<table style="width: 100%; border-collapse: collapse;">
 						<thead>
@@ -383,6 +438,11 @@ function create_order_status_dashboard_html(data) {
 						<button onclick="clearItemsSearch()" style="padding: 6px 12px; background: #6c757d; color: white; border: none; border-radius: 4px; font-size: 12px; cursor: pointer;">Clear</button>
 					</div>
 				</div>
+				${so_dashboard_pagination_html(
+					data.pagination,
+					page => `cur_frm.events.change_so_dashboard_page(cur_frm, ${page})`,
+					'cur_frm.events.change_so_dashboard_page_size(cur_frm, this.value)'
+				)}
 				<div style="overflow-x: auto;">
 					<table id="items-table" style="width: 100%; border-collapse: collapse; font-size: 11px;">
 						<thead>
@@ -501,6 +561,205 @@ function create_order_status_dashboard_html(data) {
 	return html;
 }
 
+// Pager shown above the items tables; `go_to_page` builds the onclick handler for a page number
+function so_dashboard_pagination_html(pagination, go_to_page, change_page_size) {
+	if (!pagination || pagination.total_pages <= 1 && !change_page_size) {
+		return '';
+	}
+
+	const page = pagination.page;
+	const last_page = pagination.total_pages;
+	return `
+		<div style="display:flex; justify-content: space-between; align-items:center; padding: 10px 15px;">
+			<div style="font-size:12px; color:#666;">${(pagination.total_items || 0) > 0 ? `Showing <b>${pagination.start_index + 1}</b> - <b>${pagination.end_index}</b> of <b>${pagination.total_items}</b>` : 'No items'}</div>
+			<div style="display:flex; gap:6px; align-items:center;">
+				<button onclick="${go_to_page(1)}" style="padding:4px 8px;">⏮</button>
+				<button onclick="${go_to_page(Math.max(1, page - 1))}" style="padding:4px 8px;">◀</button>
+				<span style="font-size:12px;">Page <b>${page}</b> / ${last_page}</span>
+				<button onclick="${go_to_page(Math.min(last_page, page + 1))}" style="padding:4px 8px;">▶</button>
+				<button onclick="${go_to_page(last_page)}" style="padding:4px 8px;">⏭</button>
+				${change_page_size ? `
+					<select onchange="${change_page_size}" style="margin-left:8px;">
+						<option value="25" ${pagination.page_size == 25 ? 'selected' : ''}>25</option>
+						<option value="50" ${pagination.page_size == 50 ? 'selected' : ''}>50</option>
+						<option value="100" ${pagination.page_size == 100 ? 'selected' : ''}>100</option>
+					</select>
+				` : ''}
+			</div>
+		</div>
+	`;
+}
+
+// Procurement graph of the Sales Order (SO -> MRs -> POs -> PRs / PIs).
+// Each level is fetched when its node is expanded, one page at a time.
+function show_procurement_tree(frm) {
+	const dialog = new frappe.ui.Dialog({
+		title: __('Procurement Tree'),
+		size: 'large',
+		fields: [{ fieldname: 'tree', fieldtype: 'HTML' }]
+	});
+	const $tree = $('<div class="procurement-tree" style="padding: 10px;"></div>');
+	dialog.fields_dict.tree.$wrapper.empty().append($tree);
+	dialog.show();
+
+	// Purchase Orders can be raised from the Material Requests or directly against the Sales Order
+	['Material Request', 'Purchase Order'].forEach(doctype => {
+		const $level = $('<div></div>').appendTo($tree);
+		load_procurement_tree_level(frm, $level, null, null, doctype, null);
+	});
+}
+
+function load_procurement_tree_level(frm, $container, parent_doctype, parent_name, child_doctype, cursor) {
+	const $more = $container.children('.procurement-tree-more');
+	$more.remove();
+
+	frappe.call({
+		method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_sales_order_procurement_tree',
+		args: {
+			sales_order_name: frm.doc.name,
+			parent_doctype: parent_doctype,
+			parent_name: parent_name,
+			child_doctype: child_doctype,
+			cursor: cursor
+		},
+		callback: function(r) {
+			if (!r.message) {
+				return;
+			}
+			if (!r.message.nodes.length && !cursor) {
+				$container.append(`<div class="text-muted small" style="padding: 4px 0;">${__('No {0}', [__(child_doctype)])}</div>`);
+				return;
+			}
+
+			r.message.nodes.forEach(node => $container.append(procurement_tree_node(frm, node)));
+
+			if (r.message.next_cursor) {
+				$(`<a class="procurement-tree-more small" style="display: block; padding: 4px 0;">${__('Load more')}</a>`)
+					.on('click', () => load_procurement_tree_level(frm, $container, parent_doctype, parent_name, child_doctype, r.message.next_cursor))
+					.appendTo($container);
+			}
+		}
+	});
+}
+
+function procurement_tree_node(frm, node) {
+	const $node = $(`
+		<div class="procurement-tree-node" style="padding: 4px 0;">
+			<div style="display: flex; gap: 10px; align-items: center;">
+				<span class="procurement-tree-toggle" style="width: 14px; cursor: pointer;"></span>
+				<a href="/app/${frappe.router.slug(node.doctype)}/${encodeURIComponent(node.name)}" target="_blank">${frappe.utils.escape_html(node.name)}</a>
+				<span class="text-muted small">${__(node.doctype)}</span>
+				<span class="indicator-pill ${node.docstatus === 1 ? 'green' : 'gray'}">${__(node.status || '')}</span>
+				<span class="text-muted small">${node.date ? frappe.datetime.str_to_user(node.date) : ''}</span>
+				<span class="text-muted small">${__('{0} lines, qty {1}', [node.lines, format_number(node.qty)])}</span>
+			</div>
+			<div class="procurement-tree-children" style="margin-left: 24px; display: none;"></div>
+		</div>
+	`);
+
+	const child_doctypes = Object.keys(node.children || {}).filter(doctype => node.children[doctype] > 0);
+	if (!child_doctypes.length) {
+		return $node;
+	}
+
+	const $toggle = $node.find('.procurement-tree-toggle').first().text('▸');
+	const $children = $node.find('.procurement-tree-children').first();
+	$toggle.attr('title', child_doctypes.map(doctype => `${node.children[doctype]} ${__(doctype)}`).join(', '));
+	$toggle.on('click', () => {
+		const expanded = $children.is(':visible');
+		$toggle.text(expanded ? '▸' : '▾');
+		$children.toggle(!expanded);
+		if (!expanded && !$children.data('loaded')) {
+			$children.data('loaded', true);
+			child_doctypes.forEach(doctype => {
+				const $level = $('<div></div>').appendTo($children);
+				load_procurement_tree_level(frm, $level, node.doctype, node.name, doctype, null);
+			});
+		}
+	});
+	return $node;
+}
+
+// Fetch the rate history of every item on the SO in one request and show it inline in the grid
+function load_all_last_sales_rates(frm, show_dialog) {
+	const item_codes = [...new Set((frm.doc.items || []).map(d => d.item_code).filter(Boolean))];
+	if (!item_codes.length) {
+		return;
+	}
+	
+	frm.call({
+		method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_last_sales_details_bulk',
+		freeze: true,
+		freeze_message: __('Getting Data'),
+		args: { item_codes: item_codes },
+		callback: function(r) {
+			frm._last_sales_rates = r.message || {};
+			render_last_sales_rates_inline(frm);
+			if (show_dialog) {
+				show_last_sales_rates_dialog(frm._last_sales_rates);
+			}
+		}
+	});
+}
+
+function render_last_sales_rates_inline(frm) {
+	const rates = frm._last_sales_rates || {};
+	(frm.fields_dict.items.grid.grid_rows || []).forEach(grid_row => {
+		const history = rates[grid_row.doc.item_code] || [];
+		const $column = grid_row.columns && grid_row.columns.rate;
+		if (!$column) {
+			return;
+		}
+		$column.find('.buying-addon-last-rate').remove();
+		if (history.length) {
+			const last = history[0];
+			const esc = value => frappe.utils.escape_html(value == null ? '' : String(value));
+			$column.append(`<div class="buying-addon-last-rate text-muted small" title="${esc(last.customer_name || last.customer)} (${esc(last.transaction_date)})">${__('Last')}: ${esc(last.rate)} ${esc(last.currency)}</div>`);
+		}
+	});
+}
+
+function show_last_sales_rates_dialog(rates) {
+	rates = rates || {};
+	const esc = value => frappe.utils.escape_html(value == null ? '' : String(value));
+	let html = `<table class="table table-bordered">
+		<thead>
+			<tr>
+				<th>${__('Item')}</th>
+				<th>${__('Date')}</th>
+				<th>${__('Order No')}</th>
+				<th>${__('Customer')}</th>
+				<th>${__('Currency')}</th>
+				<th>${__('Rate')}</th>
+				<th>${__('Qty')}</th>
+			</tr>
+		</thead>
+		<tbody>`;
+	Object.keys(rates).forEach(item_code => {
+		rates[item_code].forEach(sale => {
+			html += `
+			<tr>
+				<td>${esc(item_code)}</td>
+				<td>${esc(sale.transaction_date)}</td>
+				<td><a href="/app/sales-order/${encodeURIComponent(sale.sales_order)}">${esc(sale.sales_order)}</a></td>
+				<td>${esc(sale.customer_name || sale.customer)}</td>
+				<td>${esc(sale.currency)}</td>
+				<td>${esc(sale.rate)}</td>
+				<td>${esc(sale.qty)}</td>
+			</tr>`;
+		});
+	});
+	html += `</tbody></table>`;
+	
+	const d = new frappe.ui.Dialog({
+		title: __('Last Sales Rates'),
+		size: 'large',
+		fields: [{ fieldname: 'ls_rates', fieldtype: 'HTML' }]
+	});
+	d.fields_dict.ls_rates.$wrapper.html(html);
+	d.show();
+}
+
 // run through client script 
 frappe.ui.form.on("Sales Order Item", {
 	custom_last_sales_rates: function(frm, cdt, cdn) {
@@ -509,20 +768,10 @@ frappe.ui.form.on("Sales Order Item", {
 			method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_last_sales_details_custom',
 			freeze: true,
 			freeze_message: __('Getting Data'),
-			args: { item_code: row.item_code },
+			args: { item_code: row.item_code, as_json: 1 },
 			callback: function(r) {
-				if (r && r.message) {
-					var d = new frappe.ui.Dialog({
-						title: __('Last Sales Rates'),
-						fields: [
-							{
-								"fieldname": "ls_rates",
-								"fieldtype": "HTML",
-							}
-						],
-					})
-					d.fields_dict.ls_rates.$wrapper.html(r.message)
-					d.show()
+				if (r && r.message && r.message.length) {
+					show_last_sales_rates_dialog({ [row.item_code]: r.message });
 				}
 				else {
 					frappe.msgprint("No data found.")
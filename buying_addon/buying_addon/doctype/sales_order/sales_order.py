@@ -1,30 +1,46 @@
 import frappe
+from frappe import _
 from frappe.model.document import Document
-from frappe.utils import get_url
+from frappe.utils import flt, cint
+
+from buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary import get_summary_map
+from buying_addon.utils.bulk import chunked, get_permitted_names, parse_names, percentage
+from buying_addon.utils.dashboard_cache import cached_dashboard
+from buying_addon.utils.instrumentation import instrumented
+from buying_addon.utils.pagination import DEFAULT_PAGE_SIZE, get_pagination
+from buying_addon.utils.projection import get_child_rows, get_header
+from buying_addon.utils.rate_history import SALES_RATE_COLUMNS, get_rate_history_html
+
+
+EMPTY_PRODUCTION_DATA = {"planned_qty": 0, "produced_qty": 0, "pending_qty": 0, "percentage": 0}
+EMPTY_PROCUREMENT_DATA = {"requested_qty": 0, "po_ordered_qty": 0, "pr_received_qty": 0, "pi_billed_qty": 0, "percentage": 0}
 
 
 @frappe.whitelist()
-def get_sales_order_dashboard_data(sales_order_name):
+@instrumented
+@cached_dashboard("Sales Order", "sales_order_name")
+def get_sales_order_dashboard_data(sales_order_name, page=1, page_size=DEFAULT_PAGE_SIZE, include_items=1):
     """
     Get dashboard data for Sales Order including:
     - Order Status
     - Delivered Percentage
-    - Items breakdown
+    - Items breakdown (one page of it, or none with include_items=0)
     """
-    so = frappe.get_doc("Sales Order", sales_order_name)
+    so = get_sales_order_header(sales_order_name)
+    if not so:
+        frappe.throw(_("Sales Order {0} not found").format(sales_order_name), frappe.DoesNotExistError)
     
-    # Calculate delivered percentage
-    total_ordered = 0
-    total_delivered = 0
-    items_data = []
+    # Totals come from SQL aggregates, so they cost the same for 10 or 10,000 lines
+    totals = get_sales_order_item_totals(so.name)
+    total_ordered = flt(totals.total_ordered)
+    total_delivered = flt(totals.total_delivered)
+    pagination = get_pagination(cint(totals.total_items), page, page_size)
     
-    for item in so.items:
+    items_data = []
+    for item in get_sales_order_items_page(so.name, pagination) if cint(include_items) else []:
         ordered_qty = item.qty or 0
         delivered_qty = item.delivered_qty or 0
         
-        total_ordered += ordered_qty
-        total_delivered += delivered_qty
-        
         # Calculate percentage for this item
         item_percentage = (delivered_qty / ordered_qty * 100) if ordered_qty > 0 else 0
         
@@ -52,6 +68,7 @@ def get_sales_order_dashboard_data(sales_order_name):
         "total_delivered": total_delivered,
         "total_pending": total_ordered - total_delivered,
         "items_data": items_data,
+        "pagination": pagination,
         "customer": so.customer,
         "customer_name": so.customer_name,
         "transaction_date": so.transaction_date,
@@ -61,52 +78,139 @@ def get_sales_order_dashboard_data(sales_order_name):
 
 
 @frappe.whitelist()
-def get_sales_order_status_dashboard(sales_order_name):
+@instrumented
+@cached_dashboard("Sales Order", "sales_order_name", snapshot=True)
+def get_sales_order_status_dashboard(sales_order_name, page=1, page_size=DEFAULT_PAGE_SIZE, include_items=1):
     """
     Get comprehensive dashboard data for Sales Order including:
     - Order Status
     - Production Planning Status
     - Procurement Status
     - Delivery and Billing Status
+    Pass include_items=0 for the KPI cards only; otherwise one page of items_data is returned.
     """
-    frappe.logger().info(f"🔍 DEBUG: get_sales_order_status_dashboard called with sales_order_name: {sales_order_name}")
-    
-    try:
-        so = frappe.get_doc("Sales Order", sales_order_name)
-        frappe.logger().info(f"🔍 DEBUG: Successfully loaded Sales Order: {so.name}")
-    except frappe.DoesNotExistError:
-        frappe.logger().error(f"❌ ERROR: Sales Order {sales_order_name} does not exist")
-        return None
-    except Exception as e:
-        frappe.logger().error(f"❌ ERROR: Failed to load Sales Order {sales_order_name}: {str(e)}")
+    so = get_sales_order_header(sales_order_name)
+    if not so:
         return None
     
     # Get comprehensive data including production and procurement
-    dashboard_data = get_comprehensive_sales_order_data(so)
+    dashboard_data = get_comprehensive_sales_order_data(so, page, page_size, include_items)
     
     return dashboard_data
 
 
-def get_comprehensive_sales_order_data(so):
+def get_sales_order_header(sales_order_name):
+    """
+    Get the header fields the dashboards need, without loading the item table
+    """
+    return get_header(
+        "Sales Order",
+        sales_order_name,
+        ["name", "customer", "customer_name", "transaction_date", "delivery_date", "status", "docstatus", "total"],
+    )
+
+
+def get_sales_order_item_totals(sales_order_name):
+    """
+    Get line count and ordered/delivered/billed quantity totals of a Sales Order in one query.
+    Billed quantity is estimated from billed amount and rate, like the per-row figures.
+    """
+    return frappe.db.sql("""
+        SELECT
+            COUNT(*) AS total_items,
+            SUM(qty) AS total_ordered,
+            SUM(delivered_qty) AS total_delivered,
+            SUM(CASE WHEN IFNULL(rate, 0) > 0 THEN IFNULL(billed_amt, 0) / rate ELSE 0 END) AS total_billed
+        FROM `tabSales Order Item`
+        WHERE parent = %s AND parenttype = 'Sales Order'
+    """, (sales_order_name,), as_dict=True)[0]
+
+
+def get_sales_order_items_page(sales_order_name, pagination):
     """
-    Get comprehensive data for Sales Order including production planning and procurement
+    Get the item rows of one dashboard page, in form order
+    """
+    return get_child_rows(
+        "Sales Order Item", sales_order_name, "Sales Order",
+        ["item_code", "item_name", "qty", "delivered_qty", "billed_amt", "rate", "amount"],
+        pagination
+    )
+
+
+@frappe.whitelist()
+@instrumented
+def get_sales_order_dashboard_kpis_bulk(sales_order_names):
+    """
+    Get delivered/billed KPIs for many Sales Orders at once (list views, worklists).
+    Aggregates the item table with grouped SQL instead of loading each document.
+    Documents the user cannot read are left out.
+    Returns a dict: { sales_order_name: kpis }
+    """
+    frappe.has_permission("Sales Order", "read", throw=True)
+    names = get_permitted_names("Sales Order", parse_names(sales_order_names))
+    
+    kpis_by_name = {}
+    for chunk in chunked(names):
+        rows = frappe.db.sql("""
+            SELECT
+                so.name,
+                so.status,
+                so.docstatus,
+                SUM(soi.qty) AS total_ordered,
+                SUM(soi.delivered_qty) AS total_delivered,
+                SUM(CASE WHEN IFNULL(soi.rate, 0) > 0 THEN IFNULL(soi.billed_amt, 0) / soi.rate ELSE 0 END) AS total_billed
+            FROM `tabSales Order` so
+            JOIN `tabSales Order Item` soi ON soi.parent = so.name AND soi.parenttype = 'Sales Order'
+            WHERE so.name IN %(names)s
+            GROUP BY so.name, so.status, so.docstatus
+        """, {"names": tuple(chunk)}, as_dict=True)
+        
+        for row in rows:
+            total_ordered = flt(row.total_ordered)
+            total_delivered = flt(row.total_delivered)
+            total_billed = flt(row.total_billed)
+            kpis_by_name[row.name] = {
+                "status": row.status,
+                "docstatus": row.docstatus,
+                "total_ordered": total_ordered,
+                "total_delivered": total_delivered,
+                "total_billed": round(total_billed, 2),
+                "delivered_percentage": percentage(total_delivered, total_ordered),
+                "billed_percentage": percentage(total_billed, total_ordered)
+            }
+    
+    return kpis_by_name
+
+
+def get_comprehensive_sales_order_data(so, page=1, page_size=DEFAULT_PAGE_SIZE, include_items=1):
+    """
+    Get comprehensive data for Sales Order including production planning and procurement.
+    `so` only needs the header fields; order totals come from SQL aggregates and
+    only one page of rows is built into items_data.
     """
     # Basic order data
-    total_ordered = 0
-    total_delivered = 0
-    total_billed = 0
+    totals = get_sales_order_item_totals(so.name)
+    total_ordered = flt(totals.total_ordered)
+    total_delivered = flt(totals.total_delivered)
+    total_billed = flt(totals.total_billed)
     total_amount = so.total or 0
+    pagination = get_pagination(cint(totals.total_items), page, page_size)
+    include_items = cint(include_items)
     
     # Production planning data
     production_plans = get_production_plans_for_sales_order(so.name)
     production_plan_status = get_production_plan_status(production_plans)
     
-    # Procurement data
-    procurement_data = get_procurement_data_for_sales_order(so.name)
+    # Procurement totals; the linked documents are loaded on demand through the procurement tree
+    procurement_totals = get_procurement_totals_for_sales_order(so.name)
+    
+    # Per-item production and procurement rollups, built once for all rows of the page
+    production_by_item_code = get_item_production_map(so.name) if include_items else {}
+    procurement_by_item_code = get_item_procurement_map(so.name) if include_items else {}
     
     # Get items data with comprehensive tracking
     items_data = []
-    for item in so.items:
+    for item in get_sales_order_items_page(so.name, pagination) if include_items else []:
         ordered_qty = item.qty or 0
         delivered_qty = item.delivered_qty or 0
         billed_amt = item.billed_amt or 0
@@ -116,14 +220,10 @@ def get_comprehensive_sales_order_data(so):
         billed_qty = (billed_amt / rate) if rate and rate > 0 else 0
         
         # Get production planning data for this item
-        item_production_data = get_item_production_data(item.item_code, so.name)
+        item_production_data = production_by_item_code.get(item.item_code) or dict(EMPTY_PRODUCTION_DATA)
         
         # Get procurement data for this item
-        item_procurement_data = get_item_procurement_data(item.item_code, so.name)
-        
-        total_ordered += ordered_qty
-        total_delivered += delivered_qty
-        total_billed += billed_qty
+        item_procurement_data = procurement_by_item_code.get(item.item_code) or dict(EMPTY_PROCUREMENT_DATA)
         
         # Calculate percentages
         delivered_percentage = (delivered_qty / ordered_qty * 100) if ordered_qty > 0 else 0
@@ -143,7 +243,7 @@ def get_comprehensive_sales_order_data(so):
             "amount": item.amount,
             # Production planning data
             "production_planned_qty": item_production_data.get("planned_qty", 0),
-            "production_completed_qty": item_production_data.get("completed_qty", 0),
+            "production_completed_qty": item_production_data.get("produced_qty", 0),
             "production_pending_qty": item_production_data.get("pending_qty", 0),
             "production_percentage": item_production_data.get("percentage", 0),
             # Procurement data
@@ -160,7 +260,7 @@ def get_comprehensive_sales_order_data(so):
     
     # Calculate production and procurement KPIs
     production_kpis = calculate_production_kpis(production_plans)
-    procurement_kpis = calculate_procurement_kpis(procurement_data)
+    procurement_kpis = calculate_procurement_kpis(procurement_totals)
     
     # Determine overall status
     status_info = get_comprehensive_status_info(
@@ -193,9 +293,9 @@ def get_comprehensive_sales_order_data(so):
         "procurement_kpis": procurement_kpis,
         # Items data
         "items_data": items_data,
+        "pagination": pagination,
         # Related documents
-        "production_plans": production_plans,
-        "procurement_data": procurement_data
+        "production_plans": production_plans
     }
 
 
@@ -320,87 +420,43 @@ def get_production_plan_status(production_plans):
     }
 
 
-def get_procurement_data_for_sales_order(sales_order_name):
+def get_procurement_totals_for_sales_order(sales_order_name):
     """
-    Get procurement data (Material Request, PO, PR, PI) for the sales order
+    Get the number of Material Requests, Purchase Orders, Purchase Receipts and Purchase Invoices
+    of the sales order and their line quantities, in one grouped query.
+    Documents are reached through the same item-level links as get_sales_order_procurement_tree,
+    which serves them level by level. Like the Procurement Chain Summary, only submitted documents
+    are counted, and a line reached by several paths (a PO line linked to both the Sales Order and
+    one of its Material Requests) is counted once.
+    Returns a dict: { doctype: {"documents": n, "qty": qty} }
     """
+    queries = []
+    for doctype in PROCUREMENT_DOCTYPES:
+        item_doctype = PROCUREMENT_TREE_PARENTS[doctype][0]
+        queries.append(f"""
+            SELECT {frappe.db.escape(doctype)}, COUNT(DISTINCT parent), SUM(qty)
+            FROM `tab{item_doctype}`
+            WHERE {get_procurement_tree_lines_condition(doctype)}
+        """)
+
     try:
-        # Get Material Requests
-        material_requests = frappe.db.sql("""
-            SELECT 
-                mr.name,
-                mr.material_request_type,
-                mr.status,
-                mr.docstatus,
-                mri.item_code,
-                mri.qty,
-                mri.ordered_qty,
-                mri.received_qty
-            FROM `tabMaterial Request` mr
-            JOIN `tabMaterial Request Item` mri ON mr.name = mri.parent
-            WHERE mr.sales_order = %s
-        """, (sales_order_name,), as_dict=True)
-        
-        # Get Purchase Orders
-        purchase_orders = frappe.db.sql("""
-            SELECT 
-                po.name,
-                po.status,
-                po.docstatus,
-                poi.item_code,
-                poi.qty,
-                poi.received_qty,
-                poi.billed_qty
-            FROM `tabPurchase Order` po
-            JOIN `tabPurchase Order Item` poi ON po.name = poi.parent
-            WHERE po.sales_order = %s
-        """, (sales_order_name,), as_dict=True)
-        
-        # Get Purchase Receipts
-        purchase_receipts = frappe.db.sql("""
-            SELECT 
-                pr.name,
-                pr.status,
-                pr.docstatus,
-                pri.item_code,
-                pri.qty,
-                pri.received_qty
-            FROM `tabPurchase Receipt` pr
-            JOIN `tabPurchase Receipt Item` pri ON pr.name = pri.parent
-            WHERE pr.sales_order = %s
-        """, (sales_order_name,), as_dict=True)
-        
-        # Get Purchase Invoices
-        purchase_invoices = frappe.db.sql("""
-            SELECT 
-                pi.name,
-                pi.status,
-                pi.docstatus,
-                pii.item_code,
-                pii.qty,
-                pii.amount
-            FROM `tabPurchase Invoice` pi
-            JOIN `tabPurchase Invoice Item` pii ON pi.name = pii.parent
-            WHERE pi.sales_order = %s
-        """, (sales_order_name,), as_dict=True)
-        
-        return {
-            "material_requests": material_requests,
-            "purchase_orders": purchase_orders,
-            "purchase_receipts": purchase_receipts,
-            "purchase_invoices": purchase_invoices
-        }
+        rows = frappe.db.sql(" UNION ALL ".join(queries), {"so": sales_order_name})
     except Exception as e:
         frappe.logger().error(f"Error getting procurement data: {str(e)}")
-        return {"material_requests": [], "purchase_orders": [], "purchase_receipts": [], "purchase_invoices": []}
+        rows = []
+    
+    totals = {doctype: {"documents": 0, "qty": 0} for doctype in PROCUREMENT_DOCTYPES}
+    for doctype, documents, qty in rows:
+        totals[doctype] = {"documents": cint(documents), "qty": flt(qty)}
+    return totals
 
 
-def get_item_production_data(item_code, sales_order_name):
+def get_item_production_map(sales_order_name):
     """
-    Get production data for a specific item
+    Get production data for all items of the sales order in a single grouped query.
+    Returns a dict: { item_code: production_data }
     """
     try:
-        # Get production plans for this item
         production_data = frappe.db.sql("""
             SELECT 
                 ppi.item_code,
@@ -408,95 +464,62 @@ def get_item_production_data(item_code, sales_order_name):
                 SUM(ppi.produced_qty) as produced_qty
             FROM `tabProduction Plan Item` ppi
             JOIN `tabProduction Plan` pp ON ppi.parent = pp.name
-            WHERE pp.sales_order = %s AND ppi.item_code = %s
+            WHERE pp.sales_order = %s
             GROUP BY ppi.item_code
-        """, (sales_order_name, item_code), as_dict=True)
-        
-        if production_data:
-            data = production_data[0]
-            planned_qty = data.get("planned_qty", 0)
-            produced_qty = data.get("produced_qty", 0)
-            pending_qty = planned_qty - produced_qty
-            percentage = (produced_qty / planned_qty * 100) if planned_qty > 0 else 0
-            
-            return {
-                "planned_qty": planned_qty,
-                "produced_qty": produced_qty,
-                "pending_qty": pending_qty,
-                "percentage": round(percentage, 1)
-            }
-        else:
-            return {"planned_qty": 0, "produced_qty": 0, "pending_qty": 0, "percentage": 0}
+        """, (sales_order_name,), as_dict=True)
     except Exception as e:
         frappe.logger().error(f"Error getting item production data: {str(e)}")
-        return {"planned_qty": 0, "produced_qty": 0, "pending_qty": 0, "percentage": 0}
+        return {}
+    
+    production_map = {}
+    for row in production_data:
+        planned_qty = flt(row.get("planned_qty"))
+        produced_qty = flt(row.get("produced_qty"))
+        percentage = (produced_qty / planned_qty * 100) if planned_qty > 0 else 0
+        
+        production_map[row.get("item_code")] = {
+            "planned_qty": planned_qty,
+            "produced_qty": produced_qty,
+            "pending_qty": planned_qty - produced_qty,
+            "percentage": round(percentage, 1)
+        }
+    
+    return production_map
 
 
-def get_item_procurement_data(item_code, sales_order_name):
+def get_item_procurement_map(sales_order_name):
     """
-    Get procurement data for a specific item
+    Get procurement data for all items of the sales order.
+    Reads the incrementally maintained Procurement Chain Summary rows, so this is
+    a single indexed lookup whatever the number of Sales Order rows or linked documents.
+    Returns a dict: { item_code: procurement_data }
     """
     try:
-        # Material Request data
-        mr_data = frappe.db.sql("""
-            SELECT 
-                SUM(mri.qty) as requested_qty,
-                SUM(mri.ordered_qty) as ordered_qty,
-                SUM(mri.received_qty) as received_qty
-            FROM `tabMaterial Request Item` mri
-            JOIN `tabMaterial Request` mr ON mri.parent = mr.name
-            WHERE mr.sales_order = %s AND mri.item_code = %s
-        """, (sales_order_name, item_code), as_dict=True)
-        
-        # Purchase Order data
-        po_data = frappe.db.sql("""
-            SELECT 
-                SUM(poi.qty) as ordered_qty,
-                SUM(poi.received_qty) as received_qty,
-                SUM(poi.billed_qty) as billed_qty
-            FROM `tabPurchase Order Item` poi
-            JOIN `tabPurchase Order` po ON poi.parent = po.name
-            WHERE po.sales_order = %s AND poi.item_code = %s
-        """, (sales_order_name, item_code), as_dict=True)
-        
-        # Purchase Receipt data
-        pr_data = frappe.db.sql("""
-            SELECT 
-                SUM(pri.qty) as received_qty
-            FROM `tabPurchase Receipt Item` pri
-            JOIN `tabPurchase Receipt` pr ON pri.parent = pr.name
-            WHERE pr.sales_order = %s AND pri.item_code = %s
-        """, (sales_order_name, item_code), as_dict=True)
-        
-        # Purchase Invoice data
-        pi_data = frappe.db.sql("""
-            SELECT 
-                SUM(pii.qty) as billed_qty
-            FROM `tabPurchase Invoice Item` pii
-            JOIN `tabPurchase Invoice` pi ON pii.parent = pi.name
-            WHERE pi.sales_order = %s AND pii.item_code = %s
-        """, (sales_order_name, item_code), as_dict=True)
-        
-        # Calculate totals
-        requested_qty = mr_data[0].get("requested_qty", 0) if mr_data else 0
-        po_ordered_qty = po_data[0].get("ordered_qty", 0) if po_data else 0
-        pr_received_qty = pr_data[0].get("received_qty", 0) if pr_data else 0
-        pi_billed_qty = pi_data[0].get("billed_qty", 0) if pi_data else 0
+        summary_map = get_summary_map(sales_order_name)
+    except Exception as e:
+        frappe.logger().error(f"Error getting item procurement data: {str(e)}")
+        return {}
+    
+    procurement_map = {}
+    for item_code, row in summary_map.items():
+        requested_qty = flt(row.requested_qty)
+        po_ordered_qty = flt(row.ordered_qty)
+        pr_received_qty = flt(row.received_qty)
+        pi_billed_qty = flt(row.billed_qty)
         
         # Calculate percentage based on the highest value
         max_qty = max(requested_qty, po_ordered_qty, pr_received_qty, pi_billed_qty)
         percentage = (pi_billed_qty / max_qty * 100) if max_qty > 0 else 0
         
-        return {
+        procurement_map[item_code] = {
             "requested_qty": requested_qty,
             "po_ordered_qty": po_ordered_qty,
             "pr_received_qty": pr_received_qty,
             "pi_billed_qty": pi_billed_qty,
             "percentage": round(percentage, 1)
         }
-    except Exception as e:
-        frappe.logger().error(f"Error getting item procurement data: {str(e)}")
-        return {"requested_qty": 0, "po_ordered_qty": 0, "pr_received_qty": 0, "pi_billed_qty": 0, "percentage": 0}
+    
+    return procurement_map
 
 
 def calculate_production_kpis(production_plans):
@@ -531,30 +554,25 @@ def calculate_production_kpis(production_plans):
     }
 
 
-def calculate_procurement_kpis(procurement_data):
+def calculate_procurement_kpis(procurement_totals):
     """
     Calculate procurement KPIs
     """
-    material_requests = procurement_data.get("material_requests", [])
-    purchase_orders = procurement_data.get("purchase_orders", [])
-    purchase_receipts = procurement_data.get("purchase_receipts", [])
-    purchase_invoices = procurement_data.get("purchase_invoices", [])
-    
     # Calculate totals
-    total_mr_qty = sum(mr.get("qty", 0) for mr in material_requests)
-    total_po_qty = sum(po.get("qty", 0) for po in purchase_orders)
-    total_pr_qty = sum(pr.get("qty", 0) for pr in purchase_receipts)
-    total_pi_qty = sum(pi.get("qty", 0) for pi in purchase_invoices)
+    total_mr_qty = procurement_totals["Material Request"]["qty"]
+    total_po_qty = procurement_totals["Purchase Order"]["qty"]
+    total_pr_qty = procurement_totals["Purchase Receipt"]["qty"]
+    total_pi_qty = procurement_totals["Purchase Invoice"]["qty"]
     
     # Calculate percentage based on the highest value
     max_qty = max(total_mr_qty, total_po_qty, total_pr_qty, total_pi_qty)
     overall_percentage = (total_pi_qty / max_qty * 100) if max_qty > 0 else 0
     
     return {
-        "total_material_requests": len(material_requests),
-        "total_purchase_orders": len(purchase_orders),
-        "total_purchase_receipts": len(purchase_receipts),
-        "total_purchase_invoices": len(purchase_invoices),
+        "total_material_requests": procurement_totals["Material Request"]["documents"],
+        "total_purchase_orders": procurement_totals["Purchase Order"]["documents"],
+        "total_purchase_receipts": procurement_totals["Purchase Receipt"]["documents"],
+        "total_purchase_invoices": procurement_totals["Purchase Invoice"]["documents"],
         "total_mr_qty": total_mr_qty,
         "total_po_qty": total_po_qty,
         "total_pr_qty": total_pr_qty,
@@ -563,84 +581,304 @@ def calculate_procurement_kpis(procurement_data):
     }
 
 
+# Children of each node of the procurement tree: the item table that links a child
+# document to its parent, the link field, and the child's date field
+PROCUREMENT_TREE = {
+    "Sales Order": [
+        ("Material Request", "Material Request Item", "sales_order", "transaction_date"),
+        ("Purchase Order", "Purchase Order Item", "sales_order", "transaction_date"),
+    ],
+    "Material Request": [
+        ("Purchase Order", "Purchase Order Item", "material_request", "transaction_date"),
+    ],
+    "Purchase Order": [
+        ("Purchase Receipt", "Purchase Receipt Item", "purchase_order", "posting_date"),
+        ("Purchase Invoice", "Purchase Invoice Item", "purchase_order", "posting_date"),
+    ],
+}
+
+# { child doctype: (item doctype, [(parent doctype, link field), ...]) }
+# A Purchase Order is reached both from its Material Requests and directly from the Sales Order
+PROCUREMENT_TREE_PARENTS = {}
+for parent_doctype, levels in PROCUREMENT_TREE.items():
+    for child_doctype, item_doctype, link_field, date_field in levels:
+        PROCUREMENT_TREE_PARENTS.setdefault(child_doctype, (item_doctype, []))[1].append((parent_doctype, link_field))
+
+PROCUREMENT_DOCTYPES = ("Material Request", "Purchase Order", "Purchase Receipt", "Purchase Invoice")
+
+# Nodes returned per call when `limit` is not given
+PROCUREMENT_TREE_PAGE_SIZE = 20
+
+
+@frappe.whitelist()
+@instrumented
+def get_sales_order_procurement_tree(sales_order_name, parent_doctype=None, parent_name=None,
+                                     child_doctype=None, cursor=None, limit=PROCUREMENT_TREE_PAGE_SIZE):
+    """
+    Get one level of the procurement graph of a Sales Order (SO -> MRs -> POs -> PRs / PIs),
+    one page at a time. Without a parent, the Material Requests of the Sales Order are returned,
+    or its directly linked Purchase Orders when `child_doctype` is "Purchase Order".
+    Only submitted documents are part of the tree, as in the Procurement Chain Summary.
+
+    Nodes are ordered by name and paged with a keyset `cursor` (the last name of the previous page).
+    Each node carries its line count and quantity, and the number of its own children per doctype
+    so the tree can show which nodes expand.
+    Returns {"nodes": [...], "next_cursor": name or None}
+    """
+    frappe.has_permission("Sales Order", "read", sales_order_name, throw=True)
+    parent_doctype = parent_doctype or "Sales Order"
+    parent_name = parent_name or sales_order_name
+    limit = min(max(cint(limit), 1), 100)
+
+    levels = {level[0]: level for level in PROCUREMENT_TREE.get(parent_doctype, [])}
+    child_doctype = child_doctype or next(iter(levels), None)
+    if child_doctype not in levels:
+        frappe.throw(_("{0} has no {1} in the procurement tree").format(parent_doctype, child_doctype))
+    if not is_in_procurement_tree(sales_order_name, parent_doctype, parent_name):
+        frappe.throw(
+            _("{0} {1} is not linked to Sales Order {2}").format(parent_doctype, parent_name, sales_order_name),
+            frappe.PermissionError,
+        )
+    frappe.has_permission(parent_doctype, "read", parent_name, throw=True)
+    frappe.has_permission(child_doctype, "read", throw=True)
+
+    child_doctype, item_doctype, link_field, date_field = levels[child_doctype]
+    rows = frappe.db.sql(f"""
+        SELECT parent, COUNT(*) AS lines, SUM(qty) AS qty
+        FROM `tab{item_doctype}`
+        WHERE `{link_field}` = %(parent_name)s
+          AND parenttype = %(child_doctype)s
+          AND docstatus = 1
+          AND parent > %(cursor)s
+        GROUP BY parent
+        ORDER BY parent
+        LIMIT %(limit)s
+    """, {
+        "parent_name": parent_name,
+        "child_doctype": child_doctype,
+        "cursor": cursor or "",
+        "limit": limit + 1,
+    }, as_dict=True)
+
+    next_cursor = rows[limit - 1].parent if len(rows) > limit else None
+    rows = rows[:limit]
+    names = [row.parent for row in rows]
+    if not names:
+        return {"nodes": [], "next_cursor": None}
+
+    # Documents the user cannot read are left out of the page
+    headers = {
+        row.name: row for row in frappe.get_list(
+            child_doctype,
+            filters={"name": ["in", names]},
+            fields=["name", "status", "docstatus", f"{date_field} AS date"],
+            limit_page_length=0,
+        )
+    }
+    child_counts = get_procurement_tree_child_counts(child_doctype, list(headers))
+
+    nodes = []
+    for row in rows:
+        header = headers.get(row.parent)
+        if not header:
+            continue
+        nodes.append({
+            "doctype": child_doctype,
+            "name": row.parent,
+            "status": header.status,
+            "docstatus": header.docstatus,
+            "date": header.date,
+            "lines": row.lines,
+            "qty": flt(row.qty),
+            "children": {doctype: child_counts[doctype].get(row.parent, 0) for doctype in child_counts},
+        })
+
+    return {"nodes": nodes, "next_cursor": next_cursor}
+
+
+def get_procurement_tree_names_query(doctype):
+    """
+    SQL selecting the names of the `doctype` documents in the procurement graph of
+    the Sales Order `%(so)s`, following the item-level links of PROCUREMENT_TREE
+    through submitted documents
+    """
+    if doctype == "Sales Order":
+        return "%(so)s"
+
+    item_doctype = PROCUREMENT_TREE_PARENTS[doctype][0]
+    return f"""
+        SELECT parent FROM `tab{item_doctype}`
+        WHERE {get_procurement_tree_lines_condition(doctype)}
+    """
+
+
+def get_procurement_tree_lines_condition(doctype):
+    """
+    SQL condition on the item table of `doctype` matching the submitted lines linked to any
+    of its parents in the procurement graph of the Sales Order `%(so)s`
+    """
+    item_doctype, parents = PROCUREMENT_TREE_PARENTS[doctype]
+    links = " OR ".join(
+        f"`{link_field}` IN ({get_procurement_tree_names_query(parent_doctype)})"
+        for parent_doctype, link_field in parents
+    )
+    return f"""
+        ({links})
+        AND parenttype = {frappe.db.escape(doctype)}
+        AND docstatus = 1
+    """
+
+
+def is_in_procurement_tree(sales_order_name, doctype, name):
+    """
+    Check that a document is a node of the Sales Order's procurement graph
+    """
+    if doctype == "Sales Order":
+        return name == sales_order_name
+    if doctype not in PROCUREMENT_TREE_PARENTS:
+        return False
+
+    return bool(frappe.db.sql(f"""
+        SELECT 1 FROM `tab{doctype}`
+        WHERE name = %(name)s AND name IN ({get_procurement_tree_names_query(doctype)})
+    """, {"name": name, "so": sales_order_name}))
+
+
+def get_procurement_tree_child_counts(doctype, names):
+    """
+    Count the children of each node, one grouped query per child doctype.
+    Returns a dict: { child_doctype: { name: count } }
+    """
+    child_counts = {}
+    if not names:
+        return {level[0]: {} for level in PROCUREMENT_TREE.get(doctype, [])}
+
+    for child_doctype, item_doctype, link_field, date_field in PROCUREMENT_TREE.get(doctype, []):
+        child_counts[child_doctype] = dict(frappe.db.sql(f"""
+            SELECT `{link_field}`, COUNT(DISTINCT parent)
+            FROM `tab{item_doctype}`
+            WHERE `{link_field}` IN %(names)s
+              AND parenttype = %(child_doctype)s
+              AND docstatus = 1
+            GROUP BY `{link_field}`
+        """, {"names": tuple(names), "child_doctype": child_doctype}))
+    return child_counts
+
+
 @frappe.whitelist()
-def get_last_sales_details_custom(item_code):
+@instrumented
+def get_last_sales_details_custom(item_code=None, page=1, page_size=20, as_json=0):
     """
-    Get last sales details for an item
+    Get last sales details for an item.
+    Returns an HTML table, or the raw rows when `as_json` is set.
     """
+    if not item_code:
+        return [] if cint(as_json) else False
+    
+    if cint(as_json):
+        return get_last_sales_rows(item_code, page, page_size)
+    
     try:
-        # Get last 5 sales orders for this item
-        last_sales = frappe.db.sql("""
-            SELECT 
-                soi.parent as sales_order,
-                so.customer,
-                so.customer_name,
-                so.transaction_date,
-                soi.qty,
-                soi.rate,
-                soi.amount
-            FROM `tabSales Order Item` soi
-            JOIN `tabSales Order` so ON soi.parent = so.name
-            WHERE soi.item_code = %s 
-            AND so.docstatus = 1
-            ORDER BY so.transaction_date DESC
-            LIMIT 5
-        """, (item_code,), as_dict=True)
-        
-        if not last_sales:
-            return "No previous sales found for this item."
-        
-        html = """
-        <div style="padding: 20px;">
-            <h4 style="margin-bottom: 15px; color: #333;">Last Sales for {}</h4>
-            <table style="width: 100%; border-collapse: collapse; font-size: 12px;">
-                <thead>
-                    <tr style="background: #f8f9fa;">
-                        <th style="padding: 8px; text-align: left; border-bottom: 1px solid #e0e0e0;">Sales Order</th>
-                        <th style="padding: 8px; text-align: left; border-bottom: 1px solid #e0e0e0;">Customer</th>
-                        <th style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">Date</th>
-                        <th style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">Qty</th>
-                        <th style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">Rate</th>
-                        <th style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">Amount</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """.format(item_code)
-        
-        for sale in last_sales:
-            html += """
-                <tr>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">
-                        <a href="/app/sales-order/{}" target="_blank">{}</a>
-                    </td>
-                    <td style="padding: 8px; border-bottom: 1px solid #e0e0e0;">{}</td>
-                    <td style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">{}</td>
-                    <td style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">{}</td>
-                    <td style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">{}</td>
-                    <td style="padding: 8px; text-align: center; border-bottom: 1px solid #e0e0e0;">{}</td>
-                </tr>
-            """.format(
-                sale.sales_order, sale.sales_order,
-                sale.customer_name or sale.customer,
-                sale.transaction_date,
-                sale.qty,
-                sale.rate,
-                sale.amount
-            )
-        
-        html += """
-                </tbody>
-            </table>
-        </div>
-        """
-        
-        return html
-        
+        html = get_rate_history_html(
+            "sales",
+            item_code,
+            get_last_sales_version(item_code),
+            SALES_RATE_COLUMNS,
+            lambda: get_last_sales_rows(item_code, page, page_size),
+            page=page,
+            page_size=page_size
+        )
+        return html or False
     except Exception as e:
         frappe.logger().error(f"Error getting last sales details: {str(e)}")
         return f"Error retrieving last sales details: {str(e)}"
 
 
+def get_last_sales_rows(item_code, page=1, page_size=20):
+    """
+    Get one page of submitted Sales Order lines for an item, newest first
+    """
+    page = max(cint(page), 1)
+    page_size = cint(page_size) or 20
+    
+    return frappe.db.sql("""
+        SELECT 
+            so.name as sales_order,
+            so.customer,
+            so.customer_name,
+            so.currency,
+            so.transaction_date,
+            soi.qty,
+            soi.rate,
+            soi.amount
+        FROM `tabSales Order Item` soi
+        JOIN `tabSales Order` so ON soi.parent = so.name
+        WHERE soi.item_code = %(item_code)s 
+        AND so.docstatus = 1
+        ORDER BY so.transaction_date DESC, so.name DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+    """, {"item_code": item_code, "limit": page_size, "offset": (page - 1) * page_size}, as_dict=True)
+
+
+def get_last_sales_version(item_code):
+    """
+    Get the newest `modified` stamp of the Sales Orders contributing to an item's history
+    """
+    return frappe.db.sql("""
+        SELECT MAX(so.modified)
+        FROM `tabSales Order Item` soi
+        JOIN `tabSales Order` so ON soi.parent = so.name
+        WHERE soi.item_code = %s
+        AND so.docstatus = 1
+    """, (item_code,))[0][0]
+
+
+@frappe.whitelist()
+@instrumented
+def get_last_sales_details_bulk(item_codes, limit=5):
+    """
+    Get the last sales rates of every item on a document in one call,
+    using a single windowed query.
+    Returns a dict: { item_code: [rows, newest first] }
+    """
+    item_codes = parse_names(item_codes)
+    if not item_codes:
+        return {}
+    
+    rates_by_item_code = {item_code: [] for item_code in item_codes}
+    for chunk in chunked(item_codes):
+        rows = frappe.db.sql("""
+            SELECT item_code, sales_order, customer, customer_name, currency, transaction_date, qty, rate, amount
+            FROM (
+                SELECT
+                    soi.item_code,
+                    so.name AS sales_order,
+                    so.customer,
+                    so.customer_name,
+                    so.currency,
+                    so.transaction_date,
+                    soi.qty,
+                    soi.rate,
+                    soi.amount,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY soi.item_code
+                        ORDER BY so.transaction_date DESC, so.name DESC
+                    ) AS row_num
+                FROM `tabSales Order Item` soi
+                JOIN `tabSales Order` so ON soi.parent = so.name
+                WHERE so.docstatus = 1
+                  AND soi.item_code IN %(item_codes)s
+            ) ranked
+            WHERE ranked.row_num <= %(limit)s
+            ORDER BY item_code, row_num
+        """, {"item_codes": tuple(chunk), "limit": cint(limit) or 5}, as_dict=True)
+        
+        for row in rows:
+            rates_by_item_code[row.pop("item_code")].append(row)
+    
+    return rates_by_item_code
+
+
 def get_detailed_status_info(so, delivered_percentage, billed_percentage):
     """
     Get detailed status information for the dashboard
@@ -715,45 +953,3 @@ def get_order_status(so, percentage):
         return "Partially Delivered"
     else:
         return "Pending Delivery"
-
-
-@frappe.whitelist()
-def get_last_sales_details_custom(item_code=None):
-    if item_code:
-        result = frappe.db.sql("""
-            SELECT s.customer AS customer, s.name AS invoice_no, s.currency AS currency,
-                   s.transaction_date AS date, si.qty AS qty, si.rate
-            FROM `tabSales Order` s
-            LEFT JOIN `tabSales Order Item` si ON si.parent = s.name
-            WHERE s.docstatus = 1 AND si.item_code = %s
-        """, (item_code,), as_dict=1)
-
-        if result:
-            base_url = get_url()  
-            table = """<table style="border: 1px solid black; border-collapse: collapse; width: 100%;">
-                <tr>
-                    <th style="border: 1px solid black;">Date</th>
-                    <th style="border: 1px solid black;">Order No</th>
-                    <th style="border: 1px solid black;">Customer</th>
-                    <th style="border: 1px solid black;">Currency</th>
-                    <th style="border: 1px solid black;">Rate</th>
-                    <th style="border: 1px solid black;">Qty</th>
-                </tr>"""
-            for item in result:
-                table += f"""
-                <tr>
-                    <td style="border: 1px solid black;">{item.date}</td>
-                    <td style="border: 1px solid black;">
-                        <a href="{base_url}/app/sales-order/{item.invoice_no}">{item.invoice_no}</a>
-                    </td>
-                    <td style="border: 1px solid black;">{item.customer}</td>
-                    <td style="border: 1px solid black;">{item.currency}</td>
-                    <td style="border: 1px solid black;">{item.rate}</td>
-                    <td style="border: 1px solid black;">{item.qty}</td>
-                </tr>"""
-            table += "</table>"
-            return table
-        else:
-            return False
-    else:
-        return False
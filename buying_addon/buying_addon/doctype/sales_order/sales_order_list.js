@@ -0,0 +1,41 @@
+// Adds delivered/billed KPIs to the Sales Order list view.
+// Uses the bulk dashboard API so a whole page of rows costs one request.
+(function() {
+	const settings = frappe.listview_settings['Sales Order'] = frappe.listview_settings['Sales Order'] || {};
+	const original_refresh = settings.refresh;
+
+	settings.refresh = function(listview) {
+		if (original_refresh) {
+			original_refresh(listview);
+		}
+		load_sales_order_list_kpis(listview);
+	};
+})();
+
+function load_sales_order_list_kpis(listview) {
+	const names = (listview.data || []).map(d => d.name);
+	if (!names.length) {
+		return;
+	}
+
+	frappe.call({
+		method: 'buying_addon.buying_addon.doctype.sales_order.sales_order.get_sales_order_dashboard_kpis_bulk',
+		args: { sales_order_names: names },
+		callback: function(r) {
+			if (!r.message) {
+				return;
+			}
+			listview.$result.find('.buying-addon-list-kpis').remove();
+			Object.keys(r.message).forEach(name => {
+				const kpis = r.message[name];
+				const $row = listview.$result.find(`.list-row-checkbox[data-name="${CSS.escape(name)}"]`).closest('.list-row');
+				$row.find('.list-subject').append(`
+					<span class="buying-addon-list-kpis" style="margin-left: 8px; font-size: 11px; color: #666;">
+						<span title="Delivered" style="color: #2e7d32;">D ${kpis.delivered_percentage}%</span>
+						<span title="Billed" style="color: #f57c00;">B ${kpis.billed_percentage}%</span>
+					</span>
+				`);
+			});
+		}
+	});
+}
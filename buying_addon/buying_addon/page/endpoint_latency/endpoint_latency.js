@@ -0,0 +1,73 @@
+// Latency percentiles of the buying_addon endpoints, from the samples in Buying Addon Endpoint Log
+frappe.pages['endpoint-latency'].on_page_load = function(wrapper) {
+	const page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: __('Endpoint Latency'),
+		single_column: true
+	});
+
+	page.hours_field = page.add_field({
+		fieldname: 'hours',
+		label: __('Last (hours)'),
+		fieldtype: 'Int',
+		default: 24,
+		change: () => load_endpoint_latency(page)
+	});
+	page.set_primary_action(__('Refresh'), () => load_endpoint_latency(page), 'refresh');
+
+	page.$results = $('<div class="endpoint-latency"></div>').appendTo(page.body);
+	load_endpoint_latency(page);
+};
+
+function load_endpoint_latency(page) {
+	frappe.call({
+		method: 'buying_addon.utils.instrumentation.get_endpoint_latency_stats',
+		args: { hours: page.hours_field.get_value() || 24 },
+		callback: function(r) {
+			if (r.message) {
+				render_endpoint_latency(page, r.message);
+			}
+		}
+	});
+}
+
+function render_endpoint_latency(page, stats) {
+	page.set_title_sub(stats.site);
+
+	if (!stats.endpoints.length) {
+		page.$results.html(`<div class="text-muted" style="padding: 20px;">${__('No samples since {0}', [frappe.datetime.str_to_user(stats.since)])}</div>`);
+		return;
+	}
+
+	const ms = value => `${flt(value, 1)} ms`;
+	const rows = stats.endpoints.map(d => `
+		<tr>
+			<td title="${frappe.utils.escape_html(d.endpoint)}">${frappe.utils.escape_html(d.endpoint.split('.').pop())}</td>
+			<td class="text-right">${d.calls}</td>
+			<td class="text-right">${ms(d.p50)}</td>
+			<td class="text-right">${ms(d.p95)}</td>
+			<td class="text-right">${ms(d.p99)}</td>
+			<td class="text-right">${flt(d.avg_queries, 1)} / ${d.max_queries}</td>
+			<td class="text-right">${flt(d.avg_rows, 0)}</td>
+			<td class="text-right">${flt(d.avg_response_bytes / 1024, 1)} KB</td>
+		</tr>
+	`).join('');
+
+	page.$results.html(`
+		<table class="table table-bordered" style="margin: 15px 0;">
+			<thead>
+				<tr>
+					<th>${__('Endpoint')}</th>
+					<th class="text-right">${__('Calls')}</th>
+					<th class="text-right">p50</th>
+					<th class="text-right">p95</th>
+					<th class="text-right">p99</th>
+					<th class="text-right">${__('Queries (avg / max)')}</th>
+					<th class="text-right">${__('Rows (avg)')}</th>
+					<th class="text-right">${__('Response (avg)')}</th>
+				</tr>
+			</thead>
+			<tbody>${rows}</tbody>
+		</table>
+	`);
+}
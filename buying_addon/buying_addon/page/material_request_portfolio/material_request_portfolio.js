@@ -0,0 +1,157 @@
+// Ordered/received/billed KPIs, PO creation status and aging of all open Material Requests
+frappe.pages['material-request-portfolio'].on_page_load = function(wrapper) {
+	const page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: __('Material Request Portfolio'),
+		single_column: true
+	});
+
+	const reload = () => load_material_request_portfolio(page);
+	page.filters = {
+		company: page.add_field({ fieldname: 'company', label: __('Company'), fieldtype: 'Link', options: 'Company', change: reload }),
+		warehouse: page.add_field({ fieldname: 'warehouse', label: __('Warehouse'), fieldtype: 'Link', options: 'Warehouse', change: reload }),
+		material_request_type: page.add_field({
+			fieldname: 'material_request_type',
+			label: __('Type'),
+			fieldtype: 'Select',
+			options: ['', 'Purchase', 'Material Transfer', 'Material Issue', 'Manufacture', 'Customer Provided'],
+			change: reload
+		}),
+		status: page.add_field({
+			fieldname: 'status',
+			label: __('Status'),
+			fieldtype: 'Select',
+			options: ['', 'Pending', 'Partially Ordered', 'Ordered', 'Partially Received'],
+			change: reload
+		})
+	};
+	page.sort_field = page.add_field({
+		fieldname: 'sort_by',
+		label: __('Sort By'),
+		fieldtype: 'Select',
+		options: [
+			{ value: 'transaction_date', label: __('Date') },
+			{ value: 'schedule_date', label: __('Required By') },
+			{ value: 'per_ordered', label: __('% Ordered') },
+			{ value: 'per_received', label: __('% Received') },
+			{ value: 'name', label: __('Name') }
+		],
+		default: 'transaction_date',
+		change: reload
+	});
+	page.sort_order_field = page.add_field({
+		fieldname: 'sort_order',
+		label: __('Order'),
+		fieldtype: 'Select',
+		options: [{ value: 'asc', label: __('Oldest First') }, { value: 'desc', label: __('Newest First') }],
+		default: 'asc',
+		change: reload
+	});
+	page.set_primary_action(__('Refresh'), reload, 'refresh');
+
+	page.$summary = $('<div class="material-request-portfolio-summary"></div>').appendTo(page.body);
+	page.$results = $('<div class="material-request-portfolio"></div>').appendTo(page.body);
+	reload();
+};
+
+function load_material_request_portfolio(page, cursor) {
+	const args = {
+		sort_by: page.sort_field.get_value() || 'transaction_date',
+		sort_order: page.sort_order_field.get_value() || 'asc',
+		cursor: cursor || null
+	};
+	Object.keys(page.filters).forEach(key => {
+		args[key] = page.filters[key].get_value() || null;
+	});
+
+	frappe.call({
+		method: 'buying_addon.buying_addon.doctype.material_request.material_request.get_material_request_portfolio',
+		args: args,
+		callback: function(r) {
+			if (!r.message) {
+				return;
+			}
+			if (!cursor) {
+				render_material_request_portfolio_summary(page, r.message.summary);
+				page.$results.html(material_request_portfolio_table_html());
+			}
+			render_material_request_portfolio_rows(page, r.message);
+		}
+	});
+}
+
+function render_material_request_portfolio_summary(page, summary) {
+	const card = (label, value, color) => `
+		<div style="background: white; padding: 12px 16px; border-radius: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); text-align: center;">
+			<div style="font-size: 20px; font-weight: bold; color: ${color};">${value}</div>
+			<div style="color: #666; font-size: 11px;">${label}</div>
+		</div>
+	`;
+	const aging = Object.keys(summary.aging).map(bucket => card(__('{0} days', [bucket]), summary.aging[bucket], '#666')).join('');
+
+	page.$summary.html(`
+		<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 12px; margin: 15px 0;">
+			${card(__('Open Material Requests'), summary.total_material_requests, '#333')}
+			${card(__('Overdue'), summary.overdue, '#d32f2f')}
+			${card(__('Ordered'), `${summary.ordered_percentage}%`, '#1976d2')}
+			${card(__('Received'), `${summary.received_percentage}%`, '#2e7d32')}
+			${card(__('Billed'), `${summary.billed_percentage}%`, '#f57c00')}
+			${aging}
+		</div>
+	`);
+}
+
+function material_request_portfolio_table_html() {
+	return `
+		<table class="table table-bordered" style="margin: 15px 0;">
+			<thead>
+				<tr>
+					<th>${__('Material Request')}</th>
+					<th>${__('Type')}</th>
+					<th>${__('Date')}</th>
+					<th>${__('Required By')}</th>
+					<th class="text-right">${__('Age (days)')}</th>
+					<th class="text-right">${__('Ordered')}</th>
+					<th class="text-right">${__('Received')}</th>
+					<th class="text-right">${__('Billed')}</th>
+					<th>${__('Purchase Orders')}</th>
+					<th>${__('Status')}</th>
+				</tr>
+			</thead>
+			<tbody></tbody>
+		</table>
+		<div class="material-request-portfolio-more"></div>
+	`;
+}
+
+function render_material_request_portfolio_rows(page, result) {
+	const $tbody = page.$results.find('tbody');
+	if (!result.material_requests.length && !$tbody.children().length) {
+		page.$results.html(`<div class="text-muted" style="padding: 20px;">${__('No open Material Requests')}</div>`);
+		return;
+	}
+
+	const date = value => value ? frappe.datetime.str_to_user(value) : '';
+	$tbody.append(result.material_requests.map(d => `
+		<tr>
+			<td><a href="/app/material-request/${encodeURIComponent(d.name)}">${frappe.utils.escape_html(d.name)}</a>
+				<div class="text-muted small">${frappe.utils.escape_html(d.title || '')}</div></td>
+			<td>${__(d.material_request_type || '')}</td>
+			<td>${date(d.transaction_date)}</td>
+			<td>${date(d.schedule_date)}</td>
+			<td class="text-right">${d.age_days}</td>
+			<td class="text-right">${d.kpis.ordered_percentage || 0}%</td>
+			<td class="text-right">${d.kpis.received_percentage || 0}%</td>
+			<td class="text-right">${d.kpis.billed_percentage || 0}%</td>
+			<td><span style="color: ${d.po_status.status_color};">${__(d.po_status.status)}</span></td>
+			<td><span style="color: ${d.status_info.status_color};">${__(d.status_info.status)}</span></td>
+		</tr>
+	`).join(''));
+
+	const $more = page.$results.find('.material-request-portfolio-more').empty();
+	if (result.next_cursor) {
+		$(`<button class="btn btn-default btn-sm">${__('Load More')}</button>`)
+			.on('click', () => load_material_request_portfolio(page, result.next_cursor))
+			.appendTo($more);
+	}
+}
@@ -0,0 +1,121 @@
+import json
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("buying-addon-benchmark")
+@click.option("--sizes", default="10,1000,10000", help="Comma separated Sales Order line counts")
+@click.option("--repeat", default=3, type=int, help="Calls per endpoint and size")
+@click.option("--endpoint", "endpoints", multiple=True, help="Only benchmark endpoints whose name contains this")
+@click.option("--output", help="Write the results to this JSON file")
+@click.option("--baseline", help="Baseline JSON to compare against (defaults to benchmarks/baseline.json)")
+@click.option("--update-baseline", is_flag=True, default=False, help="Save the results as the new baseline")
+@click.option("--tolerance", default=0.2, type=float, help="Allowed relative wall time increase")
+@pass_context
+def benchmark(context, sizes, repeat, endpoints, output, baseline, update_baseline, tolerance):
+    """Benchmark the buying_addon endpoints on synthetic procurement graphs"""
+    from buying_addon.benchmarks import run
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+
+    try:
+        results = run.run(
+            sizes=[int(size) for size in sizes.split(",") if size.strip()],
+            repeat=repeat,
+            endpoints=endpoints,
+        )
+        print_results(results)
+
+        if output:
+            run.save_results(results, output)
+
+        failed = False
+
+        violations = run.check_query_scaling(results)
+        for violation in violations:
+            click.secho(
+                f"Query count grows with lines: {violation['endpoint']} {violation['queries']}", fg="red"
+            )
+            failed = True
+
+        baseline_results = run.load_baseline(baseline)
+        if baseline_results:
+            for regression in run.compare(results, baseline_results, tolerance):
+                click.secho(
+                    "Regression [{size} lines] {endpoint} {metric}: {baseline} -> {current}".format(**regression),
+                    fg="red"
+                )
+                failed = True
+        elif not update_baseline:
+            click.secho(
+                f"No baseline at {baseline or run.get_baseline_path()}; record one with --update-baseline",
+                fg="red"
+            )
+            failed = True
+
+        if update_baseline:
+            run.save_results(results, baseline or run.get_baseline_path())
+            click.secho("Baseline updated", fg="green")
+
+        if failed and not update_baseline:
+            raise SystemExit(1)
+    finally:
+        frappe.destroy()
+
+
+def print_results(results):
+    for size, size_results in results["sizes"].items():
+        click.echo(f"\n{size} lines")
+        for name, result in size_results.items():
+            short_name = name.rsplit(".", 1)[-1]
+            if "queries" in result:
+                click.echo(
+                    f"  {short_name:<50} {result['wall_time_ms']:>10.2f} ms {result['queries']:>6} queries "
+                    f"{result['rows']:>8} rows {result['peak_memory_kb']:>10.1f} KB"
+                )
+            else:
+                click.echo(f"  {short_name:<50} {json.dumps(result)}")
+
+
+@click.command("buying-addon-explain")
+@click.option("--size", default=1000, type=int, help="Sales Order line count of the graph the endpoints run on")
+@click.option("--min-rows", default=100, type=int, help="Ignore full scans estimated below this many rows")
+@click.option("--endpoint", "endpoints", multiple=True, help="Only check endpoints whose name contains this")
+@pass_context
+def explain(context, size, min_rows, endpoints):
+    """EXPLAIN the SQL issued by the buying_addon endpoints and report full table scans"""
+    from buying_addon.benchmarks.explain import explain as explain_endpoints
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+
+    try:
+        full_scans, errors = explain_endpoints(size=size, min_rows=min_rows, endpoints=endpoints)
+    finally:
+        frappe.destroy()
+
+    for error in errors:
+        click.secho(f"{error['endpoint'].rsplit('.', 1)[-1]} failed: {error['error']}", fg="red")
+
+    if not full_scans:
+        if errors:
+            raise SystemExit(1)
+        click.secho("No full scans", fg="green")
+        return
+
+    for scan in full_scans:
+        click.secho(
+            f"{scan['endpoint'].rsplit('.', 1)[-1]}: {scan['type']} scan on {scan['table']} "
+            f"(~{scan['rows']} rows, key: {scan['key']}, possible keys: {scan['possible_keys']})",
+            fg="red"
+        )
+        click.echo(f"  {scan['query']}")
+    raise SystemExit(1)
+
+
+commands = [benchmark, explain]
@@ -33,6 +33,11 @@ doctype_js = {
     "Material Request" : "buying_addon/doctype/material_request/material_request.js",
     "Sales Order" : "buying_addon/doctype/sales_order/sales_order.js",
 }
+doctype_list_js = {
+    "Purchase Order" : "buying_addon/doctype/purchase_order/purchase_order_list.js",
+    "Material Request" : "buying_addon/doctype/material_request/material_request_list.js",
+    "Sales Order" : "buying_addon/doctype/sales_order/sales_order_list.js",
+}
 # doctype_js = {"doctype" : "public/js/doctype.js"}
 # doctype_list_js = {"doctype" : "public/js/doctype_list.js"}
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
@@ -75,6 +80,10 @@ doctype_js = {
 # before_install = "buying_addon.install.before_install"
 # after_install = "buying_addon.install.after_install"
 
+# Indexes on ERPNext tables are declared in buying_addon.utils.indexes; existing sites get them
+# from the add_procurement_indexes patch, which is marked as run (not executed) on install
+after_install = "buying_addon.utils.indexes.add_procurement_indexes"
+
 # Uninstallation
 # ------------
 
@@ -136,7 +145,85 @@ override_doctype_class = {
 doc_events = {
 	"Purchase Order": {
 		"before_save": "buying_addon.buying_addon.doctype.purchase_order.purchase_order.consolidate_purchase_order_items",
-		"on_update": "buying_addon.buying_addon.doctype.purchase_order.purchase_order.consolidate_purchase_order_items"
+		"after_insert": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_update": [
+			"buying_addon.buying_addon.doctype.purchase_order.purchase_order.consolidate_purchase_order_items",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards"
+		],
+		"on_trash": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_submit": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.buying_addon.doctype.purchase_rate_history.purchase_rate_history.update_purchase_rate_history",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		],
+		"on_cancel": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.buying_addon.doctype.purchase_rate_history.purchase_rate_history.update_purchase_rate_history",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		]
+	},
+	"Material Request": {
+		"after_insert": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_update": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_trash": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_submit": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		],
+		"on_cancel": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		]
+	},
+	"Purchase Receipt": {
+		"on_submit": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		],
+		"on_cancel": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		]
+	},
+	"Purchase Invoice": {
+		"on_submit": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		],
+		"on_cancel": [
+			"buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary.update_procurement_chain_summary",
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		]
+	},
+	"Item": {
+		"on_update": "buying_addon.utils.over_delivery.clear_item_exemption_cache",
+		"after_rename": "buying_addon.utils.over_delivery.clear_item_exemption_cache",
+		"on_trash": "buying_addon.utils.over_delivery.clear_item_exemption_cache"
+	},
+	"Item Group": {
+		"on_update": "buying_addon.utils.over_delivery.update_item_group_exemptions",
+		"after_rename": "buying_addon.utils.over_delivery.update_item_group_exemptions",
+		"on_trash": "buying_addon.utils.over_delivery.update_item_group_exemptions"
+	},
+	"Production Plan": {
+		"on_update": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_update_after_submit": "buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+		"on_submit": [
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		],
+		"on_cancel": [
+			"buying_addon.utils.dashboard_cache.evict_linked_dashboards",
+			"buying_addon.utils.dashboard_snapshot.enqueue_dashboard_snapshots"
+		]
 	}
 }
 
@@ -194,11 +281,15 @@ doc_events = {
 # before_request = ["buying_addon.utils.before_request"]
 # after_request = ["buying_addon.utils.after_request"]
 
+after_request = ["buying_addon.utils.instrumentation.flush_due_samples"]
+
 # Job Events
 # ----------
 # before_job = ["buying_addon.utils.before_job"]
 # after_job = ["buying_addon.utils.after_job"]
 
+after_job = ["buying_addon.utils.instrumentation.flush_due_samples"]
+
 # User Data Protection
 # --------------------
 
@@ -233,7 +324,7 @@ doc_events = {
 # Automatically update python controller files with type annotations for this app.
 # export_python_type_annotations = True
 
-# default_log_clearing_doctypes = {
-# 	"Logging DocType Name": 30  # days to retain logs
-# }
+default_log_clearing_doctypes = {
+	"Buying Addon Endpoint Log": 14  # days to retain logs
+}
 
@@ -0,0 +1,5 @@
+from buying_addon.utils.indexes import add_procurement_indexes
+
+
+def execute():
+	add_procurement_indexes()
@@ -0,0 +1,7 @@
+from buying_addon.buying_addon.doctype.procurement_chain_summary.procurement_chain_summary import (
+	rebuild_procurement_chain_summary,
+)
+
+
+def execute():
+	rebuild_procurement_chain_summary()
@@ -0,0 +1,7 @@
+from buying_addon.buying_addon.doctype.purchase_rate_history.purchase_rate_history import (
+	rebuild_purchase_rate_history,
+)
+
+
+def execute():
+	rebuild_purchase_rate_history()
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from buying_addon.benchmarks.fixtures import get_or_make_procurement_graph
+from buying_addon.buying_addon.doctype.material_request.material_request import get_material_request_status_dashboard
+from buying_addon.buying_addon.doctype.purchase_order.purchase_order import get_purchase_order_status_dashboard
+from buying_addon.buying_addon.doctype.sales_order.sales_order import get_sales_order_status_dashboard
+from buying_addon.utils.query_counter import count_queries
+
+# Line counts of the two procurement graphs compared
+SMALL_GRAPH_LINES = 5
+LARGE_GRAPH_LINES = 50
+
+
+class TestDashboardQueryCount(FrappeTestCase):
+    """
+    The status dashboards must issue the same number of queries whatever the number of item rows
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.small_graph = get_or_make_procurement_graph(SMALL_GRAPH_LINES)
+        cls.large_graph = get_or_make_procurement_graph(LARGE_GRAPH_LINES)
+
+    def count_queries(self, fn, name):
+        # Count the work itself, not the dashboard cache or the endpoint instrumentation
+        with patch.dict(frappe.local.conf, {
+            "buying_addon_dashboard_cache_ttl": 0,
+            "buying_addon_disable_instrumentation": 1,
+        }):
+            with count_queries() as stats:
+                fn(name)
+        return stats.queries
+
+    def assertQueryCountFlat(self, fn, graph_key):
+        small = self.count_queries(fn, self.small_graph[graph_key])
+        large = self.count_queries(fn, self.large_graph[graph_key])
+        self.assertEqual(
+            small, large,
+            f"{fn.__name__} issued {small} queries for {SMALL_GRAPH_LINES} lines and {large} for {LARGE_GRAPH_LINES}",
+        )
+
+    def test_sales_order_status_dashboard(self):
+        self.assertQueryCountFlat(get_sales_order_status_dashboard, "sales_order")
+
+    def test_purchase_order_status_dashboard(self):
+        self.assertQueryCountFlat(get_purchase_order_status_dashboard, "purchase_order")
+
+    def test_material_request_status_dashboard(self):
+        self.assertQueryCountFlat(get_material_request_status_dashboard, "material_request")
@@ -0,0 +1,60 @@
+import frappe
+from frappe import _
+
+# Upper bound on document names accepted by the bulk dashboard endpoints
+MAX_BULK_NAMES = 5000
+
+# Number of names sent in a single IN (...) clause
+BULK_CHUNK_SIZE = 1000
+
+
+def parse_names(names, limit=MAX_BULK_NAMES):
+    """
+    Normalize the `names` argument of a bulk endpoint (list or JSON string)
+    into a de-duplicated list, preserving order
+    """
+    if isinstance(names, str):
+        names = frappe.parse_json(names) if names.strip().startswith("[") else names.split(",")
+
+    names = list(dict.fromkeys(name.strip() for name in names or [] if name and name.strip()))
+
+    if len(names) > limit:
+        frappe.throw(_("Cannot process more than {0} documents at once").format(limit))
+
+    return names
+
+
+def get_permitted_names(doctype, names):
+    """
+    Narrow `names` to the documents of `doctype` the user can read (user permissions and
+    permission query conditions included), preserving order
+    """
+    permitted = set()
+    for chunk in chunked(names):
+        permitted.update(frappe.get_list(
+            doctype, filters={"name": ["in", chunk]}, pluck="name", limit_page_length=0
+        ))
+    return [name for name in names if name in permitted]
+
+
+def get_permitted_names_query(doctype):
+    """
+    SQL selecting the names of the `doctype` documents the user can read (user permissions and
+    permission query conditions included), for a `name IN (...)` condition of a raw query.
+    `%` is escaped, as the raw query is formatted with its own values.
+    """
+    query = frappe.get_list(doctype, fields=["name"], limit_page_length=0, run=0)
+    return query.replace("%", "%%")
+
+
+def chunked(names, size=BULK_CHUNK_SIZE):
+    for start in range(0, len(names), size):
+        yield names[start:start + size]
+
+
+def percentage(part, whole):
+    """
+    Percentage of `part` in `whole`, capped at 100 and rounded like the dashboards
+    """
+    value = (part / whole * 100) if whole and whole > 0 else 0
+    return round(min(value, 100), 1)
@@ -0,0 +1,248 @@
+import functools
+import hashlib
+import inspect
+
+import frappe
+from frappe.utils import cint
+
+from buying_addon.buying_addon.doctype.dashboard_snapshot.dashboard_snapshot import get_snapshot
+from buying_addon.utils.instrumentation import instrumented
+from buying_addon.utils.single_flight import single_flight
+
+
+CACHE_PREFIX = "buying_addon:dashboard"
+STATS_PREFIX = "buying_addon:dashboard_cache_stats"
+GENERATION_PREFIX = "buying_addon:dashboard_generation"
+
+# Default time-to-live (seconds) for cached dashboard responses.
+# Can be overridden per site with `buying_addon_dashboard_cache_ttl` in site_config.json,
+# a value of 0 disables the cache.
+DEFAULT_CACHE_TTL = 300
+
+# Request argument carrying the version token the client already has
+VERSION_ARG = "dashboard_version"
+
+# Realtime event sent to the open forms of documents whose dashboards changed
+INVALIDATION_EVENT = "buying_addon_dashboard_invalidated"
+
+# Generations are random, so one expiring (or a Redis flush) only makes clients refetch once
+GENERATION_TTL = 7 * 24 * 60 * 60
+
+
+def get_cache_ttl():
+    """
+    Get the dashboard cache TTL configured for the current site
+    """
+    ttl = frappe.conf.get("buying_addon_dashboard_cache_ttl")
+    return DEFAULT_CACHE_TTL if ttl is None else cint(ttl)
+
+
+def cached_dashboard(doctype, name_arg, snapshot=False):
+    """
+    Cache the response of a dashboard function per document and make it conditional.
+
+    Every response carries a `version` token built from the document's `modified`
+    stamp, a generation that `evict_dashboard` rotates whenever a linked document
+    changes, and the call arguments. When the client sends that
+    token back as `dashboard_version` and it still matches, `{"unchanged": 1}` is
+    returned without computing or sending the dashboard again.
+
+    With `snapshot=True`, a response precomputed in the background for the same
+    version (see `dashboard_snapshot`) is served before computing it, unless
+    the cache is disabled.
+
+    Concurrent misses for the same document and version wait on a single
+    computation (see `single_flight`) instead of running it in parallel.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # frappe drops arguments missing from the signature, so read the token from the request too
+            client_version = kwargs.pop(VERSION_ARG, None) or frappe.form_dict.get(VERSION_ARG)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            name = bound.arguments.get(name_arg)
+
+            modified = name and frappe.db.get_value(doctype, name, "modified")
+            if not modified:
+                # Let the dashboard function handle missing documents
+                return fn(*args, **kwargs)
+
+            version = get_dashboard_version(doctype, name, fn.__name__, modified, bound.arguments)
+            if client_version == version:
+                record_cache_stat(fn.__name__, "not_modified")
+                return {"unchanged": 1, "version": version}
+
+            ttl = get_cache_ttl()
+            key = f"{get_response_prefix(doctype, name)}{fn.__name__}:{version}"
+            if ttl > 0:
+                cached = frappe.cache().get_value(key)
+                if cached is not None:
+                    record_cache_stat(fn.__name__, "hits")
+                    return cached
+                record_cache_stat(fn.__name__, "misses")
+
+            def compute():
+                result = get_snapshot(doctype, name, fn.__name__, version) if snapshot and ttl > 0 else None
+                if result is not None:
+                    record_cache_stat(fn.__name__, "snapshots")
+                else:
+                    result = fn(*args, **kwargs)
+                if isinstance(result, dict):
+                    result["version"] = version
+                return result
+
+            if ttl <= 0:
+                return compute()
+
+            # Concurrent callers for the same document and version share one computation
+            lock_key = f"{get_lock_prefix(doctype, name)}{fn.__name__}:{version}"
+            result, shared = single_flight(key, compute, ttl, lock_key=lock_key)
+            if shared:
+                record_cache_stat(fn.__name__, "coalesced")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_dashboard_version(doctype, name, endpoint, modified, arguments):
+    """
+    Build the version token of a dashboard response
+    """
+    args_signature = "|".join(f"{key}={arguments[key]}" for key in sorted(arguments))
+    signature = f"{endpoint}|{modified}|{get_dashboard_generation(doctype, name)}|{args_signature}"
+    return hashlib.md5(signature.encode()).hexdigest()
+
+
+def get_dashboard_generation(doctype, name):
+    """
+    Get the current generation of a document's dashboards, starting a new one if there is none
+    """
+    key = get_generation_key(doctype, name)
+    generation = frappe.cache().get_value(key)
+    if not generation:
+        generation = frappe.generate_hash(length=10)
+        frappe.cache().set_value(key, generation, expires_in_sec=GENERATION_TTL)
+    return generation
+
+
+def get_generation_key(doctype, name):
+    return f"{GENERATION_PREFIX}:{doctype}:{name}"
+
+
+def get_document_prefix(doctype, name):
+    return f"{CACHE_PREFIX}:{doctype}:{name}:"
+
+
+def get_response_prefix(doctype, name):
+    return f"{get_document_prefix(doctype, name)}resp:"
+
+
+def get_lock_prefix(doctype, name):
+    return f"{get_document_prefix(doctype, name)}lock:"
+
+
+def evict_dashboard(doctype, name):
+    """
+    Remove every cached dashboard response for a document and invalidate
+    the version tokens clients hold for it, once the current transaction commits.
+
+    Evicting earlier would let a concurrent reader cache the pre-commit data
+    under the new generation it starts.
+    """
+    frappe.db.after_commit.add(functools.partial(delete_dashboard_cache, doctype, name))
+
+
+def delete_dashboard_cache(doctype, name):
+    # Responses only: a single-flight lock held by a running computation must outlive the eviction
+    frappe.cache().delete_value(get_generation_key(doctype, name))
+    frappe.cache().delete_keys(get_response_prefix(doctype, name))
+
+
+def record_cache_stat(endpoint, stat):
+    cache = frappe.cache()
+    try:
+        cache.incr(cache.make_key(f"{STATS_PREFIX}:{endpoint}:{stat}"))
+    except Exception:
+        # Counters are best effort and must never break a dashboard call
+        pass
+
+
+def get_linked_dashboard_documents(doc):
+    """
+    Get the (doctype, name) pairs whose dashboards depend on the given document
+    """
+    linked = set()
+
+    if doc.doctype in ("Sales Order", "Material Request", "Purchase Order"):
+        linked.add((doc.doctype, doc.name))
+
+    if doc.get("sales_order"):
+        linked.add(("Sales Order", doc.sales_order))
+
+    for table_field in ("items", "po_items", "sales_orders"):
+        for row in doc.get(table_field) or []:
+            if row.get("sales_order"):
+                linked.add(("Sales Order", row.sales_order))
+            if row.get("material_request"):
+                linked.add(("Material Request", row.material_request))
+            if row.get("purchase_order"):
+                linked.add(("Purchase Order", row.purchase_order))
+
+    return linked
+
+
+def evict_linked_dashboards(doc, method=None):
+    """
+    doc_events handler: evict cached dashboards of every document linked to `doc`
+    when it changes, and tell the open forms of the other ones to reload
+    """
+    for linked_doctype, linked_name in get_linked_dashboard_documents(doc):
+        evict_dashboard(linked_doctype, linked_name)
+        if (linked_doctype, linked_name) != (doc.doctype, doc.name):
+            notify_dashboard_invalidated(linked_doctype, linked_name, doc)
+
+
+def notify_dashboard_invalidated(doctype, name, source_doc):
+    """
+    Push a compact invalidation event to the users who have the document open.
+    Sent after commit, so the reload they trigger sees the new data.
+    """
+    frappe.publish_realtime(
+        INVALIDATION_EVENT,
+        {
+            "doctype": doctype,
+            "name": name,
+            "source_doctype": source_doc.doctype,
+            "source_name": source_doc.name,
+        },
+        doctype=doctype,
+        docname=name,
+        after_commit=True,
+    )
+
+
+@frappe.whitelist()
+@instrumented
+def get_dashboard_cache_stats():
+    """
+    Get hit/miss counters of the dashboard cache for the current site
+    """
+    frappe.only_for("System Manager")
+
+    cache = frappe.cache()
+    stats = {}
+    for key in cache.get_keys(f"{STATS_PREFIX}:"):
+        key = frappe.safe_decode(key)
+        endpoint, stat = key.rsplit(":", 2)[-2:]
+        stats.setdefault(endpoint, {"hits": 0, "misses": 0})[stat] = cint(cache.get(key))
+
+    for endpoint_stats in stats.values():
+        total = endpoint_stats["hits"] + endpoint_stats["misses"]
+        endpoint_stats["hit_ratio"] = round(endpoint_stats["hits"] / total * 100, 1) if total else 0
+
+    return {"ttl": get_cache_ttl(), "endpoints": stats}
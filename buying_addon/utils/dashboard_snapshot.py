@@ -0,0 +1,60 @@
+import frappe
+
+from buying_addon.buying_addon.doctype.dashboard_snapshot.dashboard_snapshot import save_snapshot
+from buying_addon.utils.dashboard_cache import get_linked_dashboard_documents
+
+# Dashboards precomputed in the background: doctype -> (endpoint, name argument)
+SNAPSHOT_DASHBOARDS = {
+    "Sales Order": (
+        "buying_addon.buying_addon.doctype.sales_order.sales_order.get_sales_order_status_dashboard",
+        "sales_order_name",
+    ),
+    "Material Request": (
+        "buying_addon.buying_addon.doctype.material_request.material_request.get_material_request_status_dashboard",
+        "material_request_name",
+    ),
+    "Purchase Order": (
+        "buying_addon.buying_addon.doctype.purchase_order.purchase_order.get_purchase_order_status_dashboard",
+        "purchase_order_name",
+    ),
+}
+
+# Snapshots hold the first page of items as the forms request it
+SNAPSHOT_PAGE_SIZE = 50
+
+
+def enqueue_dashboard_snapshots(doc, method=None):
+    """
+    doc_events handler for MR / PO / PR / PI / Production Plan on_submit and on_cancel:
+    recompute the dashboards of every linked document in the background.
+    Runs after `evict_linked_dashboards`, so the snapshots are built for the new version.
+    """
+    for reference_doctype, reference_name in get_linked_dashboard_documents(doc):
+        if reference_doctype not in SNAPSHOT_DASHBOARDS:
+            continue
+
+        # One pending job per document, however many receipts and invoices touch it
+        frappe.enqueue(
+            "buying_addon.utils.dashboard_snapshot.refresh_dashboard_snapshot",
+            queue="short",
+            job_id=f"buying_addon_dashboard_snapshot::{reference_doctype}::{reference_name}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            reference_doctype=reference_doctype,
+            reference_name=reference_name,
+        )
+
+
+def refresh_dashboard_snapshot(reference_doctype, reference_name):
+    """
+    Compute the dashboard of a document and store it as its snapshot
+    """
+    if not frappe.db.exists(reference_doctype, reference_name):
+        return
+
+    endpoint, name_arg = SNAPSHOT_DASHBOARDS[reference_doctype]
+    dashboard = frappe.get_attr(endpoint)
+    data = dashboard(**{name_arg: reference_name, "page": 1, "page_size": SNAPSHOT_PAGE_SIZE})
+
+    if data and data.get("version"):
+        save_snapshot(reference_doctype, reference_name, dashboard.__name__, data["version"], data)
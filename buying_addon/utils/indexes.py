@@ -0,0 +1,55 @@
+import frappe
+
+# Composite indexes added to ERPNext tables for the dashboard, tree and portfolio queries,
+# declared once per doctype. Header level `sales_order` links are custom fields on some
+# sites only, so every index is created only where all of its columns exist.
+PROCUREMENT_INDEXES = {
+    # Per-item grouping of a document's lines
+    "Sales Order Item": (["parent", "item_code"],),
+    # Portfolio: open Material Requests, filtered by company and sorted by date
+    "Material Request": (
+        ["docstatus", "status", "transaction_date"],
+        ["company", "docstatus", "status"],
+    ),
+    # Procurement tree and totals: the Sales Order's Material Requests
+    "Material Request Item": (
+        ["parent", "item_code"],
+        ["sales_order", "docstatus"],
+    ),
+    # Material Request line progress and the procurement tree, through `material_request_item`,
+    # and the Purchase Orders raised directly against the Sales Order
+    "Purchase Order Item": (
+        ["parent", "item_code"],
+        ["material_request", "material_request_item"],
+        ["sales_order", "docstatus"],
+    ),
+    "Purchase Receipt Item": (
+        ["parent", "item_code"],
+        ["material_request", "material_request_item"],
+    ),
+    # Billed quantities per Purchase Order and Material Request line
+    "Purchase Invoice Item": (
+        ["parent", "item_code"],
+        ["purchase_order", "po_detail"],
+        ["material_request", "material_request_item"],
+    ),
+    # Production data of the Sales Order dashboards
+    "Production Plan": (["sales_order", "docstatus"],),
+}
+
+
+def add_indexes(doctype):
+    """
+    Create the declared indexes of a doctype that are missing
+    """
+    for columns in PROCUREMENT_INDEXES.get(doctype, ()):
+        if all(frappe.db.has_column(doctype, column) for column in columns):
+            frappe.db.add_index(doctype, columns)
+
+
+def add_procurement_indexes():
+    """
+    after_install hook and add_procurement_indexes patch: create the declared indexes of every doctype
+    """
+    for doctype in PROCUREMENT_INDEXES:
+        add_indexes(doctype)
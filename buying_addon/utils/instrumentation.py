@@ -0,0 +1,162 @@
+import functools
+import time
+from collections import deque
+
+import frappe
+from frappe.utils import add_to_date, cint, now, now_datetime
+
+from buying_addon.utils.query_counter import count_queries
+
+LOG_DOCTYPE = "Buying Addon Endpoint Log"
+
+# Samples kept in memory per site and worker process; the oldest are dropped if flushing falls behind
+SAMPLE_BUFFER_SIZE = 2000
+
+# A flush is queued when this many samples are buffered or FLUSH_INTERVAL seconds have passed
+FLUSH_BATCH_SIZE = 200
+FLUSH_INTERVAL = 60
+
+SAMPLE_FIELDS = ("endpoint", "sampled_at", "wall_time_ms", "queries", "rows_fetched", "response_bytes")
+
+# site -> deque of samples (tuples in SAMPLE_FIELDS order)
+_sample_buffers = {}
+# site -> time.monotonic() of the last flush
+_last_flush = {}
+
+
+def is_instrumentation_enabled():
+    """
+    Instrumentation is on unless `buying_addon_disable_instrumentation` is set in site_config.json
+    """
+    return not cint(frappe.conf.get("buying_addon_disable_instrumentation"))
+
+
+def instrumented(fn):
+    """
+    Record wall time, query count, rows fetched and response size of every call.
+    Apply it right under `@frappe.whitelist()`.
+    """
+    endpoint = f"{fn.__module__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not is_instrumentation_enabled():
+            return fn(*args, **kwargs)
+
+        start = time.perf_counter()
+        with count_queries() as stats:
+            result = fn(*args, **kwargs)
+        wall_time_ms = (time.perf_counter() - start) * 1000
+
+        record_sample(endpoint, wall_time_ms, stats.queries, stats.rows, get_response_size(result))
+        return result
+
+    return wrapper
+
+
+def get_response_size(result):
+    if result is None:
+        return 0
+    if isinstance(result, str):
+        return len(result)
+    try:
+        return len(frappe.as_json(result, indent=None))
+    except Exception:
+        return 0
+
+
+def record_sample(endpoint, wall_time_ms, queries, rows, response_bytes):
+    site = frappe.local.site
+    buffer = _sample_buffers.get(site)
+    if buffer is None:
+        buffer = _sample_buffers[site] = deque(maxlen=SAMPLE_BUFFER_SIZE)
+        _last_flush[site] = time.monotonic()
+
+    buffer.append((endpoint, now_datetime(), round(wall_time_ms, 3), queries, rows, response_bytes))
+
+    if len(buffer) >= FLUSH_BATCH_SIZE or is_flush_due(site):
+        flush_samples(site)
+
+
+def is_flush_due(site):
+    return time.monotonic() - _last_flush.get(site, 0) >= FLUSH_INTERVAL
+
+
+def flush_due_samples():
+    """
+    after_request / after_job hook: flush the site's buffered samples once FLUSH_INTERVAL
+    has passed, so samples are written even when no further instrumented call comes in.
+    Buffers live in the worker process, so the flush has to run there and not in a scheduled job.
+    """
+    site = getattr(frappe.local, "site", None)
+    if _sample_buffers.get(site) and is_flush_due(site):
+        flush_samples(site)
+
+
+def flush_samples(site=None):
+    """
+    Hand the buffered samples of a site to a background job that writes them to the log
+    """
+    site = site or frappe.local.site
+    buffer = _sample_buffers.get(site)
+    _last_flush[site] = time.monotonic()
+    if not buffer:
+        return
+
+    samples = list(buffer)
+    buffer.clear()
+
+    try:
+        frappe.enqueue(
+            "buying_addon.utils.instrumentation.insert_samples",
+            queue="short",
+            samples=samples,
+        )
+    except Exception:
+        # Losing a batch of samples must never fail the request that triggered the flush
+        pass
+
+
+def insert_samples(samples):
+    if not samples:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        LOG_DOCTYPE,
+        fields=["name", *SAMPLE_FIELDS, "creation", "modified", "owner", "modified_by"],
+        values=[
+            (frappe.generate_hash(length=10), *sample, timestamp, timestamp, user, user)
+            for sample in samples
+        ]
+    )
+
+
+@frappe.whitelist()
+def get_endpoint_latency_stats(hours=24):
+    """
+    Get call count, p50/p95/p99 wall time and average queries, rows and response size
+    per endpoint over the last `hours`
+    """
+    frappe.only_for("System Manager")
+
+    since = add_to_date(now_datetime(), hours=-(cint(hours) or 24))
+
+    endpoints = frappe.db.sql("""
+        SELECT DISTINCT
+            endpoint,
+            COUNT(*) OVER (PARTITION BY endpoint) AS calls,
+            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY wall_time_ms) OVER (PARTITION BY endpoint) AS p50,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY wall_time_ms) OVER (PARTITION BY endpoint) AS p95,
+            PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY wall_time_ms) OVER (PARTITION BY endpoint) AS p99,
+            AVG(queries) OVER (PARTITION BY endpoint) AS avg_queries,
+            MAX(queries) OVER (PARTITION BY endpoint) AS max_queries,
+            AVG(rows_fetched) OVER (PARTITION BY endpoint) AS avg_rows,
+            AVG(response_bytes) OVER (PARTITION BY endpoint) AS avg_response_bytes
+        FROM `tabBuying Addon Endpoint Log`
+        WHERE sampled_at >= %(since)s
+        ORDER BY p95 DESC
+    """, {"since": since}, as_dict=1)
+
+    return {"site": frappe.local.site, "since": since, "endpoints": endpoints}
@@ -0,0 +1,254 @@
+import functools
+
+import frappe
+import redis
+from frappe.utils import cint
+
+# Redis hash of item_code -> item_group, so receipts do not query Item for every validation
+ITEM_GROUPS_CACHE_KEY = "buying_addon:over_delivery_item_groups"
+
+# Redis hash of item_group -> b"1" / b"0": exempt from over-delivery checks, by its own flag
+# or one inherited from any ancestor in the Item Group tree
+EXEMPT_GROUPS_CACHE_KEY = "buying_addon:over_delivery_exempt_groups"
+
+# Changes whenever EXEMPT_GROUPS_CACHE_KEY does; workers compare it with their local copy
+EXEMPT_GROUPS_VERSION_KEY = "buying_addon:over_delivery_exempt_groups_version"
+
+# Process-local copy of the exempt groups per site: { site: (version, frozenset of exempt groups) }
+_exempt_groups = {}
+
+
+class OverDeliveryExemptionMixin:
+    """
+    Skip the over-delivery allowance check for items whose Item Group, or any of its
+    ancestors, is flagged `custom_exempt_from_over_delivery`.
+
+    The exemption flags of all items on the document are resolved once, on the
+    first check, and memoized on the document for the rest of the validation.
+    """
+
+    def check_overflow_with_allowance(self, item, args):
+        if self.is_exempt_from_over_delivery(item.get("item_code")):
+            return
+        super().check_overflow_with_allowance(item, args)
+
+    def is_exempt_from_over_delivery(self, item_code):
+        exempt_map = getattr(self, "_over_delivery_exempt_map", None)
+        if exempt_map is None:
+            exempt_map = self._over_delivery_exempt_map = get_exemption_map(
+                [d.item_code for d in self.get("items") or []]
+            )
+
+        if item_code not in exempt_map:
+            exempt_map.update(get_exemption_map([item_code]))
+
+        return exempt_map.get(item_code, False)
+
+
+def get_exemption_map(item_codes):
+    """
+    Get over-delivery exemption flags for the given items: one lookup of their Item Groups
+    (Redis first, then a single query) and a set lookup per item in the exempt groups.
+    Returns a dict: { item_code: bool }
+    """
+    item_codes = list(dict.fromkeys(code for code in item_codes if code))
+    if not item_codes:
+        return {}
+
+    exempt_groups = get_exempt_item_groups()
+    return {
+        item_code: item_group in exempt_groups
+        for item_code, item_group in get_item_groups(item_codes).items()
+    }
+
+
+def get_item_groups(item_codes):
+    """
+    Get the Item Group of each item, reading the cross-request Redis cache first
+    and resolving the remaining items with a single query.
+    Returns a dict: { item_code: item_group }
+    """
+    cache = frappe.cache()
+    key = cache.make_key(ITEM_GROUPS_CACHE_KEY)
+
+    try:
+        cached_groups = dict(zip(item_codes, cache.hmget(key, item_codes)))
+    except Exception:
+        cached_groups = {}
+
+    item_groups = {
+        item_code: item_group.decode()
+        for item_code, item_group in cached_groups.items()
+        if item_group is not None
+    }
+
+    missing = [item_code for item_code in item_codes if item_code not in item_groups]
+    if missing:
+        resolved = dict(frappe.db.sql("""
+            SELECT name, IFNULL(item_group, '')
+            FROM `tabItem`
+            WHERE name IN %(item_codes)s
+        """, {"item_codes": tuple(missing)}))
+        item_groups.update(resolved)
+
+        if resolved:
+            try:
+                # RedisWrapper.hset pickles single values; store plain names in one round trip instead
+                redis.Redis.hset(cache, key, mapping=resolved)
+            except Exception:
+                pass
+
+    return item_groups
+
+
+def get_exempt_item_groups():
+    """
+    Get the set of exempt Item Groups (inheritance included).
+    Served from the process-local copy while its version matches the one in Redis,
+    so a validation costs one Redis GET; the table is built on first use.
+    """
+    cache = frappe.cache()
+    site = frappe.local.site
+
+    try:
+        version = cache.get_value(EXEMPT_GROUPS_VERSION_KEY)
+    except Exception:
+        return get_exempt_groups_from_db()
+
+    local = _exempt_groups.get(site)
+    if version and local and local[0] == version:
+        return local[1]
+
+    if version:
+        try:
+            # RedisWrapper.hgetall unpickles values; the flags are stored plain
+            flags = redis.Redis.hgetall(cache, cache.make_key(EXEMPT_GROUPS_CACHE_KEY))
+        except Exception:
+            flags = None
+
+        if flags:
+            exempt_groups = frozenset(group.decode() for group, flag in flags.items() if flag == b"1")
+            _exempt_groups[site] = (version, exempt_groups)
+            return exempt_groups
+
+    return rebuild_exempt_groups()
+
+
+def get_exempt_groups_from_db():
+    return frozenset(group for group, exempt in get_group_exemptions() if cint(exempt))
+
+
+def get_group_exemptions(lft=None, rgt=None):
+    """
+    Resolve the inherited exemption of every Item Group (or of the subtree between `lft`
+    and `rgt`) with one nested set query: a group is exempt if any group whose
+    lft/rgt range contains it is flagged.
+    Returns a list of (item_group, exempt)
+    """
+    subtree = "WHERE item_group.lft BETWEEN %(lft)s AND %(rgt)s" if lft is not None else ""
+    return frappe.db.sql(f"""
+        SELECT item_group.name, MAX(IFNULL(ancestor.custom_exempt_from_over_delivery, 0))
+        FROM `tabItem Group` item_group
+        JOIN `tabItem Group` ancestor
+            ON ancestor.lft <= item_group.lft AND ancestor.rgt >= item_group.rgt
+        {subtree}
+        GROUP BY item_group.name
+    """, {"lft": lft, "rgt": rgt})
+
+
+def rebuild_exempt_groups():
+    """
+    Recompute the exemption of every Item Group into Redis and bump the version
+    """
+    exemptions = get_group_exemptions()
+    cache = frappe.cache()
+    key = cache.make_key(EXEMPT_GROUPS_CACHE_KEY)
+
+    try:
+        pipeline = cache.pipeline()
+        pipeline.delete(key)
+        if exemptions:
+            pipeline.hset(key, mapping={group: "1" if cint(exempt) else "0" for group, exempt in exemptions})
+        pipeline.execute()
+        version = bump_exempt_groups_version()
+    except Exception:
+        version = None
+
+    exempt_groups = frozenset(group for group, exempt in exemptions if cint(exempt))
+    if version:
+        _exempt_groups[frappe.local.site] = (version, exempt_groups)
+    return exempt_groups
+
+
+def update_exempt_groups(lft, rgt, removed_groups=()):
+    """
+    Recompute the exemption of the Item Groups between `lft` and `rgt` (a changed group
+    and its descendants, the only ones its flag or position can affect) and bump the version
+    """
+    cache = frappe.cache()
+    key = cache.make_key(EXEMPT_GROUPS_CACHE_KEY)
+
+    if not cache.get_value(EXEMPT_GROUPS_VERSION_KEY):
+        # Not built yet (or Redis was flushed): the next lookup builds the whole table
+        return
+
+    exemptions = get_group_exemptions(lft, rgt)
+    for group in removed_groups:
+        cache.hdel(EXEMPT_GROUPS_CACHE_KEY, group)
+    if exemptions:
+        redis.Redis.hset(cache, key, mapping={group: "1" if cint(exempt) else "0" for group, exempt in exemptions})
+    bump_exempt_groups_version()
+
+
+def bump_exempt_groups_version():
+    version = frappe.generate_hash(length=10)
+    frappe.cache().set_value(EXEMPT_GROUPS_VERSION_KEY, version)
+    return version
+
+
+def clear_item_exemption_cache(doc, method=None, *args):
+    """
+    doc_events handler for Item: drop the cached Item Group of the changed (or renamed) item
+    once the change is committed, so a concurrent validation cannot cache the old group again
+    """
+    item_codes = [doc.name]
+    if method == "after_rename" and args:
+        item_codes.append(args[0])
+
+    frappe.db.after_commit.add(functools.partial(delete_cached_item_groups, item_codes))
+
+
+def delete_cached_item_groups(item_codes):
+    for item_code in item_codes:
+        frappe.cache().hdel(ITEM_GROUPS_CACHE_KEY, item_code)
+
+
+def update_item_group_exemptions(doc, method=None, *args):
+    """
+    doc_events handler for Item Group: refresh the inherited exemption of the group's subtree
+    once the change is committed (see refresh_item_group_exemptions)
+    """
+    old_name = args[0] if method == "after_rename" and args else None
+    frappe.db.after_commit.add(functools.partial(refresh_item_group_exemptions, doc.name, method, old_name))
+
+
+def refresh_item_group_exemptions(item_group, method, old_name=None):
+    """
+    Apply a committed Item Group change to the Redis tables.
+    A rename also rewrites `item_group` on its items, so their cached groups are dropped.
+    """
+    removed_groups = []
+    if old_name:
+        removed_groups.append(old_name)
+        frappe.cache().delete_value(ITEM_GROUPS_CACHE_KEY)
+
+    if method == "on_trash":
+        frappe.cache().hdel(EXEMPT_GROUPS_CACHE_KEY, item_group)
+        bump_exempt_groups_version()
+        return
+
+    # lft/rgt may have moved in this save, read them back
+    bounds = frappe.db.get_value("Item Group", item_group, ["lft", "rgt"])
+    if not bounds:
+        return
+    update_exempt_groups(*bounds, removed_groups)
@@ -0,0 +1,29 @@
+import frappe
+from frappe.utils import cint
+
+# Rows per page of the dashboard items tables
+DEFAULT_PAGE_SIZE = 100
+
+
+def get_pagination(total_items, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Normalize `page` / `page_size` and describe the slice of rows they select,
+    in the shape the Material Request dashboard returns as `pagination`
+    """
+    page = max(cint(page), 1)
+    page_size = cint(page_size)
+    if page_size < 1:
+        page_size = DEFAULT_PAGE_SIZE
+
+    total_pages = max((total_items + page_size - 1) // page_size, 1)
+    start_index = (page - 1) * page_size
+    end_index = min(start_index + page_size, total_items)
+
+    return frappe._dict({
+        "page": page,
+        "page_size": page_size,
+        "total_items": total_items,
+        "total_pages": total_pages,
+        "start_index": start_index,
+        "end_index": end_index,
+    })
@@ -0,0 +1,49 @@
+from collections import namedtuple
+from functools import lru_cache
+
+import frappe
+from frappe.model import default_fields
+
+
+def get_header(doctype, name, fields):
+    """
+    Get the header fields of a document as a dict, without loading any child table.
+    Fields the doctype does not have (optional custom fields) come back as None.
+    """
+    meta = frappe.get_meta(doctype)
+    existing = [field for field in fields if field in default_fields or meta.has_field(field)]
+
+    header = frappe.db.get_value(doctype, name, existing, as_dict=True)
+    if header:
+        for field in fields:
+            header.setdefault(field, None)
+    return header
+
+
+def get_child_rows(child_doctype, parent, parenttype, fields, pagination=None):
+    """
+    Get `fields` of the rows of one child table of `parent`, in form order (`idx`),
+    as named tuples. With a `pagination` (see `utils.pagination`) only that page is read.
+    """
+    row_type = get_row_type(child_doctype, tuple(fields))
+    columns = ", ".join(f"`{field}`" for field in fields)
+    limit = "LIMIT %(limit)s OFFSET %(offset)s" if pagination else ""
+
+    rows = frappe.db.sql(f"""
+        SELECT {columns}
+        FROM `tab{child_doctype}`
+        WHERE parent = %(parent)s AND parenttype = %(parenttype)s
+        ORDER BY idx
+        {limit}
+    """, {
+        "parent": parent,
+        "parenttype": parenttype,
+        "limit": pagination.page_size if pagination else None,
+        "offset": pagination.start_index if pagination else None,
+    })
+    return [row_type._make(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_row_type(child_doctype, fields):
+    return namedtuple(frappe.scrub(child_doctype).title().replace("_", "") + "Row", fields)
@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+import frappe
+
+
+@contextmanager
+def count_queries(capture=False):
+    """
+    Count the SQL statements (and rows they return) issued through `frappe.db.sql`
+    inside the block. `frappe.db.get_value`, `get_all` etc. go through `sql` too.
+    With `capture`, the statements are also kept as (query, values) in `stats.statements`.
+
+        with count_queries() as stats:
+            ...
+        stats.queries, stats.rows
+    """
+    stats = frappe._dict(queries=0, rows=0, statements=[])
+    db = frappe.db
+    original_sql = db.sql
+
+    def counting_sql(*args, **kwargs):
+        result = original_sql(*args, **kwargs)
+        stats.queries += 1
+        if capture:
+            query = args[0] if args else kwargs.get("query")
+            values = args[1] if len(args) > 1 else kwargs.get("values")
+            stats.statements.append((str(query), values))
+        if isinstance(result, (list, tuple)):
+            stats.rows += len(result)
+        return result
+
+    db.sql = counting_sql
+    try:
+        yield stats
+    finally:
+        db.sql = original_sql
@@ -0,0 +1,66 @@
+import frappe
+
+RATE_HISTORY_TEMPLATE = ("templates", "includes", "rate_history.html")
+
+# Rendered fragments are keyed by the newest contributing document's `modified`,
+# so they never go stale and only need a TTL to bound memory use.
+# Links are relative, so a fragment does not depend on the host it was rendered for.
+FRAGMENT_CACHE_TTL = 24 * 60 * 60
+FRAGMENT_CACHE_PREFIX = "buying_addon:rate_history_html"
+
+PURCHASE_RATE_COLUMNS = (
+    {"fieldname": "date", "label": "Date"},
+    {"fieldname": "invoice_no", "label": "Invoice No", "route": "purchase-order"},
+    {"fieldname": "supplier", "label": "Supplier"},
+    {"fieldname": "currency", "label": "Currency"},
+    {"fieldname": "rate", "label": "Rate"},
+    {"fieldname": "qty", "label": "Qty"},
+)
+
+SALES_RATE_COLUMNS = (
+    {"fieldname": "transaction_date", "label": "Date"},
+    {"fieldname": "sales_order", "label": "Order No", "route": "sales-order"},
+    {"fieldname": "customer", "label": "Customer"},
+    {"fieldname": "currency", "label": "Currency"},
+    {"fieldname": "rate", "label": "Rate"},
+    {"fieldname": "qty", "label": "Qty"},
+)
+
+# Compiled once per worker process
+_compiled_template = None
+
+
+def get_rate_history_template():
+    global _compiled_template
+
+    if _compiled_template is None:
+        source = frappe.read_file(frappe.get_app_path("buying_addon", *RATE_HISTORY_TEMPLATE))
+        _compiled_template = frappe.get_jenv().from_string(source)
+
+    return _compiled_template
+
+
+def render_rate_history(columns, rows):
+    return get_rate_history_template().render(columns=columns, rows=rows)
+
+
+def get_rate_history_html(kind, item_code, version, columns, get_rows, page=1, page_size=None):
+    """
+    Get the rendered rate history table of an item, from the fragment cache when possible.
+
+    `version` is the `modified` stamp of the newest document contributing to the
+    history; `get_rows` is only called on a cache miss.
+    Returns None when there is no history.
+    """
+    key = f"{FRAGMENT_CACHE_PREFIX}:{kind}:{item_code}:{page}:{page_size}:{version}"
+    html = frappe.cache().get_value(key)
+    if html is not None:
+        return html
+
+    rows = get_rows()
+    if not rows:
+        return None
+
+    html = render_rate_history(columns, rows)
+    frappe.cache().set_value(key, html, expires_in_sec=FRAGMENT_CACHE_TTL)
+    return html
@@ -0,0 +1,45 @@
+import frappe
+from redis.exceptions import LockError, RedisError
+
+# Seconds a computation may hold the lock before Redis releases it (crashed worker)
+LOCK_TIMEOUT = 120
+
+# Seconds a caller waits for another worker's computation before computing itself
+WAIT_TIMEOUT = 30
+
+
+def single_flight(key, compute, ttl, lock_key=None, lock_timeout=LOCK_TIMEOUT, wait_timeout=WAIT_TIMEOUT):
+    """
+    Get the value cached under `key`, calling `compute` at most once at a time across workers.
+
+    Concurrent callers for the same key wait on a Redis lock (`lock_key`, `<key>:lock`
+    by default) while the first one computes, then read the value it stored
+    (for `ttl` seconds) instead of running the same computation again.
+    Returns (value, shared) where `shared` is True when another caller computed it.
+    """
+    cache = frappe.cache()
+    lock = cache.lock(cache.make_key(lock_key or f"{key}:lock"), timeout=lock_timeout, blocking_timeout=wait_timeout)
+
+    try:
+        acquired = lock.acquire()
+    except RedisError:
+        acquired = False
+
+    try:
+        if acquired:
+            # The previous holder may have stored the value while we were waiting
+            cached = cache.get_value(key)
+            if cached is not None:
+                return cached, True
+
+        value = compute()
+        if value is not None:
+            cache.set_value(key, value, expires_in_sec=ttl)
+        return value, False
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                # Held longer than lock_timeout; Redis already released it
+                pass